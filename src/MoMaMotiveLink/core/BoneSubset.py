@@ -0,0 +1,143 @@
+# Sous-ensembles nommés d'os (hanches, tête et mains, LOD de 20 os...) publiés à la place ou en plus du squelette.
+#
+# Un sous-ensemble est compilé à la réception des descriptions pour tous les acteurs. Son parent est l'ancêtre
+# conservé le plus proche. Sa "chaîne" contient les os conservés et les os retirés entre eux et leur ancêtre
+# conservé (ou la racine). La matrice locale d'un os conservé est le produit des matrices locales de la chaîne
+# depuis cet ancêtre : une cinématique directe sur la chaîne, où chaque os conservé redémarre à l'identité,
+# réduit les os retirés dans leur descendant. Les matrices globales du sous-ensemble sont donc celles du
+# squelette complet.
+# Seules les chaînes sont nécessaires : MotiveLink peut ne ranger et composer que leur union (full_skeleton=False).
+# Tous les sous-ensembles sont traités ensemble (BoneSubsetGroup) : chaînes et sous-ensembles mis bout à bout,
+# soit deux np.take et deux cinématiques directes par frame quel que soit leur nombre.
+
+import numpy as np
+from numpy._typing import NDArray
+
+from MoMaMotiveLink.core.ForwardKinematics import ForwardKinematics
+from MoMaMotiveLink.core.SkeletonLayout import SkeletonLayout
+
+
+class BoneSubset:
+    """
+    name : nom du sous-ensemble, utilisé pour la publication ("subset_<name>").
+    bone_names : os conservés (noms Motive, comme bone_id_to_name), dans l'ordre de sortie (S,).
+    """
+
+    def __init__(self, name: str, bone_names: list[str]):
+        if len(set(bone_names)) != len(bone_names):
+            raise ValueError(f"Bone subset {name!r} has duplicate bone names")
+        self.name = name
+        self.bone_names = list(bone_names)
+
+
+class BoneSubsetStream:
+    """
+    Sous-ensemble compilé pour la disposition des acteurs. Après BoneSubsetGroup.apply : matrices (A * S, 4, 4)
+    locales au parent conservé, world_matrices (A * S, 4, 4). Les os absents d'un acteur sont des racines à
+    l'identité (bone_mask à False).
+    """
+
+    def __init__(self, subset: BoneSubset, layout: SkeletonLayout):
+        self.subset = subset
+        self.name = subset.name
+        actor_count, subset_count = layout.actor_count, len(subset.bone_names)
+        self.bone_count = actor_count * subset_count
+
+        # Os conservés, à plat (A * S) : index dans la disposition, -1 si absent de l'acteur
+        bone_indices = np.full((actor_count, subset_count), -1, dtype=np.intp)
+        for actor in range(actor_count):
+            start = actor * layout.max_bones
+            actor_bones = {layout.bone_names[index]: index
+                           for index in range(start, start + int(layout.actor_bone_counts[actor]))}
+            for slot, bone_name in enumerate(subset.bone_names):
+                bone_indices[actor, slot] = actor_bones.get(bone_name, -1)
+        self.bone_indices: NDArray[np.intp] = bone_indices.reshape(-1)
+        self.bone_mask: NDArray[np.bool_] = (bone_indices >= 0)  # (A, S)
+
+        # Parents remappés sur l'ancêtre conservé le plus proche, et chaîne des os à composer
+        parents = layout.bone_parent_indices
+        subset_positions = {int(index): position for position, index in enumerate(self.bone_indices) if index >= 0}
+        self.parent_indices: NDArray[np.int32] = np.full(self.bone_count, -1, dtype=np.int32)
+        chain = set(subset_positions)
+        for index, position in subset_positions.items():
+            parent = int(parents[index])
+            while parent >= 0 and parent not in subset_positions:
+                chain.add(parent)
+                parent = int(parents[parent])
+            if parent >= 0:
+                self.parent_indices[position] = subset_positions[parent]
+        self.chain_indices: NDArray[np.intp] = np.array(sorted(chain), dtype=np.intp)  # index dans la disposition
+        chain_rows = {int(index): row for row, index in enumerate(self.chain_indices)}
+        chain_parents = np.full(len(self.chain_indices), -1, dtype=np.int32)
+        for row, index in enumerate(self.chain_indices):
+            parent = int(parents[index])
+            if parent >= 0 and parent not in subset_positions:
+                chain_parents[row] = chain_rows[parent]
+        self.chain_parents: NDArray[np.int32] = chain_parents
+        # Ligne de la chaîne de chaque os conservé, -1 si absent
+        self.chain_rows: NDArray[np.intp] = np.array([chain_rows.get(int(index), -1) for index in self.bone_indices],
+                                                     dtype=np.intp)
+
+        # Vues dans les buffers du BoneSubsetGroup
+        self.matrices: NDArray = None
+        self.world_matrices: NDArray = None
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "bone_names": self.subset.bone_names, "parents": self.parent_indices.tolist(),
+                "bone_mask": self.bone_mask.reshape(-1).tolist()}
+
+
+class BoneSubsetGroup:
+    """Tous les sous-ensembles compilés, calculés ensemble par apply"""
+
+    def __init__(self, streams: list[BoneSubsetStream], dtype=np.float64, compute_world_matrices=True):
+        self.streams = streams
+        # Chaînes bout à bout, avec une ligne identité à la fin pour les os absents
+        chain_starts = np.cumsum([0] + [len(stream.chain_indices) for stream in streams])
+        subset_starts = np.cumsum([0] + [stream.bone_count for stream in streams])
+        chain_count, bone_count = int(chain_starts[-1]), int(subset_starts[-1])
+        self.chain_count = chain_count
+        self.bone_count = bone_count
+
+        def offset(indices, start):
+            return np.where(indices >= 0, indices + start, indices)
+
+        self.chain_indices: NDArray[np.intp] = np.concatenate(
+            [stream.chain_indices for stream in streams]).astype(np.intp)  # index dans la disposition
+        chain_parents = np.concatenate([offset(stream.chain_parents, start)
+                                        for stream, start in zip(streams, chain_starts)]).astype(np.int32)
+        self.chain_rows: NDArray[np.intp] = np.concatenate(
+            [np.where(stream.chain_rows >= 0, stream.chain_rows + start, chain_count)
+             for stream, start in zip(streams, chain_starts)]).astype(np.intp)
+        parent_indices = np.concatenate([offset(stream.parent_indices, start)
+                                         for stream, start in zip(streams, subset_starts)]).astype(np.int32)
+        self.chain_forward_kinematics = ForwardKinematics(chain_parents, dtype=dtype)
+        self.forward_kinematics = ForwardKinematics(parent_indices, dtype=dtype)
+        self.source_rows: NDArray[np.intp] = self.chain_indices
+
+        # Buffers de la frame
+        self.chain_local_matrices = np.empty((chain_count, 4, 4), dtype=dtype)
+        self.chain_matrices = np.empty((chain_count + 1, 4, 4), dtype=dtype)
+        self.chain_matrices[chain_count] = np.eye(4, dtype=dtype)
+        self.matrices = np.empty((bone_count, 4, 4), dtype=dtype)
+        self.world_matrices = np.empty((bone_count, 4, 4), dtype=dtype) if compute_world_matrices else None
+        for stream, start, end in zip(streams, subset_starts[:-1], subset_starts[1:]):
+            stream.matrices = self.matrices[start:end]
+            if compute_world_matrices:
+                stream.world_matrices = self.world_matrices[start:end]
+
+    def get_required_indices(self) -> NDArray[np.intp]:
+        """Os de la disposition nécessaires aux sous-ensembles, triés"""
+        return np.unique(self.chain_indices)
+
+    def bind(self, source_rows: NDArray[np.intp]):
+        """source_rows (B,) : index de disposition -> ligne des matrices locales passées à apply"""
+        self.source_rows = source_rows[self.chain_indices]
+
+    def apply(self, local_matrices: NDArray):
+        """Matrices de tous les sous-ensembles à partir des matrices locales, sans allocation"""
+        np.take(local_matrices, self.source_rows, axis=0, mode="clip", out=self.chain_local_matrices)
+        self.chain_forward_kinematics.compute(self.chain_local_matrices, out=self.chain_matrices[:-1])
+        np.take(self.chain_matrices, self.chain_rows, axis=0, mode="clip", out=self.matrices)
+        if self.world_matrices is not None:
+            self.forward_kinematics.compute(self.matrices, out=self.world_matrices)
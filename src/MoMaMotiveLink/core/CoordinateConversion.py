@@ -0,0 +1,91 @@
+# Conversion d'unité et de repère des données Motive vers celui du moteur, compilée une fois.
+#
+# Une conversion est un facteur d'unité, une permutation signée des axes et un éventuel changement de main
+# (inversion d'un axe). Le tout tient dans une matrice de changement de base C = unit_scale * P, P étant
+# orthogonale de déterminant ±1 :
+#   position      p' = C p
+#   rotation      R' = P R P^T, soit pour un quaternion q'.xyz = det(P) * P q.xyz et q'.w = q.w
+#   matrice 4x4   M' = B M B^-1 avec B = [[C, 0], [0, 1]]
+# Positions et quaternions sont convertis avant la composition des matrices : aucune passe de plus sur les
+# matrices, et la cinématique directe donne directement des matrices globales dans le repère converti.
+
+import numpy as np
+from numpy._typing import NDArray
+
+AXES = {"x": 0, "y": 1, "z": 2}
+
+
+class CoordinateConversion:
+    """
+    unit_scale : facteur appliqué aux positions (100.0 : mètres -> centimètres).
+    axes : pour chaque axe de sortie, l'axe Motive d'origine précédé d'un signe éventuel.
+        ("x", "y", "z") garde le repère, ("x", "-z", "y") passe de Y vers le haut à Z vers le haut.
+    mirror_axis : axe de sortie inversé pour changer de main (repère droitier <-> gaucher), None pour aucun.
+    """
+
+    def __init__(self, unit_scale: float = 1.0, axes: tuple[str, str, str] = ("x", "y", "z"),
+                 mirror_axis: str = None):
+        if len(axes) != 3:
+            raise ValueError(f"Expected 3 axes, got {axes!r}")
+        axis_matrix = np.zeros((3, 3), dtype=np.float64)
+        for output_axis, axis in enumerate(axes):
+            sign = -1.0 if axis.startswith("-") else 1.0
+            name = axis.lstrip("+-").lower()
+            if name not in AXES:
+                raise ValueError(f"Unknown axis {axis!r}, expected one of {list(AXES)} with an optional sign")
+            axis_matrix[output_axis, AXES[name]] = sign
+        if not np.array_equal(np.abs(axis_matrix).sum(axis=0), np.ones(3)):
+            raise ValueError(f"Axes {axes!r} are not a permutation of x, y, z")
+        if mirror_axis is not None:
+            if mirror_axis.lower() not in AXES:
+                raise ValueError(f"Unknown mirror axis {mirror_axis!r}, expected one of {list(AXES)}")
+            axis_matrix[AXES[mirror_axis.lower()]] *= -1.0
+        axis_matrix += 0.0  # -0.0 -> 0.0
+
+        self.unit_scale = float(unit_scale)
+        self.axes = tuple(axes)
+        self.mirror_axis = mirror_axis
+        self.axis_matrix: NDArray[np.float64] = axis_matrix  # P (3, 3)
+        self.determinant = int(round(np.linalg.det(axis_matrix)))  # -1 si la conversion change de main
+        self.rotates = not np.array_equal(axis_matrix, np.eye(3))
+
+        # Matrices compilées
+        self.position_matrix: NDArray[np.float64] = self.unit_scale * axis_matrix  # C (3, 3)
+        self.quaternion_matrix: NDArray[np.float64] = np.eye(4, dtype=np.float64)  # (4, 4) sur [qx, qy, qz, qw]
+        self.quaternion_matrix[:3, :3] = self.determinant * axis_matrix
+        self.basis_matrix: NDArray[np.float64] = np.eye(4, dtype=np.float64)  # B (4, 4)
+        self.basis_matrix[:3, :3] = self.position_matrix
+        self.inverse_basis_matrix: NDArray[np.float64] = np.linalg.inv(self.basis_matrix)
+
+        # Transposées par dtype, pour les produits (N, k) @ (k, k) sans conversion
+        self.__transposed: dict[tuple[str, np.dtype], NDArray] = {}
+
+    def __get_transposed(self, name: str, dtype) -> NDArray:
+        key = (name, np.dtype(dtype))
+        matrix = self.__transposed.get(key)
+        if matrix is None:
+            matrix = np.ascontiguousarray(getattr(self, name).T, dtype=dtype)
+            self.__transposed[key] = matrix
+        return matrix
+
+    def convert_positions(self, positions: NDArray, out: NDArray = None) -> NDArray:
+        """positions (N, 3) -> C p, écrites dans out (N, 3) si fourni (peut être positions)"""
+        return np.matmul(positions, self.__get_transposed("position_matrix", positions.dtype), out=out)
+
+    def convert_rotations(self, rotations: NDArray, out: NDArray = None) -> NDArray:
+        """quaternions (N, 4) [qx, qy, qz, qw] -> rotations P R P^T, écrits dans out (N, 4) si fourni"""
+        if not self.rotates:
+            if out is None:
+                return rotations.copy()
+            np.copyto(out, rotations)
+            return out
+        return np.matmul(rotations, self.__get_transposed("quaternion_matrix", rotations.dtype), out=out)
+
+    def convert_matrices(self, matrices: NDArray, out: NDArray = None) -> NDArray:
+        """matrices (N, 4, 4) -> B M B^-1, pour les données déjà composées"""
+        out = np.matmul(self.basis_matrix.astype(matrices.dtype), matrices, out=out)
+        return np.matmul(out, self.inverse_basis_matrix.astype(matrices.dtype), out=out)
+
+    def to_dict(self) -> dict:
+        return {"unit_scale": self.unit_scale, "axes": list(self.axes), "mirror_axis": self.mirror_axis,
+                "basis_matrix": self.basis_matrix.tolist()}
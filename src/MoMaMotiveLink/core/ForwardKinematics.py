@@ -0,0 +1,114 @@
+# Cinématique directe par niveaux.
+#
+# L'ordre topologique et les niveaux de profondeur sont calculés une fois à partir des parents (à la
+# réception des descriptions). Chaque frame, les matrices globales sont calculées niveau par niveau avec
+# un matmul groupé : le coût suit la profondeur du squelette et non le nombre d'os.
+
+import numpy as np
+from numpy._typing import NDArray
+
+
+class KinematicLevel:
+    """Os d'une même profondeur : une tranche de l'ordre topologique et la position de leurs parents"""
+    __slots__ = ("start", "end", "parent_positions", "parent_matrices", "parent_flags")
+
+    def __init__(self, start: int, end: int, parent_positions: NDArray[np.intp], dtype):
+        self.start = start
+        self.end = end
+        self.parent_positions = parent_positions
+        self.parent_matrices = np.empty((end - start, 4, 4), dtype=dtype)
+        self.parent_flags = np.empty(end - start, dtype=bool)
+
+
+def get_bone_depths(parent_indices: NDArray[np.int32]) -> NDArray[np.int32]:
+    """
+    Profondeur de chaque os, 0 pour les racines (parent -1).
+    Les parents hors limites et les cycles sont traités comme des racines.
+    """
+    parent_indices = np.asarray(parent_indices, dtype=np.intp)
+    count = len(parent_indices)
+    valid = (parent_indices >= 0) & (parent_indices < count) & (parent_indices != np.arange(count))
+    parents = np.where(valid, parent_indices, -1)
+    depths = np.where(parents < 0, 0, -1).astype(np.int32)
+    for _ in range(count):
+        pending = np.flatnonzero(depths < 0)
+        if len(pending) == 0:
+            break
+        parent_depths = depths[parents[pending]]
+        ready = parent_depths >= 0
+        if not ready.any():
+            # Cycle
+            break
+        depths[pending[ready]] = parent_depths[ready] + 1
+    depths[depths < 0] = 0
+    return depths
+
+
+class ForwardKinematics:
+    """
+    parent_indices (B,) : index du parent de chaque os, -1 pour une racine.
+    """
+
+    def __init__(self, parent_indices: NDArray[np.int32], dtype=np.float64):
+        self.parent_indices = np.asarray(parent_indices, dtype=np.int32)
+        self.bone_count = len(self.parent_indices)
+        self.depths = get_bone_depths(self.parent_indices)
+        # Racines d'abord, puis chaque os après son parent : chaque niveau est une tranche contiguë
+        self.order = np.argsort(self.depths, kind="stable")
+        # Position de chaque os dans l'ordre topologique
+        positions = np.empty(self.bone_count, dtype=np.intp)
+        positions[self.order] = np.arange(self.bone_count)
+        self.sorted_positions = positions
+        sorted_depths = self.depths[self.order]
+
+        depth_count = int(sorted_depths[-1]) + 1 if self.bone_count > 0 else 0
+        bounds = np.searchsorted(sorted_depths, np.arange(depth_count + 1))
+        self.root_count = int(bounds[1]) if depth_count > 0 else 0
+        self.levels: list[KinematicLevel] = []
+        for depth in range(1, depth_count):
+            start, end = int(bounds[depth]), int(bounds[depth + 1])
+            parent_positions = positions[self.parent_indices[self.order[start:end]]]
+            self.levels.append(KinematicLevel(start, end, parent_positions, dtype))
+
+        # Matrices dans l'ordre topologique
+        self.sorted_local_matrices = np.empty((self.bone_count, 4, 4), dtype=dtype)
+        self.sorted_world_matrices = np.empty((self.bone_count, 4, 4), dtype=dtype)
+        self.sorted_flags = np.empty(self.bone_count, dtype=bool)
+
+    def get_depth_count(self) -> int:
+        return len(self.levels) + (1 if self.bone_count > 0 else 0)
+
+    def compute(self, local_matrices: NDArray[np.float64], out: NDArray[np.float64] = None) -> NDArray[np.float64]:
+        """
+        Matrices globales (B, 4, 4) écrites dans out (alloué si absent) à partir des matrices locales.
+        Avec out fourni, aucune allocation.
+        """
+        if out is None:
+            out = np.empty_like(local_matrices)
+        sorted_local = self.sorted_local_matrices
+        sorted_world = self.sorted_world_matrices
+        np.take(local_matrices, self.order, axis=0, mode="clip", out=sorted_local)
+        sorted_world[:self.root_count] = sorted_local[:self.root_count]
+        for level in self.levels:
+            np.take(sorted_world, level.parent_positions, axis=0, mode="clip", out=level.parent_matrices)
+            np.matmul(level.parent_matrices, sorted_local[level.start:level.end],
+                      out=sorted_world[level.start:level.end])
+        np.take(sorted_world, self.sorted_positions, axis=0, mode="clip", out=out)
+        return out
+
+    def propagate(self, flags: NDArray[np.bool_], out: NDArray[np.bool_] = None) -> NDArray[np.bool_]:
+        """
+        Drapeaux par os (B,) étendus à tous leurs descendants (un os changé change les matrices globales de
+        ses enfants), écrits dans out (alloué si absent). Avec out fourni, aucune allocation.
+        """
+        if out is None:
+            out = np.empty_like(flags)
+        # ndarray.take plutôt que np.take : sur ces petits tableaux, le surcoût de l'appel domine
+        sorted_flags = self.sorted_flags
+        flags.take(self.order, mode="clip", out=sorted_flags)
+        for level in self.levels:
+            level_flags = sorted_flags[level.start:level.end]
+            sorted_flags.take(level.parent_positions, mode="clip", out=level.parent_flags)
+            np.logical_or(level_flags, level.parent_flags, out=level_flags)
+        sorted_flags.take(self.sorted_positions, mode="clip", out=out)
+        return out
@@ -1,6 +1,8 @@
+import json
 import os
 import socket
 import sys
+import threading
 import time
 import logging
 
@@ -8,7 +10,14 @@ import numpy as np
 from numpy._typing import NDArray
 
 from MoMaMotiveLink.core import Tools
-from MoMaMotiveLink.natnetsdk.DataDescriptions import DataDescriptions, SkeletonDescription, RigidBodyDescription
+from MoMaMotiveLink.core.BoneSubset import BoneSubset
+from MoMaMotiveLink.core.CoordinateConversion import CoordinateConversion
+from MoMaMotiveLink.core.PoseBuffer import PoseBuffer, PoseSnapshot
+from MoMaMotiveLink.core.PoseDelta import PoseDelta, PoseDeltaReader
+from MoMaMotiveLink.core.PosePipeline import PosePipeline, PosePipelineConfig
+from MoMaMotiveLink.core.Retargeting import RetargetTarget
+from MoMaMotiveLink.core.SkeletonLayout import SkeletonLayout
+from MoMaMotiveLink.natnetsdk.DataDescriptions import DataDescriptions
 from MoMaMotiveLink.natnetsdk.MoCapData import MoCapData, SkeletonData, Skeleton, RigidBody
 from MoMaMotiveLink.natnetsdk.NatNetClient import NatNetClient
 
@@ -27,26 +36,75 @@ class LINK_STATUS(Enum):
 
 class MotiveLink:
 
-    def __init__(self):
+    def __init__(self, dtype=np.float64, representations=("matrix",), compute_world_matrices=True,
+                 conversion: CoordinateConversion = None, skinning_palette: str = None,
+                 retarget_targets: list[RetargetTarget] = (), bone_subsets: list[BoneSubset] = (),
+                 full_skeleton=True, change_epsilon: float = None, delta_fraction: float = 0.25,
+                 hold_last_valid=False, max_marker_error: float = None):
+        """Options du pipeline de pose, vérifiées ensemble : voir PosePipelineConfig."""
         self.status = LINK_STATUS.WAIT
+        self.pose_config = PosePipelineConfig(
+            dtype=dtype, representations=representations, compute_world_matrices=compute_world_matrices,
+            conversion=conversion, skinning_palette=skinning_palette, retarget_targets=retarget_targets,
+            bone_subsets=bone_subsets, full_skeleton=full_skeleton, change_epsilon=change_epsilon,
+            delta_fraction=delta_fraction, hold_last_valid=hold_last_valid, max_marker_error=max_marker_error)
 
         self.bone_id_to_name: dict[int, str] = {}
         self.bone_parents: NDArray[np.int32] = np.empty((0,), dtype=np.int32)  # np.array int32
 
-        # --- Ajout : Stockage de la Bind Pose (Pose de repos) ---
-        # Ces données définissent la forme du squelette sans animation
-        self.rest_positions: NDArray[np.float64] = None  # (B, 3)
-        self.rest_rotations: NDArray[np.float64] = None  # (B, 4) - Quaternions
-        self.rest_scales: NDArray[np.float64] = None  # (B, 3)
-
-        # Données d'animation
-        self.local_matrices: NDArray[np.float64] = None  # (B, 4, 4) - Matrices de transformation complètes
+        # Disposition des acteurs et de leurs os, construite à la réception des descriptions.
+        # Les tableaux par os sont à plat (A * max_bones), voir SkeletonLayout
+        self.skeleton_layout = SkeletonLayout()
+        self.bone_names: list[str] = []
+        self.bone_ids: NDArray[np.int32] = np.empty((0,), dtype=np.int32)  # (B,) - ID de l'os dans son squelette
+        self.skeleton_ids: NDArray[np.int32] = np.empty((0,), dtype=np.int32)  # (A,)
+        self.skeleton_names: list[str] = []
+        # (A, max ID + 1) : [acteur, ID de l'os] -> index de l'os, -1 si absent
+        self.bone_id_to_index: NDArray[np.int32] = np.empty((0, 1), dtype=np.int32)
+        # Index du parent de chaque os dans les tenseurs de pose, -1 pour une racine
+        self.bone_parent_indices: NDArray[np.int32] = np.empty((0,), dtype=np.int32)
+
+        # Pipeline de pose compilé pour les descriptions : pose de repos, buffers et étapes de chaque frame
+        self.pose_pipeline: PosePipeline = None
+
+        # Dernière pose publiée pour les autres threads, voir get_latest_pose
+        self.pose_buffer: PoseBuffer = None
+
+        # SKELETON_DEF en cache : (version, dict, JSON), remplacé d'un bloc à chaque description
+        self.description_version = 0
+        self.__skeleton_definition = self.__build_skeleton_definition()
+
+        # Tenu par receive_model_descriptions (thread des commandes) et receive_frame_with_skeleton (thread des
+        # données) : les buffers ne sont jamais remplacés pendant le traitement d'une frame
+        self.__frame_lock = threading.Lock()
+
+    # Pose de repos et matrices locales du pipeline, None avant les descriptions
+    @property
+    def rest_positions(self) -> NDArray[np.float64] | None:
+        return None if self.pose_pipeline is None else self.pose_pipeline.rest_positions  # (B, 3)
+
+    @property
+    def rest_rotations(self) -> NDArray[np.float64] | None:
+        return None if self.pose_pipeline is None else self.pose_pipeline.rest_rotations  # (B, 4) - Quaternions
+
+    @property
+    def rest_scales(self) -> NDArray[np.float64] | None:
+        return None if self.pose_pipeline is None else self.pose_pipeline.rest_scales  # (B, 3)
+
+    @property
+    def local_matrices(self) -> NDArray[np.float64] | None:
+        return None if self.pose_pipeline is None else self.pose_pipeline.local_matrices  # (B, 4, 4)
 
     def set_log_level(self, level: int):
         logger.setLevel(level)
         logger.info(f"MoMaMotiveLink log level set to {logging.getLevelName(level)}")
 
-    def start(self, use_multicast=False):
+    def start(self, use_multicast=False, decode_queue_policy: str = "keep_latest", decode_queue_capacity=64):
+        """
+        decode_queue_policy : réception et décodage dans deux threads, la file entre eux suit cette politique (voir
+        PacketQueue). Par défaut "keep_latest" : seule la frame la plus récente est décodée, les frames en retard
+        sont perdues. None décode dans le thread de réception, comme avant la file, sans perte côté client.
+        """
         print("This is the MotiveLink core module.")
 
         server_hostname = os.getenv("MOMA_MOTIVELINK_SERVER_HOSTNAME")
@@ -78,6 +136,11 @@ class MotiveLink:
         self.streamingClient.set_client_address(client_ip)  # Your IP (or 127.0.0.1 if local)
         self.streamingClient.set_server_address(motive_ip)  # Motive IP (or 127.0.0.1 if local)
         self.streamingClient.set_use_multicast(use_multicast)  # Must match Motive 'Transmission Type'
+        # Seuls les squelettes sont utilisés : les autres sections sont sautées sans être décodées
+        self.streamingClient.set_decode_sections({"skeletons", "suffix"})
+        # Réception et décodage dans deux threads : un listener lent ne retarde plus la réception
+        if decode_queue_policy is not None:
+            self.streamingClient.set_decode_queue(decode_queue_capacity, decode_queue_policy)
 
         # Configure the callbacks
         # streamingClient.new_frame_listener = receive_new_frame
@@ -162,36 +225,40 @@ class MotiveLink:
     def receive_model_descriptions(self, data_descs: DataDescriptions):
         logger.debug("Received model descriptions from Motive.")
 
-        self.status = LINK_STATUS.WAIT
+        # Le thread des frames attend la fin du remplacement : une frame ne voit jamais deux dispositions
+        with self.__frame_lock:
+            self.status = LINK_STATUS.WAIT
 
-        self.bone_id_to_name = {}  # Reset
-        bone_parents = []
-        rest_positions = []
-        rest_rotations = []
+            layout = SkeletonLayout(data_descs)
 
-        # On parcourt les squelettes trouvés dans les descriptions
-        skeleton: SkeletonDescription
-        for skeleton in data_descs.skeleton_list:
-            print(f"Squelette trouvé : {skeleton.name}")
+            # On parcourt les squelettes trouvés dans les descriptions
+            self.bone_id_to_name = {}  # Reset
+            for actor, skeleton_name in enumerate(layout.skeleton_names):
+                print(f"Squelette trouvé : {skeleton_name}")
 
-            # Dans DataDescriptions.py, les os sont dans 'rigid_body_description_list'
-            bone_desc: RigidBodyDescription
-            for bone_desc in skeleton.rigid_body_description_list:
-                # On remplit le dictionnaire : ID (int) -> Nom (str)
-                decoded_name = bone_desc.sz_name.decode()
-                self.bone_id_to_name[bone_desc.id_num] = decoded_name
-                bone_parents.append(bone_desc.parent_id)
-                rest_positions.append(bone_desc.pos)
-                rest_rotations.append(bone_desc.rot)
+                start = actor * layout.max_bones
+                for index in range(start, start + layout.actor_bone_counts[actor]):
+                    # On remplit le dictionnaire : ID (int) -> Nom (str)
+                    self.bone_id_to_name[int(layout.bone_ids[index])] = layout.bone_names[index]
 
-                print(f"   Mapping : ID {bone_desc.id_num} -> {decoded_name}")
+                    print(f"   Mapping : ID {layout.bone_ids[index]} -> {layout.bone_names[index]}")
 
-        self.bone_parents = np.array(bone_parents, dtype=np.int32)
-        self.rest_positions = np.array(rest_positions, dtype=np.float64) * 100.0  # TODO Verify units (cm <-> m?)
-        self.rest_rotations = np.array(rest_rotations, dtype=np.float64)
-        self.rest_scales = np.full_like(self.rest_positions, fill_value=1.0, dtype=np.float64)
+            self.skeleton_layout = layout
+            self.bone_names = layout.bone_names
+            self.bone_ids = layout.bone_ids
+            self.skeleton_ids = layout.skeleton_ids
+            self.skeleton_names = layout.skeleton_names
+            self.bone_id_to_index = layout.bone_id_to_index
+            self.bone_parents = layout.bone_parents
+            self.bone_parent_indices = layout.bone_parent_indices
+            self.pose_pipeline = PosePipeline(self.pose_config, layout)
+            self.pose_buffer = PoseBuffer({name: (array.shape, array.dtype)
+                                           for name, array in self.pose_pipeline.pose_arrays.items()})
 
-        self.status = LINK_STATUS.READY
+            self.description_version += 1
+            self.__skeleton_definition = self.__build_skeleton_definition()
+
+            self.status = LINK_STATUS.READY
 
     def receive_new_frame_with_data(self, data_dict):
         if self.status is not LINK_STATUS.READY:
@@ -218,73 +285,137 @@ class MotiveLink:
             print(out_string)
 
     def receive_frame_with_skeleton(self, data_dict):
-        if self.status is not LINK_STATUS.READY:
-            # On attend d'avoir reçu les descriptions pour traiter les frames
-            return
+        with self.__frame_lock:
+            if self.status is not LINK_STATUS.READY:
+                # On attend d'avoir reçu les descriptions pour traiter les frames
+                return
 
-        logger.debug("Received frame with skeleton data")
+            logger.debug("Received frame with skeleton data")
 
-        # 1. Récupérer l'objet global
-        if "mocap_data" not in data_dict:
-            return
-        mocap_data = data_dict["mocap_data"]
+            # 1. Récupérer l'objet global
+            if "mocap_data" not in data_dict:
+                return
+            mocap_data = data_dict["mocap_data"]
 
-        matrices = []
+            skeleton_list = []
+            # 2. Vérifier s'il y a des squelettes
+            if mocap_data.skeleton_data and mocap_data.skeleton_data.skeleton_list:
+                skeleton_list = mocap_data.skeleton_data.skeleton_list
 
-        # 2. Vérifier s'il y a des squelettes
-        if mocap_data.skeleton_data and mocap_data.skeleton_data.skeleton_list:
-            # 3. Boucler sur chaque squelette (Actor 1, Actor 2...)
-            for skeleton in mocap_data.skeleton_data.skeleton_list:
-                # print(f"Squelette ID: {skeleton.id_num}")
+            # 3. Os rangés, gating, pose locale, matrices globales, palette de skinning, retargeting et
+            # sous-ensembles d'os, voir PosePipeline
+            self.pose_pipeline.process(skeleton_list, self.pose_buffer.publish_count + 1)
 
-                # 4. Boucler sur chaque OS du squelette
-                # Dans le SDK, les os sont stockés comme une liste de RigidBodies
-                for bone in skeleton.rigid_body_list:
-                    # Voici les données vitales pour votre animation :
-                    bone_id = bone.id_num  # L'ID unique de l'os (ex: Hips, LeftArm...)
-                    position = np.array(bone.pos) * 100  # [x, y, z] # TODO Verify units (cm <-> m?)
-                    rotation = np.array(bone.rot)  # [qx, qy, qz, qw] (Quaternion)
-                    scale = np.array([1.0, 1.0, 1.0])  # Motive ne fournit pas d'échelle, on suppose 1.0
+            # Publication pour les lecteurs des autres threads
+            self.pose_buffer.write(self.pose_pipeline.pose_arrays, mocap_data.prefix_data.frame_number,
+                                   data_dict.get("timestamp", 0.0))
 
-                    # position + rotation + scale into a 4x4 transform matrix
-                    transform_matrix = Tools.compose_transform(position, rotation, scale)
-                    matrices.append(transform_matrix)
+    def get_latest_pose(self, out: PoseSnapshot = None) -> PoseSnapshot | None:
+        """
+        Copie cohérente de la dernière pose (représentations demandées, world_matrices, bone_present, actor_present,
+        bone_tracking_valid, bone_errors, bone_confident, frame_number, timestamp),
+        utilisable depuis n'importe quel thread.
+        Passer le snapshot précédent en out pour éviter toute allocation. None tant qu'aucune frame n'a été reçue.
+        """
+        pose_buffer = self.pose_buffer
+        if pose_buffer is None:
+            return None
+        return pose_buffer.read(out)
 
-        self.local_matrices = np.array(matrices, dtype=np.float64)
-        # print(self.local_matrices)
+    def new_delta_reader(self) -> PoseDeltaReader:
+        """Lecteur pour get_latest_delta, un par client"""
+        return PoseDeltaReader(self.pose_config.delta_fraction)
 
-    def get_skeleton_definition(self) -> dict:
+    def get_latest_delta(self, reader: PoseDeltaReader) -> PoseDelta | None:
         """
-        Génère un dictionnaire contenant la structure statique du squelette.
-        Idéal pour être envoyé en JSON au client lors de l'initialisation.
+        Dernière pose vue depuis la lecture précédente du lecteur, utilisable depuis n'importe quel thread :
+        indices et valeurs des seuls os changés tant qu'ils sont moins de delta_fraction, tableaux complets sinon
+        (première lecture, nouvelles descriptions, ou sans change_epsilon). None tant qu'aucune frame n'a été reçue.
         """
+        pose_buffer, pose_pipeline = self.pose_buffer, self.pose_pipeline
+        if pose_buffer is None:
+            return None
+        return reader.read(pose_buffer, pose_pipeline.change_groups)
+
+    def __build_skeleton_definition(self) -> tuple[int, dict, bytes]:
+        pose_pipeline = self.pose_pipeline
+        retargeters = pose_pipeline.retargeters if pose_pipeline is not None else []
+        subset_streams = pose_pipeline.subset_streams if pose_pipeline is not None else []
+
+        # Os réels, dans l'ordre des descriptions (sans les emplacements de remplissage)
+        bone_rows = np.flatnonzero(self.skeleton_layout.bone_mask)
+
+        # Parents au format d'origine : -1 en tête, puis pour chaque os dont le parent est connu, l'index du nom du
+        # parent dans bone_names
+        name_indices: dict[str, int] = {}
+        for index, name in enumerate(self.bone_id_to_name.values()):
+            name_indices.setdefault(name, index)
         parents_list: list[int] = [-1]
-        for parent in self.bone_parents:
-            parent_name = self.bone_id_to_name.get(parent, None)
-            if parent_name is None:
-                continue
-            id = list(self.bone_id_to_name.values()).index(parent_name)
-            parents_list.append(id)
+        for parent in self.bone_parents[bone_rows]:
+            parent_name = self.bone_id_to_name.get(int(parent), None)
+            if parent_name is not None:
+                parents_list.append(name_indices[parent_name])
+
+        skeleton_definition = {
+            "type": "SKELETON_DEF",
+            "version": self.description_version,
+            "bone_names": list(self.bone_id_to_name.values()),
+            "parents": parents_list,
+            "bind_pose": self.__get_bind_pose(bone_rows),
+            "max_bones": self.skeleton_layout.max_bones,
+            "actors": self.skeleton_layout.get_actors(),
+            # Emplacements (A * max_bones) des tenseurs de pose, remplissage compris, voir SkeletonLayout
+            "slots": {
+                "bone_names": list(self.bone_names),
+                "parents": self.bone_parent_indices.tolist(),
+                "bind_pose": self.__get_bind_pose(np.arange(self.skeleton_layout.bone_count))
+            },
+            "coordinate_system": self.pose_config.conversion.to_dict(),
+            "retarget_targets": [{"name": retargeter.name, "bone_names": retargeter.target.bone_names}
+                                 for retargeter in retargeters],
+            "bone_subsets": [stream.to_dict() for stream in subset_streams],
+        }
+        skeleton_definition_json = json.dumps(skeleton_definition, separators=(",", ":")).encode("utf-8")
+        return self.description_version, skeleton_definition, skeleton_definition_json
 
+    def __get_bind_pose(self, rows: NDArray[np.intp]) -> dict:
         # Préparation de la bind pose (si disponible, sinon identité)
-        num_bones = len(self.bone_id_to_name)
+        num_bones = len(rows)
 
         # Valeurs par défaut si les loaders n'ont pas rempli les rest_xxx
-        r_pos = self.rest_positions.tolist() if self.rest_positions is not None else [[0, 0, 0]] * num_bones
-        r_rot = self.rest_rotations.tolist() if self.rest_rotations is not None else [[0, 0, 0, 1]] * num_bones
-        r_scl = self.rest_scales.tolist() if self.rest_scales is not None else [[1, 1, 1]] * num_bones
-
+        r_pos = self.rest_positions[rows].tolist() if self.rest_positions is not None else [[0, 0, 0]] * num_bones
+        r_rot = self.rest_rotations[rows].tolist() if self.rest_rotations is not None else [[0, 0, 0, 1]] * num_bones
+        r_scl = self.rest_scales[rows].tolist() if self.rest_scales is not None else [[1, 1, 1]] * num_bones
         return {
-            "type": "SKELETON_DEF",
-            "bone_names": list(self.bone_id_to_name.values()),
-            "parents": parents_list,
-            "bind_pose": {
-                "positions": r_pos,
-                "rotations": r_rot,
-                "scales": r_scl
-            }
+            "positions": r_pos,
+            "rotations": r_rot,
+            "scales": r_scl
         }
 
+    def get_skeleton_definition(self) -> dict:
+        """
+        Dictionnaire contenant la structure statique du squelette, construit une fois par description.
+        Idéal pour être envoyé en JSON au client lors de l'initialisation. Partagé : ne pas le modifier.
+        bone_names, parents et bind_pose gardent leur format d'origine (os réels, parents précédés de -1) ;
+        slots décrit les mêmes os par emplacement des tenseurs de pose (get_latest_pose), avec les index des
+        parents (-1 pour une racine ou un emplacement de remplissage).
+        """
+        return self.__skeleton_definition[1]
+
+    def get_skeleton_definition_json(self, known_version: int = None) -> bytes | None:
+        """
+        SKELETON_DEF déjà sérialisé en JSON (UTF-8).
+        None si known_version est la version courante : le client a déjà cette définition.
+        """
+        version, skeleton_definition, skeleton_definition_json = self.__skeleton_definition
+        if known_version is not None and known_version == version:
+            return None
+        return skeleton_definition_json
+
+    def get_skeleton_definition_version(self) -> int:
+        """Incrémenté à chaque description reçue"""
+        return self.__skeleton_definition[0]
+
     def request_data_descriptions(self, s_client):
         # Request the model definitions
         return s_client.send_request(s_client.command_socket, s_client.NAT_REQUEST_MODELDEF, "",
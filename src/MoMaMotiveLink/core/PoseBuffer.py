@@ -0,0 +1,103 @@
+# Dernière pose partagée entre le thread NatNet (un seul écrivain) et un nombre quelconque de lecteurs.
+#
+# Seqlock sur deux emplacements : l'écrivain remplit l'emplacement qui n'est pas publié puis le publie,
+# les lecteurs copient l'emplacement publié dans leur propre PoseSnapshot et recommencent si l'écrivain
+# l'a réutilisé pendant la copie. Les lecteurs ne bloquent jamais l'écrivain et aucun des deux n'alloue
+# par frame.
+
+import numpy as np
+
+
+class PoseSnapshot:
+    """Copie d'une pose, préallouée selon le layout du PoseBuffer"""
+    __slots__ = ("arrays", "frame_number", "timestamp", "sequence")
+
+    def __init__(self, layout: dict):
+        self.arrays: dict[str, np.ndarray] = {name: np.zeros(shape, dtype=dtype)
+                                              for name, (shape, dtype) in layout.items()}
+        self.frame_number: int = -1
+        self.timestamp: float = 0.0
+        # Numéro de publication, 0 tant qu'aucune pose n'a été publiée
+        self.sequence: int = 0
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def matches(self, layout: dict) -> bool:
+        if self.arrays.keys() != layout.keys():
+            return False
+        for name, (shape, dtype) in layout.items():
+            array = self.arrays[name]
+            if array.shape != shape or array.dtype != dtype:
+                return False
+        return True
+
+
+class PoseBuffer:
+    """
+    layout : nom -> (shape, dtype) des tableaux d'une pose, par ex. {"matrices": ((B, 4, 4), np.float64)}
+    """
+
+    def __init__(self, layout: dict):
+        self.layout = {name: (tuple(shape), np.dtype(dtype)) for name, (shape, dtype) in layout.items()}
+        self.__slots = [PoseSnapshot(self.layout), PoseSnapshot(self.layout)]
+        # Impair pendant l'écriture de l'emplacement
+        self.__slot_sequences = [0, 0]
+        self.__published = 0
+        self.__writing = 1
+        self.publish_count = 0
+
+    def new_snapshot(self) -> PoseSnapshot:
+        return PoseSnapshot(self.layout)
+
+    # region WRITER
+    def begin_write(self) -> dict:
+        """Tableaux de l'emplacement non publié, à remplir sur place puis publier avec end_write"""
+        index = self.__published ^ 1
+        self.__writing = index
+        self.__slot_sequences[index] += 1
+        return self.__slots[index].arrays
+
+    def end_write(self, frame_number: int, timestamp: float):
+        index = self.__writing
+        slot = self.__slots[index]
+        self.publish_count += 1
+        slot.frame_number = frame_number
+        slot.timestamp = timestamp
+        slot.sequence = self.publish_count
+        # L'emplacement est complet avant d'être publié
+        self.__slot_sequences[index] += 1
+        self.__published = index
+
+    def write(self, arrays: dict, frame_number: int, timestamp: float):
+        """Copie arrays (nom -> tableau de la shape du layout) puis publie"""
+        back = self.begin_write()
+        for name, array in arrays.items():
+            np.copyto(back[name], array)
+        self.end_write(frame_number, timestamp)
+    # endregion
+
+    # region READERS
+    def read(self, out: PoseSnapshot = None) -> PoseSnapshot:
+        """
+        Copie la dernière pose publiée dans out (alloué si absent ou d'un autre layout) et le retourne.
+        """
+        if out is None or not out.matches(self.layout):
+            out = self.new_snapshot()
+        slots = self.__slots
+        slot_sequences = self.__slot_sequences
+        while True:
+            index = self.__published
+            sequence = slot_sequences[index]
+            if sequence & 1:
+                # L'écrivain a déjà publié l'autre emplacement et réécrit celui-ci
+                continue
+            slot = slots[index]
+            for name, array in slot.arrays.items():
+                np.copyto(out.arrays[name], array)
+            out.frame_number = slot.frame_number
+            out.timestamp = slot.timestamp
+            out.sequence = slot.sequence
+            if slot_sequences[index] == sequence:
+                return out
+    # endregion
@@ -0,0 +1,81 @@
+# Lecture de la pose en deltas creux : seuls les os changés depuis la lecture précédente, pour l'envoi réseau.
+#
+# Avec la détection de changement (MotiveLink change_epsilon), l'écrivain publie pour chaque os le numéro de
+# la dernière publication où il a changé : "local_change_sequences" pour la pose locale, "world_change_sequences"
+# pour les matrices globales (un os changé change aussi ses descendants). Un lecteur qui a lu la publication n
+# n'a besoin que des os dont le numéro dépasse n, même s'il a manqué des frames entre temps. Au-delà de
+# max_fraction des os changés, ou à la première lecture, le tableau complet est plus court à envoyer.
+
+import numpy as np
+from numpy._typing import NDArray
+
+from MoMaMotiveLink.core.PoseBuffer import PoseBuffer, PoseSnapshot
+
+
+class PoseDelta:
+    """
+    Pose publiée vue depuis la lecture précédente.
+    arrays : nom -> valeurs, lignes des os changés si indices[nom] est un tableau d'index, tableau complet si None.
+    """
+    __slots__ = ("snapshot", "indices", "arrays", "frame_number", "timestamp", "sequence")
+
+    def __init__(self, snapshot: PoseSnapshot, indices: dict, arrays: dict):
+        self.snapshot = snapshot
+        self.indices: dict[str, NDArray[np.intp] | None] = indices
+        self.arrays: dict[str, NDArray] = arrays
+        self.frame_number = snapshot.frame_number
+        self.timestamp = snapshot.timestamp
+        self.sequence = snapshot.sequence
+
+    def is_full(self) -> bool:
+        return all(indices is None for indices in self.indices.values())
+
+
+class PoseDeltaReader:
+    """
+    Lecteur d'un PoseBuffer gardant la dernière publication lue, voir MotiveLink.get_latest_delta.
+    max_fraction : part maximale d'os changés pour envoyer un delta plutôt que le tableau complet.
+    """
+
+    def __init__(self, max_fraction: float):
+        self.max_fraction = max_fraction
+        self.pose_buffer: PoseBuffer = None
+        self.snapshot: PoseSnapshot = None
+        # Dernière publication lue, 0 : la prochaine lecture est complète
+        self.sequence = 0
+
+    def reset(self):
+        """La prochaine lecture est complète (client reconnecté...)"""
+        self.sequence = 0
+
+    def read(self, pose_buffer: PoseBuffer, change_groups: dict[str, list[str]]) -> PoseDelta:
+        """
+        change_groups : tableau des numéros de changement -> tableaux par os qu'il couvre.
+        Les tableaux hors des groupes sont toujours complets, les numéros de changement ne sont pas retournés.
+        """
+        if pose_buffer is not self.pose_buffer:
+            # Nouvelles descriptions : nouvelle disposition
+            self.pose_buffer = pose_buffer
+            self.snapshot = pose_buffer.new_snapshot()
+            self.sequence = 0
+        snapshot = pose_buffer.read(self.snapshot)
+        previous, self.sequence = self.sequence, snapshot.sequence
+
+        indices, arrays = {}, {}
+        if previous > 0:
+            for sequences_name, names in change_groups.items():
+                sequences = snapshot.arrays.get(sequences_name)
+                if sequences is None:
+                    # Groupes des descriptions suivantes, lus pendant leur remplacement
+                    continue
+                changed = np.flatnonzero(sequences > previous)
+                if len(changed) > self.max_fraction * len(sequences):
+                    continue
+                for name in names:
+                    indices[name] = changed
+                    arrays[name] = snapshot[name][changed]
+        for name, array in snapshot.arrays.items():
+            if name not in indices and name not in change_groups:
+                indices[name] = None
+                arrays[name] = array
+        return PoseDelta(snapshot, indices, arrays)
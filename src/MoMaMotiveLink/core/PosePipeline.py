@@ -0,0 +1,643 @@
+# Pipeline de pose : des os reçus dans une frame aux tableaux publiés par MotiveLink.
+#
+# PosePipelineConfig regroupe les options du pipeline, vérifiées ensemble. PosePipeline les compile pour une
+# disposition des acteurs (SkeletonLayout) : pose de repos, cinématique directe, retargeting et sous-ensembles,
+# et tous les buffers de la frame, alloués une fois. Chaque frame traverse des étapes appelables une à une (pour
+# les tests et benchmarks), sans allocation, dans l'ordre de process :
+#   scatter_skeletons        os de la frame rangés à l'emplacement de leur ID
+#   gate_bones               os sûrs, et dernière pose sûre pour les autres (hold_last_valid)
+#   update_local_pose        unité et repère de sortie, représentations de la pose locale (des seuls os changés)
+#   compute_world_matrices   matrices globales, niveau par niveau
+#   compute_skinning_palette world @ inverse_bind
+#   apply_retargeting        rotations des rigs cibles
+#   compute_subsets          sous-ensembles d'os
+# MotiveLink en compile un à chaque description et publie ses tableaux (pose_arrays) dans son PoseBuffer.
+
+import numpy as np
+from numpy._typing import NDArray
+
+from MoMaMotiveLink.core import Tools
+from MoMaMotiveLink.core.BoneSubset import BoneSubset, BoneSubsetGroup, BoneSubsetStream
+from MoMaMotiveLink.core.CoordinateConversion import CoordinateConversion
+from MoMaMotiveLink.core.ForwardKinematics import ForwardKinematics
+from MoMaMotiveLink.core.Retargeting import Retargeter, RetargetTarget
+from MoMaMotiveLink.core.SkeletonLayout import SkeletonLayout
+
+# Représentations de la pose locale : nom -> (forme par os, nom du tableau publié dans le PoseBuffer)
+POSE_REPRESENTATIONS = {
+    "pos_quat": ((7,), "pos_quats"),  # [px, py, pz, qx, qy, qz, qw]
+    "affine": ((3, 4), "affines"),
+    "matrix": ((4, 4), "matrices"),
+    "dual_quat": ((8,), "dual_quats"),  # réel [qx, qy, qz, qw], dual [dx, dy, dz, dw]
+}
+
+# Recomposer les seuls os changés (rassembler, composer, ranger) a un surcoût fixe d'appels NumPy. Mesuré
+# (bench_change_detection) : il ne paie qu'à partir de SPARSE_COMPOSE_MIN_BONES os et tant qu'au plus
+# SPARSE_COMPOSE_MAX_FRACTION des os ont changé, sinon tout est recomposé
+SPARSE_COMPOSE_MIN_BONES = 512
+SPARSE_COMPOSE_MAX_FRACTION = 0.125
+
+# Détecter les changements puis tout recomposer coûte plus que tout recomposer sans détection. Quand trop d'os
+# ont changé pour la recomposition partielle, la détection est suspendue pendant ce nombre de frames : tout est
+# recomposé et envoyé en entier comme sans change_epsilon, puis une frame la réessaie
+CHANGE_PROBE_INTERVAL = 30
+
+# Formes de la palette de skinning (world @ inverse_bind), toujours en float32 pour l'envoi au GPU
+SKINNING_PALETTES = {"matrix": (4, 4), "affine": (3, 4)}
+
+
+class PosePipelineConfig:
+
+    def __init__(self, dtype=np.float64, representations=("matrix",), compute_world_matrices=True,
+                 conversion: CoordinateConversion = None, skinning_palette: str = None,
+                 retarget_targets: list[RetargetTarget] = (), bone_subsets: list[BoneSubset] = (),
+                 full_skeleton=True, change_epsilon: float = None, delta_fraction: float = 0.25,
+                 hold_last_valid=False, max_marker_error: float = None):
+        """
+        dtype : précision de tout le pipeline de pose (pose de repos, matrices locales et globales, buffers publiés).
+        np.float32 divise par deux la mémoire et la bande passante ; Motive envoie déjà des float32. La latence par
+        frame, faite surtout du coût des appels NumPy, ne change pas.
+        representations : formes de la pose locale calculées et publiées à chaque frame, voir POSE_REPRESENTATIONS.
+        compute_world_matrices : calculer et publier les matrices globales (cinématique directe).
+        conversion : unité et repère de sortie, appliqués à la pose de repos et aux frames.
+        skinning_palette : "matrix" (B, 4, 4) ou "affine" (B, 3, 4) pour calculer et publier la palette de skinning
+        à chaque frame, None pour aucune. Demande les matrices globales.
+        retarget_targets : rigs sur lesquelles retargeter les rotations locales de chaque acteur, voir Retargeting.
+        bone_subsets : sous-ensembles d'os (ou LOD) publiés à chaque frame, voir BoneSubset.
+        full_skeleton : traiter et publier le squelette complet. Avec False, seuls les os nécessaires aux
+        sous-ensembles sont rangés et composés ; representations, palette et retargeting ne s'appliquent pas.
+        change_epsilon : écart (unités Motive : mètres et composantes de quaternion) au-delà duquel un os est changé
+        depuis sa dernière composition. Rien n'est recalculé sans changement et, sur les grands squelettes, seuls
+        les os changés sont recomposés (voir SPARSE_COMPOSE_MIN_BONES) ; None recompose tout à chaque frame. Voir
+        aussi MotiveLink.get_latest_delta.
+        delta_fraction : part maximale d'os changés pour envoyer les seuls os changés (deltas creux). Une scène en
+        mouvement suspend la détection (voir CHANGE_PROBE_INTERVAL) : tout est alors envoyé en entier.
+        hold_last_valid : les os non sûrs (absents, tracking_valid faux ou erreur au-delà de max_marker_error)
+        gardent leur dernière pose sûre au lieu de la pose reçue. Demande NatNet 2.6+ (tracking_valid).
+        max_marker_error : erreur moyenne des marqueurs (mètres) au-delà de laquelle un os n'est pas sûr, None sans
+        limite. Voir PosePipeline.bone_confident.
+        """
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"Pose pipeline dtype must be float32 or float64, not {self.dtype}")
+        self.representations = tuple(representations)
+        for representation in self.representations:
+            if representation not in POSE_REPRESENTATIONS:
+                raise ValueError(f"Unknown pose representation {representation!r}, "
+                                 f"expected one of {list(POSE_REPRESENTATIONS)}")
+        self.compute_world_matrices = compute_world_matrices
+        if conversion is None:
+            conversion = CoordinateConversion(unit_scale=100.0)  # TODO Verify units (cm <-> m?)
+        self.conversion = conversion
+        if skinning_palette is not None and skinning_palette not in SKINNING_PALETTES:
+            raise ValueError(f"Unknown skinning palette {skinning_palette!r}, "
+                             f"expected one of {list(SKINNING_PALETTES)}")
+        if skinning_palette is not None and not compute_world_matrices:
+            raise ValueError("A skinning palette needs compute_world_matrices=True")
+        self.skinning_palette = skinning_palette
+        self.retarget_targets = list(retarget_targets)
+        if len({target.name for target in self.retarget_targets}) != len(self.retarget_targets):
+            raise ValueError("Retarget target names must be unique")
+        self.bone_subsets = list(bone_subsets)
+        if len({subset.name for subset in self.bone_subsets}) != len(self.bone_subsets):
+            raise ValueError("Bone subset names must be unique")
+        self.full_skeleton = full_skeleton
+        if not full_skeleton:
+            if not self.bone_subsets:
+                raise ValueError("full_skeleton=False needs at least one bone subset")
+            if skinning_palette is not None or self.retarget_targets:
+                raise ValueError("Skinning palette and retargeting need full_skeleton=True")
+        if change_epsilon is not None and not full_skeleton:
+            raise ValueError("Change detection needs full_skeleton=True")
+        if not 0.0 <= delta_fraction <= 1.0:
+            raise ValueError(f"delta_fraction must be between 0 and 1, not {delta_fraction}")
+        self.change_epsilon = change_epsilon
+        self.delta_fraction = delta_fraction
+        self.hold_last_valid = hold_last_valid
+        self.max_marker_error = max_marker_error
+
+
+class PosePipeline:
+    """
+    Pipeline compilé pour une disposition des acteurs. Les tableaux par os sont à plat (B = A * max_bones, voir
+    SkeletonLayout), les tenseurs pose_* en sont des vues (A, max_bones, ...). Tous sont mis à jour sur place.
+    """
+
+    def __init__(self, config: PosePipelineConfig, layout: SkeletonLayout):
+        self.config = config
+        self.layout = layout
+        dtype = config.dtype
+        self.dtype = dtype
+        self.full_skeleton = config.full_skeleton
+        # Étapes du squelette complet
+        self.compute_world = config.compute_world_matrices and config.full_skeleton
+        self.representations = config.representations if config.full_skeleton else ()
+        self.detect_changes = config.change_epsilon is not None
+
+        # Pose de repos dans le repère de sortie, matrices globales de la pose de repos et leurs inverses
+        conversion = config.conversion
+        self.forward_kinematics = ForwardKinematics(layout.bone_parent_indices, dtype=dtype)
+        self.rest_positions: NDArray[np.float64] = conversion.convert_positions(layout.rest_positions.astype(dtype))
+        self.rest_rotations: NDArray[np.float64] = conversion.convert_rotations(layout.rest_rotations.astype(dtype))
+        self.rest_scales: NDArray[np.float64] = np.full_like(self.rest_positions, fill_value=1.0)
+        bind_local_matrices = Tools.compose_transforms(self.rest_positions, self.rest_rotations, self.rest_scales,
+                                                       out=np.empty((layout.bone_count, 4, 4), dtype=dtype))
+        self.bind_matrices: NDArray[np.float64] = self.forward_kinematics.compute(bind_local_matrices)
+        self.inverse_bind_matrices: NDArray[np.float64] = np.linalg.inv(self.bind_matrices)
+
+        # Cibles de retargeting, rotations (A, T, 4) dans retargeter.rotations
+        self.retargeters: list[Retargeter] = [Retargeter(target, layout, self.rest_rotations, dtype=dtype)
+                                              for target in config.retarget_targets]
+        # Sous-ensembles d'os, matrices dans stream.matrices et stream.world_matrices
+        self.subset_streams: list[BoneSubsetStream] = [BoneSubsetStream(subset, layout)
+                                                       for subset in config.bone_subsets]
+        self.subset_group: BoneSubsetGroup = (BoneSubsetGroup(self.subset_streams, dtype=dtype,
+                                                              compute_world_matrices=config.compute_world_matrices)
+                                              if self.subset_streams else None)
+
+        self.__allocate_buffers()
+
+    def __allocate_buffers(self):
+        """Tous les buffers du traitement des frames"""
+        layout, dtype = self.layout, self.dtype
+        actor_count, max_bones = layout.actor_count, layout.max_bones
+        bone_count = layout.bone_count
+        representations, compute_world = self.representations, self.compute_world
+
+        # Un emplacement de plus à la fin : les os de la frame absents des descriptions y sont rangés puis ignorés
+        # Positions et rotations telles que reçues de Motive, avant conversion
+        self.__position_storage = np.zeros((bone_count + 1, 3), dtype=dtype)
+        self.__rotation_storage = np.zeros((bone_count + 1, 4), dtype=dtype)
+        self.__rotation_storage[:, 3] = 1.0
+        self.__bone_present_storage = np.zeros(bone_count + 1, dtype=bool)
+        self.__tracking_valid_storage = np.zeros(bone_count + 1, dtype=bool)
+        self.__error_storage = np.zeros(bone_count + 1, dtype=np.float32)
+
+        # [acteur, ID de l'os] -> emplacement de rangement ; la dernière colonne reçoit les IDs trop grands
+        scatter_indices = np.full((actor_count, layout.bone_id_to_index.shape[1] + 1), bone_count, dtype=np.intp)
+        scatter_indices[:, :-1] = np.where(layout.bone_id_to_index >= 0, layout.bone_id_to_index, bone_count)
+        self.__scatter_indices = scatter_indices
+        self.__frame_bone_ids = np.empty(max_bones, dtype=np.intp)
+        self.__frame_bone_indices = np.empty(max_bones, dtype=np.intp)
+
+        # Pose reçue (après gating), pose convertie dans le repère de sortie
+        self.raw_positions: NDArray[np.float64] = self.__position_storage[:bone_count]  # (B, 3)
+        self.raw_rotations: NDArray[np.float64] = self.__rotation_storage[:bone_count]  # (B, 4)
+        self.frame_positions: NDArray[np.float64] = np.zeros((bone_count, 3), dtype=dtype)  # (B, 3)
+        # Sans changement d'axes, les rotations sont utilisées telles quelles, sauf si seuls les os changés les
+        # mettent à jour
+        separate_rotations = self.config.conversion.rotates or self.detect_changes
+        self.frame_rotations: NDArray[np.float64] = (self.raw_rotations.copy() if separate_rotations
+                                                     else self.raw_rotations)  # (B, 4) - Quaternions
+        # Motive ne fournit pas d'échelle, on suppose 1.0
+        self.frame_scales: NDArray[np.float64] = np.ones((bone_count, 3), dtype=dtype)  # (B, 3)
+        self.bone_present: NDArray[np.bool_] = self.__bone_present_storage[:bone_count]  # (B,) - reçu dans la frame
+        # Suivi de chaque os tel que reçu de Motive : tracking_valid de la dernière frame (faux si absent), erreur
+        # moyenne des marqueurs de sa dernière réception ; os sûr : valide et d'erreur au plus max_marker_error
+        self.bone_tracking_valid: NDArray[np.bool_] = self.__tracking_valid_storage[:bone_count]  # (B,)
+        self.bone_errors: NDArray[np.float32] = self.__error_storage[:bone_count]  # (B,)
+        self.bone_confident: NDArray[np.bool_] = np.zeros(bone_count, dtype=bool)  # (B,)
+        self.actor_present: NDArray[np.bool_] = np.zeros(actor_count, dtype=bool)  # (A,)
+        self.__gate_scratch = np.empty(bone_count, dtype=bool)
+        if self.config.hold_last_valid:
+            # Dernière pose sûre de chaque os, telle que reçue
+            self.__held_positions = self.raw_positions.copy()
+            self.__held_rotations = self.raw_rotations.copy()
+        self.__compose_work = np.empty((13, bone_count), dtype=dtype)
+
+        # Seules les représentations demandées sont allouées, la cinématique directe part des matrices 4x4
+        self.local_matrices: NDArray[np.float64] = None  # (B, 4, 4)
+        self.world_matrices: NDArray[np.float64] = None  # (B, 4, 4)
+        if "matrix" in representations or compute_world or (self.full_skeleton and self.subset_streams):
+            self.local_matrices = np.empty((bone_count, 4, 4), dtype=dtype)
+        if compute_world:
+            self.world_matrices = np.empty((bone_count, 4, 4), dtype=dtype)
+        # Autres représentations de la pose locale, None si non demandées
+        self.local_pos_quats: NDArray[np.float64] = (np.empty((bone_count, 7), dtype=dtype)
+                                                     if "pos_quat" in representations else None)  # (B, 7)
+        self.local_affines: NDArray[np.float64] = (np.empty((bone_count, 3, 4), dtype=dtype)
+                                                   if "affine" in representations else None)  # (B, 3, 4)
+        self.local_dual_quats: NDArray[np.float64] = (np.empty((bone_count, 8), dtype=dtype)
+                                                      if "dual_quat" in representations else None)  # (B, 8)
+
+        # Tenseurs (A, max_bones, ...) de tous les acteurs
+        self.pose_positions = self.frame_positions.reshape(actor_count, max_bones, 3)
+        self.pose_rotations = self.frame_rotations.reshape(actor_count, max_bones, 4)
+        self.pose_scales = self.frame_scales.reshape(actor_count, max_bones, 3)
+        self.pose_bone_present = self.bone_present.reshape(actor_count, max_bones)
+        self.pose_bone_confident = self.bone_confident.reshape(actor_count, max_bones)
+        self.pose_local_matrices, self.pose_world_matrices = None, None
+        if self.local_matrices is not None:
+            self.pose_local_matrices = self.local_matrices.reshape(actor_count, max_bones, 4, 4)
+        if compute_world:
+            self.pose_world_matrices = self.world_matrices.reshape(actor_count, max_bones, 4, 4)
+
+        self.__allocate_change_detection()
+
+        # Palette de skinning world @ inverse_bind, None si non demandée
+        self.skinning_palette: NDArray[np.float32] = None  # (B, 4, 4) ou (B, 3, 4)
+        self.__palette_work = None
+        if self.config.skinning_palette is not None:
+            palette_shape = (bone_count,) + SKINNING_PALETTES[self.config.skinning_palette]
+            self.skinning_palette = np.empty(palette_shape, dtype=np.float32)
+            if dtype != np.float32:
+                # Produit dans la précision du pipeline puis conversion : matmul allouerait sinon pour la conversion
+                self.__palette_work = np.empty(palette_shape, dtype=dtype)
+
+        self.__allocate_subsets()
+
+        # Identité pour le remplissage et les acteurs pas encore reçus
+        self.__compose_representations()
+        if compute_world:
+            np.copyto(self.world_matrices, self.local_matrices)
+            self.compute_skinning_palette()
+        self.apply_retargeting()
+        self.compute_subsets()
+
+        self.__build_pose_arrays()
+
+    def __allocate_change_detection(self):
+        """
+        Détection de changement (change_epsilon) : os changés à la dernière frame et, pour chaque os, numéro de la
+        dernière publication où sa pose locale ou globale a changé. Positions et rotations reçues à la dernière
+        composition de chaque os, et buffers compacts des os changés, limités à ceux de la recomposition partielle.
+        """
+        bone_count, dtype = self.layout.bone_count, self.dtype
+        self.bone_changed: NDArray[np.bool_] = None  # (B,)
+        self.changed_bone_count = 0
+        self.local_change_sequences: NDArray[np.int64] = None  # (B,)
+        self.world_change_sequences: NDArray[np.int64] = None  # (B,)
+        self.__changed_representations = (None, None, None, None)
+        self.__sparse_limit = 0
+        if bone_count >= SPARSE_COMPOSE_MIN_BONES:
+            self.__sparse_limit = int(min(self.config.delta_fraction, SPARSE_COMPOSE_MAX_FRACTION) * bone_count)
+        self.__probe_countdown = 0
+        if not self.detect_changes:
+            return
+        sparse_limit = self.__sparse_limit
+        self.bone_changed = np.zeros(bone_count, dtype=bool)
+        self.local_change_sequences = np.zeros(bone_count, dtype=np.int64)
+        if self.compute_world:
+            self.world_change_sequences = np.zeros(bone_count, dtype=np.int64)
+            self.__world_changed = np.zeros(bone_count, dtype=bool)
+        self.__reference_positions = self.raw_positions.copy()
+        self.__reference_rotations = self.raw_rotations.copy()
+        self.__reference_present = np.zeros(bone_count, dtype=bool)
+        self.__position_difference = np.empty((bone_count, 3), dtype=dtype)
+        self.__rotation_difference = np.empty((bone_count, 4), dtype=dtype)
+        # Quatre drapeaux par os, lus comme un uint32 (B,) : "au moins un" sans réduction np.any(axis=1), lente
+        self.__position_exceeds = np.zeros((bone_count, 4), dtype=bool)  # dernière colonne toujours False
+        self.__rotation_exceeds = np.zeros((bone_count, 4), dtype=bool)
+        self.__exceeds_words = np.empty(bone_count, dtype=np.uint32)
+        self.__change_scratch = np.empty(bone_count, dtype=bool)
+        self.__change_ranks = np.empty(bone_count, dtype=np.intp)
+        self.__bone_range = np.arange(bone_count, dtype=np.intp)
+        # Une ligne de plus : les os inchangés y sont envoyés par __get_changed_indices
+        self.__changed_indices = np.empty(sparse_limit + 1, dtype=np.intp)
+        self.__changed_raw_positions = np.empty((sparse_limit, 3), dtype=dtype)
+        self.__changed_raw_rotations = np.empty((sparse_limit, 4), dtype=dtype)
+        self.__changed_positions = np.empty((sparse_limit, 3), dtype=dtype)
+        self.__changed_rotations = np.empty((sparse_limit, 4), dtype=dtype)
+        self.__changed_representations = tuple(
+            None if array is None else np.empty((sparse_limit,) + array.shape[1:], dtype=dtype)
+            for array in (self.local_matrices, self.local_affines, self.local_pos_quats, self.local_dual_quats))
+        # Vues ligne à ligne (voir Tools.as_rows) des tableaux où les os changés sont rassemblés puis rangés
+        self.__raw_rows = (Tools.as_rows(self.raw_positions), Tools.as_rows(self.raw_rotations))
+        self.__changed_raw_rows = (Tools.as_rows(self.__changed_raw_positions),
+                                   Tools.as_rows(self.__changed_raw_rotations))
+        self.__scatter_rows = tuple(
+            (Tools.as_rows(array), Tools.as_rows(changed_array))
+            for array, changed_array in zip(
+                (self.__reference_positions, self.__reference_rotations, self.frame_positions,
+                 self.frame_rotations, self.local_matrices, self.local_affines, self.local_pos_quats,
+                 self.local_dual_quats),
+                (self.__changed_raw_positions, self.__changed_raw_rotations, self.__changed_positions,
+                 self.__changed_rotations) + self.__changed_representations)
+            if array is not None)
+
+    def __allocate_subsets(self):
+        """Sous-ensembles : à partir des matrices locales du squelette complet, ou de l'union de leurs chaînes seule"""
+        self.__subset_indices = None
+        if self.subset_group is None:
+            return
+        bone_count, dtype = self.layout.bone_count, self.dtype
+        if self.full_skeleton:
+            source_rows = np.arange(bone_count, dtype=np.intp)
+        else:
+            subset_indices = self.subset_group.get_required_indices()
+            source_rows = np.full(bone_count, -1, dtype=np.intp)
+            source_rows[subset_indices] = np.arange(len(subset_indices))
+            # Les os hors des chaînes ne sont pas rangés
+            kept = np.zeros(bone_count + 1, dtype=bool)
+            kept[subset_indices] = True
+            self.__scatter_indices[~kept[self.__scatter_indices]] = bone_count
+            subset_count = len(subset_indices)
+            self.__subset_indices = subset_indices
+            self.__subset_raw_positions = np.zeros((subset_count, 3), dtype=dtype)
+            self.__subset_raw_rotations = np.zeros((subset_count, 4), dtype=dtype)
+            self.__subset_positions = np.zeros((subset_count, 3), dtype=dtype)
+            self.__subset_rotations = np.zeros((subset_count, 4), dtype=dtype)
+            self.__subset_local_matrices = np.empty((subset_count, 4, 4), dtype=dtype)
+            self.__subset_work = np.empty((13, subset_count), dtype=dtype)
+        self.subset_group.bind(source_rows)
+
+    def __build_pose_arrays(self):
+        """
+        pose_arrays : nom -> tableau publié à chaque frame ; change_groups : numéros de changement publiés ->
+        tableaux publiés qu'ils couvrent, voir PoseDeltaReader
+        """
+        local_arrays = {"pos_quat": self.local_pos_quats, "affine": self.local_affines,
+                        "matrix": self.local_matrices, "dual_quat": self.local_dual_quats}
+        pose_arrays = {POSE_REPRESENTATIONS[representation][1]: local_arrays[representation]
+                       for representation in self.representations}
+        if self.compute_world:
+            pose_arrays["world_matrices"] = self.world_matrices
+        if self.skinning_palette is not None:
+            pose_arrays["skinning_palette"] = self.skinning_palette
+        for retargeter in self.retargeters:
+            pose_arrays["retarget_" + retargeter.name] = retargeter.rotations
+        for stream in self.subset_streams:
+            pose_arrays["subset_" + stream.name] = stream.matrices
+            if stream.world_matrices is not None:
+                pose_arrays["subset_" + stream.name + "_world"] = stream.world_matrices
+        pose_arrays["bone_present"] = self.bone_present
+        pose_arrays["bone_tracking_valid"] = self.bone_tracking_valid
+        pose_arrays["bone_errors"] = self.bone_errors
+        pose_arrays["bone_confident"] = self.bone_confident
+        pose_arrays["actor_present"] = self.actor_present
+        change_groups = {}
+        if self.detect_changes:
+            pose_arrays["local_change_sequences"] = self.local_change_sequences
+            change_groups["local_change_sequences"] = [POSE_REPRESENTATIONS[representation][1]
+                                                       for representation in self.representations] + ["bone_present"]
+            if self.compute_world:
+                pose_arrays["world_change_sequences"] = self.world_change_sequences
+                change_groups["world_change_sequences"] = ["world_matrices"] + (
+                    ["skinning_palette"] if self.skinning_palette is not None else [])
+        self.pose_arrays: dict[str, NDArray] = pose_arrays
+        self.change_groups: dict[str, list[str]] = change_groups
+
+    def process(self, skeleton_list: list, sequence: int) -> int:
+        """
+        Toutes les étapes pour les squelettes d'une frame (Skeleton ou SkeletonArrays), sans allocation.
+        sequence : numéro de la publication à venir, pour les numéros de changement.
+        Retourne le nombre d'os changés, -1 sans squelette complet.
+        """
+        self.scatter_skeletons(skeleton_list)
+        self.gate_bones()
+        changed_count = -1
+        if self.full_skeleton:
+            changed_count = self.update_local_pose(sequence)
+            # Sans os changé, tout ce qui suit est inchangé
+            if changed_count != 0:
+                if self.compute_world:
+                    self.compute_world_matrices()
+                    self.compute_skinning_palette()
+                self.apply_retargeting()
+        if changed_count != 0:
+            self.compute_subsets()
+        return changed_count
+
+    def scatter_skeletons(self, skeleton_list: list):
+        """
+        Range chaque os de chaque squelette (Actor 1, Actor 2...) à l'emplacement de son ID. Les os et acteurs
+        absents de la frame gardent leur dernière pose et sont masqués.
+        """
+        skeleton_id_to_actor = self.layout.skeleton_id_to_actor
+        self.actor_present[:] = False
+        self.__bone_present_storage[:] = False
+        self.__tracking_valid_storage[:] = False
+        for skeleton in skeleton_list:
+            actor = skeleton_id_to_actor.get(skeleton.id_num, -1)
+            if actor < 0:
+                # Squelette absent des descriptions
+                continue
+            self.__scatter_bones(skeleton, actor)
+            self.actor_present[actor] = True
+
+    def __scatter_bones(self, skeleton, actor: int):
+        """
+        Copie positions [x, y, z] et rotations [qx, qy, qz, qw] des os du squelette à l'emplacement de leur ID
+        et les marque présents. Dans la frame, l'ID d'un os est (ID du squelette << 16) | ID de l'os.
+        """
+        positions, rotations = self.__position_storage, self.__rotation_storage
+        bone_present, tracking_valid, errors = (self.__bone_present_storage, self.__tracking_valid_storage,
+                                                self.__error_storage)
+        scatter_indices = self.__scatter_indices[actor]
+        if hasattr(skeleton, "records"):
+            # décodage en tableaux NumPy (NatNetClient.set_array_decode)
+            count = len(skeleton.ids)
+            if count > len(self.__frame_bone_ids):
+                self.__frame_bone_ids = np.empty(count, dtype=np.intp)
+                self.__frame_bone_indices = np.empty(count, dtype=np.intp)
+            bone_ids = self.__frame_bone_ids[:count]
+            indices = self.__frame_bone_indices[:count]
+            np.bitwise_and(skeleton.ids, 0xFFFF, out=bone_ids)
+            np.take(scatter_indices, bone_ids, mode="clip", out=indices)
+            positions[indices] = skeleton.positions
+            rotations[indices] = skeleton.quaternions
+            bone_present[indices] = True
+            tracking_valid[indices] = skeleton.tracking_valid
+            errors[indices] = skeleton.errors
+        else:
+            # Dans le SDK, les os sont stockés comme une liste de RigidBodies
+            last_column = len(scatter_indices) - 1
+            for bone in skeleton.rigid_body_list:
+                index = scatter_indices[min(bone.id_num & 0xFFFF, last_column)]
+                positions[index] = bone.pos
+                rotations[index] = bone.rot
+                bone_present[index] = True
+                tracking_valid[index] = bone.tracking_valid
+                errors[index] = bone.error
+        # L'emplacement de rangement n'est jamais présent
+        bone_present[-1] = False
+        tracking_valid[-1] = False
+
+    def gate_bones(self):
+        """
+        bone_confident : os reçus avec tracking_valid et d'erreur au plus max_marker_error. Avec hold_last_valid,
+        les autres reprennent leur dernière pose sûre, sans branche par os.
+        """
+        confident = self.bone_confident
+        np.copyto(confident, self.bone_tracking_valid)
+        if self.config.max_marker_error is not None:
+            np.less_equal(self.bone_errors, self.config.max_marker_error, out=self.__gate_scratch)
+            np.logical_and(confident, self.__gate_scratch, out=confident)
+        if self.config.hold_last_valid:
+            np.copyto(self.__held_positions, self.raw_positions, where=confident[:, None])
+            np.copyto(self.__held_rotations, self.raw_rotations, where=confident[:, None])
+            np.copyto(self.raw_positions, self.__held_positions)
+            np.copyto(self.raw_rotations, self.__held_rotations)
+
+    def update_local_pose(self, sequence: int) -> int:
+        """
+        Unité et repère de sortie puis représentations de la pose locale. Avec la détection de changement, seuls
+        les os changés sont recomposés tant qu'ils sont peu nombreux (voir SPARSE_COMPOSE_MIN_BONES), et une scène
+        en mouvement suspend la détection (voir CHANGE_PROBE_INTERVAL). Retourne le nombre d'os changés.
+        sequence : numéro de la publication à venir, pour les numéros de changement.
+        """
+        if not self.detect_changes:
+            count = self.layout.bone_count
+        else:
+            if self.__probe_countdown > 0:
+                self.__probe_countdown -= 1
+                count = self.__mark_all_changed(sequence)
+            else:
+                count = self.__detect_changes(sequence)
+                if count <= self.__sparse_limit:
+                    if count > 0:
+                        self.__update_changed_bones(count)
+                    return count
+                self.__probe_countdown = CHANGE_PROBE_INTERVAL
+            np.copyto(self.__reference_positions, self.raw_positions)
+            np.copyto(self.__reference_rotations, self.raw_rotations)
+        conversion = self.config.conversion
+        conversion.convert_positions(self.raw_positions, out=self.frame_positions)
+        conversion.convert_rotations(self.raw_rotations, out=self.frame_rotations)
+        self.__compose_representations()
+        return count
+
+    def __compose_representations(self, count: int = None):
+        """
+        Représentations demandées de la pose locale, directement depuis positions et rotations.
+        count : seulement les count premiers os des buffers compacts des os changés, voir __update_changed_bones.
+        """
+        if count is None:
+            positions, rotations, scales = self.frame_positions, self.frame_rotations, self.frame_scales
+            work = self.__compose_work
+            matrices, affines, pos_quats, dual_quats = (self.local_matrices, self.local_affines,
+                                                        self.local_pos_quats, self.local_dual_quats)
+        else:
+            positions, rotations = self.__changed_positions[:count], self.__changed_rotations[:count]
+            scales = self.frame_scales[:count]  # Constantes
+            work = self.__compose_work[:, :count]
+            matrices, affines, pos_quats, dual_quats = (None if array is None else array[:count]
+                                                        for array in self.__changed_representations)
+        if matrices is not None:
+            Tools.compose_transforms(positions, rotations, scales, out=matrices, work=work)
+        if affines is not None:
+            if matrices is not None:
+                np.copyto(affines, matrices[:, :3])
+            else:
+                Tools.compose_transforms(positions, rotations, scales, out=affines, work=work)
+        if pos_quats is not None:
+            Tools.pack_pos_quats(positions, rotations, out=pos_quats)
+        if dual_quats is not None:
+            Tools.compose_dual_quaternions(positions, rotations, out=dual_quats, work=work[0])
+
+    def __detect_changes(self, sequence: int) -> int:
+        """
+        bone_changed : os apparus, disparus, ou écartés de plus de change_epsilon de leur dernière composition.
+        Met à jour les numéros de changement de la publication sequence et retourne le nombre d'os changés.
+        """
+        changed, scratch, words = self.bone_changed, self.__change_scratch, self.__exceeds_words
+        position_exceeds, rotation_exceeds = self.__position_exceeds, self.__rotation_exceeds
+        epsilon = self.config.change_epsilon
+        difference = self.__position_difference
+        np.subtract(self.raw_positions, self.__reference_positions, out=difference)
+        np.abs(difference, out=difference)
+        np.greater(difference, epsilon, out=position_exceeds[:, :3])
+        difference = self.__rotation_difference
+        np.subtract(self.raw_rotations, self.__reference_rotations, out=difference)
+        np.abs(difference, out=difference)
+        np.greater(difference, epsilon, out=rotation_exceeds)
+        np.bitwise_or(position_exceeds.view(np.uint32)[:, 0], rotation_exceeds.view(np.uint32)[:, 0], out=words)
+        np.not_equal(words, 0, out=changed)
+        np.not_equal(self.bone_present, self.__reference_present, out=scratch)
+        np.logical_or(changed, scratch, out=changed)
+        np.copyto(self.__reference_present, self.bone_present)
+
+        count = int(np.count_nonzero(changed))
+        self.changed_bone_count = count
+        if count > 0:
+            np.copyto(self.local_change_sequences, sequence, where=changed)
+            if self.world_change_sequences is None:
+                pass
+            elif count > self.__sparse_limit:
+                # Tout sera recomposé, la propagation ne vaut pas son coût
+                self.world_change_sequences.fill(sequence)
+            else:
+                # Les matrices globales des descendants changent aussi
+                self.forward_kinematics.propagate(changed, out=self.__world_changed)
+                np.copyto(self.world_change_sequences, sequence, where=self.__world_changed)
+        return count
+
+    def __mark_all_changed(self, sequence: int) -> int:
+        """Détection suspendue : tous les os sont changés dans la publication sequence"""
+        self.bone_changed.fill(True)
+        np.copyto(self.__reference_present, self.bone_present)
+        count = len(self.bone_changed)
+        self.changed_bone_count = count
+        self.local_change_sequences.fill(sequence)
+        if self.world_change_sequences is not None:
+            self.world_change_sequences.fill(sequence)
+        return count
+
+    def __get_changed_indices(self, count: int) -> NDArray[np.intp]:
+        """Index croissants des count os changés, sans allocation (np.flatnonzero alloue)"""
+        ranks, unchanged = self.__change_ranks, self.__change_scratch
+        # Rang de chaque os changé parmi les os changés, les os inchangés vont sur la ligne en trop
+        np.copyto(ranks, self.bone_changed)
+        np.cumsum(ranks, out=ranks)
+        np.subtract(ranks, 1, out=ranks)
+        np.logical_not(self.bone_changed, out=unchanged)
+        np.copyto(ranks, len(self.__changed_indices) - 1, where=unchanged)
+        np.put(self.__changed_indices, ranks, self.__bone_range, mode="clip")
+        return self.__changed_indices[:count]
+
+    def __update_changed_bones(self, count: int):
+        """
+        Conversion et composition des seuls os changés, dans les buffers compacts, puis rangement à leur index.
+        Lignes entières rassemblées et rangées par ndarray.take / ndarray.put, sans allocation.
+        """
+        indices = self.__get_changed_indices(count)
+        for rows, changed_rows in zip(self.__raw_rows, self.__changed_raw_rows):
+            rows.take(indices, mode="clip", out=changed_rows[:count])
+        raw_positions, raw_rotations = self.__changed_raw_positions[:count], self.__changed_raw_rotations[:count]
+        self.config.conversion.convert_positions(raw_positions, out=self.__changed_positions[:count])
+        self.config.conversion.convert_rotations(raw_rotations, out=self.__changed_rotations[:count])
+        self.__compose_representations(count)
+        # Références, pose convertie et représentations des os changés
+        for rows, changed_rows in self.__scatter_rows:
+            rows.put(indices, changed_rows[:count], mode="clip")
+
+    def compute_world_matrices(self):
+        """Matrices globales depuis les matrices locales, niveau par niveau (voir ForwardKinematics)"""
+        self.forward_kinematics.compute(self.local_matrices, out=self.world_matrices)
+
+    def compute_skinning_palette(self):
+        """world @ inverse_bind pour chaque os, écrit sur place dans skinning_palette"""
+        palette = self.skinning_palette
+        if palette is None:
+            return
+        # Pour la forme affine, seules les trois premières lignes du produit sont calculées
+        world_matrices = self.world_matrices[:, :palette.shape[1]]
+        if self.__palette_work is None:
+            np.matmul(world_matrices, self.inverse_bind_matrices, out=palette)
+        else:
+            np.matmul(world_matrices, self.inverse_bind_matrices, out=self.__palette_work)
+            np.copyto(palette, self.__palette_work)
+
+    def apply_retargeting(self):
+        """Rotations des rigs cibles depuis les rotations locales converties"""
+        for retargeter in self.retargeters:
+            retargeter.apply(self.frame_rotations)
+
+    def compute_subsets(self):
+        """Matrices des sous-ensembles d'os, depuis le squelette complet ou la seule union de leurs chaînes"""
+        if self.subset_group is None:
+            return
+        if self.full_skeleton:
+            local_matrices = self.local_matrices
+        else:
+            indices = self.__subset_indices
+            conversion = self.config.conversion
+            np.take(self.raw_positions, indices, axis=0, mode="clip", out=self.__subset_raw_positions)
+            np.take(self.raw_rotations, indices, axis=0, mode="clip", out=self.__subset_raw_rotations)
+            conversion.convert_positions(self.__subset_raw_positions, out=self.__subset_positions)
+            rotations = self.__subset_raw_rotations
+            if conversion.rotates:
+                rotations = conversion.convert_rotations(rotations, out=self.__subset_rotations)
+            local_matrices = Tools.compose_transforms(self.__subset_positions, rotations,
+                                                      out=self.__subset_local_matrices, work=self.__subset_work)
+        self.subset_group.apply(local_matrices)
@@ -0,0 +1,89 @@
+# Retargeting des rotations locales des acteurs Motive vers des rigs de moteur.
+#
+# Une cible (RetargetTarget) donne les os de la rig, leur rotation de repos et la correspondance
+# os de la rig -> os Motive. À la réception des descriptions, elle est compilée (Retargeter) pour tous les
+# acteurs en un tableau d'index dans les rotations de la frame et un décalage de repos par os :
+#   rotation cible = rotation Motive * décalage, décalage = conjugué(repos Motive) * repos cible
+# ce qui redonne exactement la pose de repos de la cible quand l'acteur est dans la sienne. Les décalages
+# sont stockés sous forme de matrices 4x4 de multiplication à droite : à chaque frame, un np.take puis un
+# seul np.matmul par cible, sans dictionnaire. Les os de la rig sans correspondance gardent leur rotation
+# de repos. Les rotations de repos de la cible doivent être exprimées dans le repère de sortie (voir
+# CoordinateConversion).
+
+import numpy as np
+from numpy._typing import NDArray
+
+from MoMaMotiveLink.core import Tools
+from MoMaMotiveLink.core.SkeletonLayout import SkeletonLayout
+
+
+class RetargetTarget:
+    """
+    name : nom de la rig, utilisé pour la publication ("retarget_<name>").
+    bone_names : os de la rig, dans l'ordre de sortie (T,).
+    rest_rotations : (T, 4) rotations locales de repos de la rig [qx, qy, qz, qw].
+    bone_map : os de la rig -> os Motive. Les os de la rig absents gardent leur rotation de repos.
+    """
+
+    def __init__(self, name: str, bone_names: list[str], rest_rotations, bone_map: dict[str, str]):
+        self.name = name
+        self.bone_names = list(bone_names)
+        self.rest_rotations: NDArray[np.float64] = np.asarray(rest_rotations, dtype=np.float64).reshape(-1, 4)
+        if len(self.rest_rotations) != len(self.bone_names):
+            raise ValueError(f"Retarget target {name!r}: {len(self.bone_names)} bones "
+                             f"but {len(self.rest_rotations)} rest rotations")
+        unknown = set(bone_map) - set(self.bone_names)
+        if unknown:
+            raise ValueError(f"Retarget target {name!r}: unknown target bones {sorted(unknown)}")
+        self.bone_map = dict(bone_map)
+
+
+class Retargeter:
+    """Cible compilée pour la disposition des acteurs : rotations (A, T, 4) calculées par apply"""
+
+    def __init__(self, target: RetargetTarget, layout: SkeletonLayout, source_rest_rotations: NDArray,
+                 dtype=np.float64):
+        self.target = target
+        self.name = target.name
+        actor_count, bone_count = layout.actor_count, len(target.bone_names)
+        self.actor_count = actor_count
+        self.bone_count = bone_count
+
+        # Index des os Motive dans les rotations de la frame ; layout.bone_count : rotation identité
+        self.source_indices: NDArray[np.intp] = np.full((actor_count, bone_count), layout.bone_count,
+                                                        dtype=np.intp)
+        for actor in range(actor_count):
+            start = actor * layout.max_bones
+            actor_bones = {layout.bone_names[index]: index
+                           for index in range(start, start + int(layout.actor_bone_counts[actor]))}
+            for target_bone, target_name in enumerate(target.bone_names):
+                source_index = actor_bones.get(target.bone_map.get(target_name), -1)
+                if source_index >= 0:
+                    self.source_indices[actor, target_bone] = source_index
+        self.mapped: NDArray[np.bool_] = self.source_indices < layout.bone_count  # (A, T)
+
+        # Décalages de repos, identité source pour les os sans correspondance
+        source_rest = np.zeros((layout.bone_count + 1, 4), dtype=np.float64)
+        source_rest[:layout.bone_count] = source_rest_rotations
+        source_rest[layout.bone_count, 3] = 1.0
+        target_rest = np.broadcast_to(target.rest_rotations, (actor_count, bone_count, 4))
+        self.rest_offsets: NDArray[np.float64] = Tools.multiply_quaternions(
+            Tools.conjugate_quaternions(source_rest[self.source_indices]), target_rest)  # (A, T, 4)
+        offset_matrices = Tools.quaternion_right_matrices(self.rest_offsets)
+        self.offset_matrices: NDArray = offset_matrices.reshape(actor_count * bone_count, 4, 4).astype(dtype)
+        self.flat_source_indices = self.source_indices.reshape(-1)
+
+        # Buffers de la frame
+        self.source_rotations = np.zeros((layout.bone_count + 1, 4), dtype=dtype)
+        self.source_rotations[layout.bone_count, 3] = 1.0
+        self.gathered_rotations = np.empty((actor_count * bone_count, 4, 1), dtype=dtype)
+        self.flat_rotations = np.empty((actor_count * bone_count, 4, 1), dtype=dtype)
+        self.rotations: NDArray = self.flat_rotations.reshape(actor_count, bone_count, 4)  # (A, T, 4)
+
+    def apply(self, frame_rotations: NDArray) -> NDArray:
+        """Rotations de la rig (A, T, 4) à partir des rotations locales de la frame (B, 4), sans allocation"""
+        np.copyto(self.source_rotations[:-1], frame_rotations)
+        np.take(self.source_rotations, self.flat_source_indices, axis=0, mode="clip",
+                out=self.gathered_rotations[..., 0])
+        np.matmul(self.offset_matrices, self.gathered_rotations, out=self.flat_rotations)
+        return self.rotations
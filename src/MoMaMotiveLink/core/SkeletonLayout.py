@@ -0,0 +1,83 @@
+# Disposition des acteurs et de leurs os, construite une fois à partir des descriptions Motive.
+#
+# Chaque acteur (squelette) occupe une ligne de max_bones emplacements dans les tenseurs de pose
+# (A, max_bones, ...). L'index à plat d'un os est actor * max_bones + emplacement : les tableaux par os
+# ci-dessous sont dans cet ordre, les emplacements au-delà du nombre d'os d'un acteur sont du remplissage
+# (bone_mask à False, ID -1, parent -1, pose de repos identité).
+
+import numpy as np
+from numpy._typing import NDArray
+
+from MoMaMotiveLink.natnetsdk.DataDescriptions import DataDescriptions
+
+
+def decode_name(name) -> str:
+    return name.decode() if isinstance(name, bytes) else name
+
+
+class SkeletonLayout:
+
+    def __init__(self, data_descs: DataDescriptions = None):
+        skeleton_list = data_descs.skeleton_list if data_descs is not None else []
+
+        # Acteurs
+        self.actor_count = len(skeleton_list)
+        self.skeleton_ids: NDArray[np.int32] = np.array([skeleton.id_num for skeleton in skeleton_list],
+                                                        dtype=np.int32)  # (A,)
+        self.skeleton_names: list[str] = [decode_name(skeleton.name) for skeleton in skeleton_list]
+        self.skeleton_id_to_actor: dict[int, int] = {int(skeleton_id): actor
+                                                     for actor, skeleton_id in enumerate(self.skeleton_ids)}
+        self.skeleton_name_to_actor: dict[str, int] = {name: actor for actor, name in enumerate(self.skeleton_names)}
+        self.actor_bone_counts: NDArray[np.int32] = np.array(
+            [len(skeleton.rigid_body_description_list) for skeleton in skeleton_list], dtype=np.int32)  # (A,)
+        self.max_bones = int(self.actor_bone_counts.max()) if self.actor_count > 0 else 0
+        self.bone_count = self.actor_count * self.max_bones
+
+        # (A, max_bones) : emplacements occupés par un os
+        self.bone_mask: NDArray[np.bool_] = np.arange(self.max_bones) < self.actor_bone_counts[:, np.newaxis]
+
+        # Os, à plat (A * max_bones)
+        count = self.bone_count
+        self.bone_names: list[str] = [""] * count
+        self.bone_ids: NDArray[np.int32] = np.full(count, -1, dtype=np.int32)  # ID de l'os dans son squelette
+        self.bone_parents: NDArray[np.int32] = np.full(count, -1, dtype=np.int32)  # ID du parent dans son squelette
+        self.bone_parent_indices: NDArray[np.int32] = np.full(count, -1, dtype=np.int32)  # -1 pour une racine
+        self.rest_positions: NDArray[np.float64] = np.zeros((count, 3), dtype=np.float64)
+        self.rest_rotations: NDArray[np.float64] = np.zeros((count, 4), dtype=np.float64)
+        self.rest_rotations[:, 3] = 1.0
+
+        for actor, skeleton in enumerate(skeleton_list):
+            start = actor * self.max_bones
+            bone_descs = skeleton.rigid_body_description_list
+            # Les parents sont des IDs d'os du même squelette
+            bone_id_to_index = {bone_desc.id_num: start + slot for slot, bone_desc in enumerate(bone_descs)}
+            for slot, bone_desc in enumerate(bone_descs):
+                index = start + slot
+                self.bone_names[index] = decode_name(bone_desc.sz_name)
+                self.bone_ids[index] = bone_desc.id_num
+                self.bone_parents[index] = bone_desc.parent_id
+                self.bone_parent_indices[index] = bone_id_to_index.get(bone_desc.parent_id, -1)
+                self.rest_positions[index] = bone_desc.pos
+                self.rest_rotations[index] = bone_desc.rot
+
+        # (A, max ID + 1) : [acteur, ID de l'os] -> index à plat de l'os, -1 si absent
+        max_bone_id = int(self.bone_ids.max()) if count > 0 else 0
+        self.bone_id_to_index: NDArray[np.int32] = np.full((self.actor_count, max(max_bone_id, 0) + 1), -1,
+                                                           dtype=np.int32)
+        flat_indices = np.arange(count, dtype=np.int32).reshape(self.actor_count, self.max_bones)
+        for actor in range(self.actor_count):
+            bone_count = self.actor_bone_counts[actor]
+            bone_ids = self.bone_ids[flat_indices[actor, :bone_count]]
+            self.bone_id_to_index[actor, bone_ids] = flat_indices[actor, :bone_count]
+
+    def get_actor_index(self, skeleton: int | str) -> int:
+        """Index de l'acteur d'après l'ID ou le nom de son squelette, -1 si inconnu"""
+        if isinstance(skeleton, str):
+            return self.skeleton_name_to_actor.get(skeleton, -1)
+        return self.skeleton_id_to_actor.get(int(skeleton), -1)
+
+    def get_actors(self) -> list[dict]:
+        return [{"id": int(self.skeleton_ids[actor]),
+                 "name": self.skeleton_names[actor],
+                 "bone_count": int(self.actor_bone_counts[actor])}
+                for actor in range(self.actor_count)]
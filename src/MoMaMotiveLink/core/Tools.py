@@ -80,4 +80,215 @@ def compose_transform(position, rotation, scale):
         1.0,
     )
 
-    return output
\ No newline at end of file
+    return output
+
+def compose_transforms(positions, rotations, scales=None, out=None, work=None):
+    """
+    Version vectorisée de compose_transform pour B transformations à la fois.
+
+    positions (B, 3), rotations (B, 4) quaternions [qx, qy, qz, qw], scales (B, 3) ou None pour 1.0.
+    Le résultat est écrit dans out (B, 4, 4), alloué en float64 si absent, puis retourné.
+    Avec out (B, 3, 4), seules les trois premières lignes (matrices affines) sont écrites.
+    work (13, B) : buffer de calcul du dtype de out, pour n'allouer aucun temporaire.
+    """
+    count = len(positions)
+    if out is None:
+        out = np.empty((count, 4, 4), dtype=np.float64)
+    if work is None:
+        work = np.empty((13, count), dtype=out.dtype)
+
+    # Pré-calculs quaternion, une ligne de work par valeur
+    qx, qy, qz, qw = rotations[:, 0], rotations[:, 1], rotations[:, 2], rotations[:, 3]
+    x2, y2, z2 = work[0], work[1], work[2]
+    np.multiply(qx, 2.0, out=x2)
+    np.multiply(qy, 2.0, out=y2)
+    np.multiply(qz, 2.0, out=z2)
+    xx, yy, zz = np.multiply(qx, x2, out=work[3]), np.multiply(qy, y2, out=work[4]), np.multiply(qz, z2, out=work[5])
+    xy, xz, yz = np.multiply(qx, y2, out=work[6]), np.multiply(qx, z2, out=work[7]), np.multiply(qy, z2, out=work[8])
+    wx, wy, wz = np.multiply(qw, x2, out=work[9]), np.multiply(qw, y2, out=work[10]), np.multiply(qw, z2, out=work[11])
+    diagonal = work[12]
+
+    # Rotation
+    np.add(yy, zz, out=diagonal)
+    np.subtract(1.0, diagonal, out=out[:, 0, 0])
+    np.subtract(xy, wz, out=out[:, 0, 1])
+    np.add(xz, wy, out=out[:, 0, 2])
+
+    np.add(xy, wz, out=out[:, 1, 0])
+    np.add(xx, zz, out=diagonal)
+    np.subtract(1.0, diagonal, out=out[:, 1, 1])
+    np.subtract(yz, wx, out=out[:, 1, 2])
+
+    np.subtract(xz, wy, out=out[:, 2, 0])
+    np.add(yz, wx, out=out[:, 2, 1])
+    np.add(xx, yy, out=diagonal)
+    np.subtract(1.0, diagonal, out=out[:, 2, 2])
+
+    # Échelle par colonne, comme compose_transform
+    # (une colonne 1D à la fois : le produit sur la vue (B, 3, 3) ferait une copie de out)
+    if scales is not None:
+        for row in range(3):
+            for column in range(3):
+                np.multiply(out[:, row, column], scales[:, column], out=out[:, row, column])
+
+    # Translation et dernière ligne
+    out[:, :3, 3] = positions
+    if out.shape[1] == 4:
+        out[:, 3, :3] = 0.0
+        out[:, 3, 3] = 1.0
+
+    return out
+
+def pack_pos_quats(positions, rotations, out=None):
+    """positions (B, 3) et rotations (B, 4) côte à côte dans out (B, 7) : [px, py, pz, qx, qy, qz, qw]"""
+    if out is None:
+        out = np.empty((len(positions), 7), dtype=np.result_type(positions, rotations))
+    out[:, :3] = positions
+    out[:, 3:] = rotations
+    return out
+
+def unpack_pos_quats(pos_quats):
+    """Vues (B, 3) positions et (B, 4) rotations d'un tableau (B, 7) de pack_pos_quats"""
+    return pos_quats[:, :3], pos_quats[:, 3:]
+
+def compose_dual_quaternions(positions, rotations, out=None, work=None):
+    """
+    Quaternions duaux unitaires (B, 8) : partie réelle [qx, qy, qz, qw] = rotation,
+    partie duale [dx, dy, dz, dw] = 0.5 * (t, 0) * rotation. L'échelle n'est pas représentable.
+    work (B,) : buffer de calcul du dtype de out, pour n'allouer aucun temporaire.
+    """
+    count = len(positions)
+    if out is None:
+        out = np.empty((count, 8), dtype=np.float64)
+    if work is None:
+        work = np.empty(count, dtype=out.dtype)
+
+    tx, ty, tz = positions[:, 0], positions[:, 1], positions[:, 2]
+    qx, qy, qz, qw = rotations[:, 0], rotations[:, 1], rotations[:, 2], rotations[:, 3]
+    out[:, :4] = rotations
+    dx, dy, dz, dw = out[:, 4], out[:, 5], out[:, 6], out[:, 7]
+
+    # Partie vectorielle : qw * t + t x q
+    for d, t, (a, b), (c, e) in ((dx, tx, (ty, qz), (tz, qy)),
+                                 (dy, ty, (tz, qx), (tx, qz)),
+                                 (dz, tz, (tx, qy), (ty, qx))):
+        np.multiply(qw, t, out=d)
+        np.multiply(a, b, out=work)
+        np.add(d, work, out=d)
+        np.multiply(c, e, out=work)
+        np.subtract(d, work, out=d)
+    # Partie scalaire : -t . q
+    np.multiply(tx, qx, out=dw)
+    np.multiply(ty, qy, out=work)
+    np.add(dw, work, out=dw)
+    np.multiply(tz, qz, out=work)
+    np.add(dw, work, out=dw)
+
+    # Colonne par colonne, comme l'échelle de compose_transforms
+    for d, factor in ((dx, 0.5), (dy, 0.5), (dz, 0.5), (dw, -0.5)):
+        np.multiply(d, factor, out=d)
+    return out
+
+def decompose_dual_quaternions(dual_quaternions, positions=None, rotations=None):
+    """
+    Inverse de compose_dual_quaternions : (B, 8) -> positions (B, 3), rotations (B, 4).
+    La partie réelle est supposée unitaire.
+    """
+    count = len(dual_quaternions)
+    if positions is None:
+        positions = np.empty((count, 3), dtype=dual_quaternions.dtype)
+    if rotations is None:
+        rotations = np.empty((count, 4), dtype=dual_quaternions.dtype)
+
+    real, dual = dual_quaternions[:, :4], dual_quaternions[:, 4:]
+    rotations[:] = real
+    # t = 2 * (d * conjugué(q)).xyz = 2 * (qw * d.xyz - dw * q.xyz + q.xyz x d.xyz)
+    positions[:] = np.cross(real[:, :3], dual[:, :3])
+    positions += real[:, 3:] * dual[:, :3]
+    positions -= dual[:, 3:] * real[:, :3]
+    positions *= 2.0
+    return positions, rotations
+
+def decompose_transforms(matrices, positions=None, rotations=None, scales=None):
+    """
+    Inverse de compose_transforms : matrices (B, 4, 4) ou affines (B, 3, 4)
+    -> positions (B, 3), rotations (B, 4) quaternions [qx, qy, qz, qw] avec qw >= 0, scales (B, 3).
+    Les échelles sont les normes des colonnes, supposées positives.
+    """
+    count = len(matrices)
+    dtype = matrices.dtype
+    if positions is None:
+        positions = np.empty((count, 3), dtype=dtype)
+    if rotations is None:
+        rotations = np.empty((count, 4), dtype=dtype)
+    if scales is None:
+        scales = np.empty((count, 3), dtype=dtype)
+
+    positions[:] = matrices[:, :3, 3]
+    scales[:] = np.linalg.norm(matrices[:, :3, :3], axis=1)
+    r = matrices[:, :3, :3] / scales[:, np.newaxis, :]
+    m00, m01, m02 = r[:, 0, 0], r[:, 0, 1], r[:, 0, 2]
+    m10, m11, m12 = r[:, 1, 0], r[:, 1, 1], r[:, 1, 2]
+    m20, m21, m22 = r[:, 2, 0], r[:, 2, 1], r[:, 2, 2]
+
+    # Méthode de Shepperd : on part de la plus grande des composantes 4 * q^2 pour rester stable
+    squares = np.stack([1.0 + m00 - m11 - m22,
+                        1.0 - m00 + m11 - m22,
+                        1.0 - m00 - m11 + m22,
+                        1.0 + m00 + m11 + m22], axis=1)
+    largest = np.argmax(squares, axis=1)
+    # 4 * q_i * q_j pour chaque paire, par ligne de la composante la plus grande
+    products = np.stack([
+        np.stack([squares[:, 0], m01 + m10, m02 + m20, m21 - m12], axis=1),
+        np.stack([m01 + m10, squares[:, 1], m12 + m21, m02 - m20], axis=1),
+        np.stack([m02 + m20, m12 + m21, squares[:, 2], m10 - m01], axis=1),
+        np.stack([m21 - m12, m02 - m20, m10 - m01, squares[:, 3]], axis=1),
+    ], axis=1)
+    rows = products[np.arange(count), largest]
+    rotations[:] = rows / (2.0 * np.sqrt(squares[np.arange(count), largest]))[:, np.newaxis]
+    rotations[rotations[:, 3] < 0] *= -1.0
+    return positions, rotations, scales
+
+def multiply_quaternions(a, b, out=None):
+    """Produit de Hamilton a * b de quaternions [qx, qy, qz, qw], (N, 4) ou diffusables"""
+    ax, ay, az, aw = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bx, by, bz, bw = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+    result = np.stack([aw * bx + ax * bw + ay * bz - az * by,
+                       aw * by - ax * bz + ay * bw + az * bx,
+                       aw * bz + ax * by - ay * bx + az * bw,
+                       aw * bw - ax * bx - ay * by - az * bz], axis=-1)
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+def conjugate_quaternions(rotations, out=None):
+    """Conjugués [-qx, -qy, -qz, qw], inverses des quaternions unitaires"""
+    if out is None:
+        out = np.empty_like(rotations)
+    out[..., :3] = rotations[..., :3]
+    out[..., :3] *= -1.0
+    out[..., 3] = rotations[..., 3]
+    return out
+
+def quaternion_right_matrices(rotations, out=None):
+    """
+    Matrices (N, 4, 4) M telles que q * rotations[i] = M[i] @ q pour tout quaternion q [qx, qy, qz, qw] :
+    multiplier par un quaternion fixe devient un seul produit matriciel par lot.
+    """
+    if out is None:
+        out = np.empty(rotations.shape[:-1] + (4, 4), dtype=rotations.dtype)
+    x, y, z, w = rotations[..., 0], rotations[..., 1], rotations[..., 2], rotations[..., 3]
+    out[...] = np.stack([np.stack([w, z, -y, x], axis=-1),
+                         np.stack([-z, w, x, y], axis=-1),
+                         np.stack([y, -x, w, z], axis=-1),
+                         np.stack([-x, -y, -z, w], axis=-1)], axis=-2)
+    return out
+
+def as_rows(array):
+    """
+    Vue (N,) d'un tableau C-contigu (N, ...), une ligne par élément : ndarray.take et ndarray.put y rassemblent
+    et rangent des lignes entières sans allocation, contrairement à l'indexation avancée array[indices] = ...
+    """
+    row_size = int(np.prod(array.shape[1:]))
+    return array.reshape(len(array), row_size).view(np.dtype((np.void, array.itemsize * row_size))).reshape(len(array))
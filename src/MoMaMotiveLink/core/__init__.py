@@ -1,3 +1,14 @@
+from .BoneSubset import BoneSubset, BoneSubsetGroup, BoneSubsetStream
+from .CoordinateConversion import CoordinateConversion
+from .ForwardKinematics import ForwardKinematics
 from .MotiveLink import MotiveLink
+from .PoseBuffer import PoseBuffer, PoseSnapshot
+from .PoseDelta import PoseDelta, PoseDeltaReader
+from .PosePipeline import PosePipeline, PosePipelineConfig, POSE_REPRESENTATIONS, SKINNING_PALETTES
+from .Retargeting import Retargeter, RetargetTarget
+from .SkeletonLayout import SkeletonLayout
 
-__all__ = ["MotiveLink"]
+__all__ = ["BoneSubset", "BoneSubsetGroup", "BoneSubsetStream", "CoordinateConversion", "ForwardKinematics",
+           "MotiveLink", "POSE_REPRESENTATIONS", "PoseBuffer", "PoseDelta", "PoseDeltaReader", "PosePipeline",
+           "PosePipelineConfig", "PoseSnapshot", "Retargeter", "RetargetTarget", "SkeletonLayout",
+           "SKINNING_PALETTES"]
@@ -0,0 +1,226 @@
+# asyncio NatNet client.
+#
+# Drives a NatNetClient from an asyncio event loop instead of its command and
+# data threads. Both sockets are datagram endpoints of the loop and packets
+# are decoded in datagram_received with the NatNetClient unpack routines, so
+# a frame reaches the consumer without crossing a thread boundary.
+# Decoded frames are buffered in a bounded queue read with
+#   async for mocap_data in client.frames():
+# once full, the oldest frame is dropped for the new one.
+# The decode queue of NatNetClient is not used here.
+
+import asyncio
+from collections import deque
+
+from MoMaMotiveLink.natnetsdk.NatNetClient import NatNetClient, get_message_id
+
+
+class _NatNetProtocol(asyncio.DatagramProtocol):
+    """Hands the datagrams of one socket to the AsyncNatNetClient"""
+
+    def __init__(self, client, channel):
+        self.client = client
+        self.channel = channel
+
+    def datagram_received(self, data, addr):
+        self.client._datagram_received(data)
+
+    def error_received(self, exc):
+        print("ERROR: %s socket access error occurred:\n  %s" % (self.channel, exc)) #type: ignore  # noqa E501
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            print("ERROR: %s socket closed: %s" % (self.channel, exc))
+
+
+class AsyncNatNetClient:
+    """asyncio front end of a NatNetClient.
+
+    Addresses, listeners and decode options are set on natnet_client before
+    connect(); its listeners are called from the event loop."""
+
+    def __init__(self, natnet_client=None, frame_buffer_size=8,
+                 keep_alive_interval=1.0):
+        if frame_buffer_size < 1:
+            raise ValueError("frame_buffer_size must be at least 1")
+        if natnet_client is None:
+            natnet_client = NatNetClient()
+        self.natnet_client = natnet_client
+        self.frame_buffer_size = frame_buffer_size
+        # Unicast only, the server drops clients that stop sending
+        self.keep_alive_interval = keep_alive_interval
+
+        self.command_transport = None
+        self.data_transport = None
+        self.__keep_alive_task = None
+        self.__closed = False
+
+        # Decoded frames waiting for frames(), and the future a waiting
+        # consumer sleeps on
+        self.__frames = deque(maxlen=frame_buffer_size)
+        self.__frame_waiter = None
+
+        # Futures of the requests waiting for their reply, in send order
+        self.__server_info_waiters = deque()
+        self.__model_def_waiters = deque()
+        self.__response_waiters = deque()
+
+        # Counters
+        self.frame_count = 0
+        self.dropped_frame_count = 0
+
+    def get_stats(self):
+        return {
+            "buffered": len(self.__frames),
+            "capacity": self.frame_buffer_size,
+            "frames": self.frame_count,
+            "dropped": self.dropped_frame_count,
+        }
+
+    def __get_server_address(self):
+        return (self.natnet_client.server_ip_address,
+                self.natnet_client.command_port)
+
+    def __send_request(self, command, command_str=""):
+        # transports have the sendto of a socket
+        self.natnet_client.send_request(self.command_transport, command,
+                                        command_str,
+                                        self.__get_server_address())
+
+    async def __request(self, waiters, command, command_str, timeout):
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        self.__send_request(command, command_str)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+
+    async def connect(self, timeout=2.0):
+        """Opens both sockets and waits for the server info.
+        Returns False if a socket could not be opened, raises
+        asyncio.TimeoutError if the server does not answer."""
+        loop = asyncio.get_running_loop()
+        natnet_client = self.natnet_client
+        if not natnet_client.open_sockets():
+            return False
+        self.__closed = False
+        self.data_transport, _ = await loop.create_datagram_endpoint(
+            lambda: _NatNetProtocol(self, "data"),
+            sock=natnet_client.data_socket)
+        self.command_transport, _ = await loop.create_datagram_endpoint(
+            lambda: _NatNetProtocol(self, "command"),
+            sock=natnet_client.command_socket)
+        if not natnet_client.use_multicast:
+            self.__keep_alive_task = loop.create_task(self.__keep_alive())
+
+        await self.__request(self.__server_info_waiters,
+                             NatNetClient.NAT_CONNECT, "", timeout)
+        return natnet_client.connected()
+
+    async def request_model_def(self, timeout=2.0):
+        """Requests the data descriptions, returns them decoded"""
+        return await self.__request(self.__model_def_waiters,
+                                    NatNetClient.NAT_REQUEST_MODELDEF, "",
+                                    timeout)
+
+    async def send_command(self, command_str, timeout=2.0):
+        """Sends a command, returns the server reply: an int response code,
+        the response string, or None for an unrecognized request"""
+        return await self.__request(self.__response_waiters,
+                                    NatNetClient.NAT_REQUEST, command_str,
+                                    timeout)
+
+    async def frames(self):
+        """Decoded MoCapData, oldest first, until close() is called"""
+        frames = self.__frames
+        while True:
+            while frames:
+                yield frames.popleft()
+            if self.__closed:
+                return
+            self.__frame_waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self.__frame_waiter
+            finally:
+                self.__frame_waiter = None
+
+    def close(self):
+        """Closes both sockets and ends the frames() streams"""
+        self.__closed = True
+        if self.__keep_alive_task is not None:
+            self.__keep_alive_task.cancel()
+            self.__keep_alive_task = None
+        for transport in (self.command_transport, self.data_transport):
+            if transport is not None:
+                transport.close()
+        self.command_transport = None
+        self.data_transport = None
+        for waiters in (self.__server_info_waiters, self.__model_def_waiters,
+                        self.__response_waiters):
+            while waiters:
+                future = waiters.popleft()
+                if not future.done():
+                    future.cancel()
+        self.__wake_frame_waiter()
+        # frames still waiting in a partial batch
+        self.natnet_client.flush_frame_batch()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    async def __keep_alive(self):
+        while True:
+            await asyncio.sleep(self.keep_alive_interval)
+            self.__send_request(NatNetClient.NAT_KEEPALIVE)
+
+    def __wake_frame_waiter(self):
+        if self.__frame_waiter is not None and not self.__frame_waiter.done():
+            self.__frame_waiter.set_result(None)
+
+    @staticmethod
+    def __resolve(waiters, result):
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(result)
+                return
+
+    def _datagram_received(self, data):
+        natnet_client = self.natnet_client
+        message_id = get_message_id(data)
+        if message_id == NatNetClient.NAT_FRAMEOFDATA:
+            mocap_data = natnet_client.decode_frame(data)
+            self.frame_count += 1
+            print_level = natnet_client.print_level
+            if print_level > 0 and (self.frame_count % print_level) == 0:
+                print("MoCap Frame: %d\n" % (mocap_data.prefix_data.frame_number)) #type: ignore  # noqa E501
+                print(" %s\n" % mocap_data.get_as_string())
+            if len(self.__frames) == self.frame_buffer_size:
+                self.dropped_frame_count += 1
+            self.__frames.append(mocap_data)
+            self.__wake_frame_waiter()
+        elif message_id == NatNetClient.NAT_MODELDEF:
+            data_descs = natnet_client.decode_model_def(data)
+            self.__resolve(self.__model_def_waiters, data_descs)
+        else:
+            natnet_client.process_message(data)
+            if message_id == NatNetClient.NAT_SERVERINFO:
+                self.__resolve(self.__server_info_waiters, True)
+            elif message_id == NatNetClient.NAT_RESPONSE:
+                self.__resolve(self.__response_waiters,
+                               self.__get_response(data))
+            elif message_id == NatNetClient.NAT_UNRECOGNIZED_REQUEST:
+                self.__resolve(self.__response_waiters, None)
+
+    @staticmethod
+    def __get_response(data):
+        packet_size = int.from_bytes(data[2:4], byteorder='little', signed=True) #type: ignore  # noqa E501
+        if packet_size == 4:
+            return int.from_bytes(data[4:8], byteorder='little', signed=True)
+        message, separator, remainder = bytes(data[4:]).partition(b'\0')
+        return message.decode('utf-8')
@@ -0,0 +1,88 @@
+# Preallocated receive buffers.
+#
+# The data thread receives every datagram with recvfrom_into into a buffer
+# leased from a BufferPool and decodes it through memoryview slices, so a
+# packet costs no large allocation. Zero-copy decoders (array decode) return
+# views over the leased buffer: a consumer keeping them past its callback
+# retains the lease and releases it when done, the buffer is only reused
+# once every holder has released it.
+
+import threading
+import time
+from collections import deque
+
+
+class BufferLease:
+    """One pool buffer and the number of holders still using it"""
+    __slots__ = ("pool", "buffer", "view", "size", "ref_count",
+                 "receive_time")
+
+    def __init__(self, pool, buffer_size):
+        self.pool = pool
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.size = 0
+        self.ref_count = 0
+        # time.perf_counter() when the datagram was received
+        self.receive_time = 0.0
+
+    def get_view(self):
+        """memoryview over the received bytes"""
+        return self.view[:self.size]
+
+    def retain(self):
+        """Keeps the buffer from being reused until release is called"""
+        self.pool.retain(self)
+        return self
+
+    def release(self):
+        self.pool.release(self)
+
+
+class BufferPool:
+    def __init__(self, buffer_count=8, buffer_size=128*1024):
+        self.buffer_size = buffer_size
+        self.__lock = threading.Lock()
+        self.__free = deque(BufferLease(self, buffer_size)
+                            for _ in range(buffer_count))
+        self.__allocated_count = buffer_count
+
+    def get_allocated_count(self):
+        """Buffers allocated so far, grows only while leases are retained"""
+        return self.__allocated_count
+
+    def get_free_count(self):
+        return len(self.__free)
+
+    def acquire(self):
+        with self.__lock:
+            if self.__free:
+                lease = self.__free.pop()
+            else:
+                lease = BufferLease(self, self.buffer_size)
+                self.__allocated_count += 1
+            lease.ref_count = 1
+            lease.size = 0
+        return lease
+
+    def retain(self, lease):
+        with self.__lock:
+            lease.ref_count += 1
+
+    def release(self, lease):
+        with self.__lock:
+            lease.ref_count -= 1
+            if lease.ref_count == 0:
+                self.__free.append(lease)
+
+    def recv_into(self, in_socket):
+        """Receives one datagram into a leased buffer.
+        Returns (lease, addr), the caller owns one reference."""
+        lease = self.acquire()
+        try:
+            lease.size, addr = in_socket.recvfrom_into(lease.buffer)
+            lease.receive_time = time.perf_counter()
+        except BaseException:
+            self.release(lease)
+            raise
+        return lease, addr
@@ -213,8 +213,10 @@ class RigidBodyDescription:
     def get_num_markers(self):
         return len(self.rb_marker_list)
 
-    def add_rb_marker(self, new_rb_maker):
-        self.rb_marker_list.append(copy.deepcopy(new_rb_maker))
+    def add_rb_marker(self, new_rb_maker, deep_copy=False):
+        if deep_copy:
+            new_rb_maker = copy.deepcopy(new_rb_maker)
+        self.rb_marker_list.append(new_rb_maker)
         return self.get_num_markers()
 
     def get_as_string(self, tab_str="  ", level=0):
@@ -254,9 +256,10 @@ class SkeletonDescription:
     def set_id(self, new_id):
         self.id_num = new_id
 
-    def add_rigid_body_description(self, rigid_body_description):
-        self.rigid_body_description_list.append(
-            copy.deepcopy(rigid_body_description))
+    def add_rigid_body_description(self, rigid_body_description, deep_copy=False):
+        if deep_copy:
+            rigid_body_description = copy.deepcopy(rigid_body_description)
+        self.rigid_body_description_list.append(rigid_body_description)
         return len(self.rigid_body_description_list)
 
     def get_as_string(self, tab_str="  ", level=0):
@@ -315,8 +318,10 @@ class ForcePlateDescription:
     def set_channel_data_type(self, channel_data_type):
         self.channel_data_type = channel_data_type
 
-    def add_channel_name(self, channel_name):
-        self.channel_list.append(copy.deepcopy(channel_name))
+    def add_channel_name(self, channel_name, deep_copy=False):
+        if deep_copy:
+            channel_name = copy.deepcopy(channel_name)
+        self.channel_list.append(channel_name)
         return len(self.channel_list)
 
     def get_cal_matrix_as_string(self, tab_str="", level=0):
@@ -554,90 +559,104 @@ class DataDescriptions():
         return order_name
 
     # Add Markerset
-    def add_marker_set(self, new_marker_set):
+    def add_marker_set(self, new_marker_set, deep_copy=False):
         """Add a Markerset"""
         order_name = self.generate_order_name()
 
         # generate order entry
         pos = len(self.marker_set_list)
         self.data_order_dict[order_name] = ("marker_set_list", pos)
-        self.marker_set_list.append(copy.deepcopy(new_marker_set))
+        if deep_copy:
+            new_marker_set = copy.deepcopy(new_marker_set)
+        self.marker_set_list.append(new_marker_set)
 
     # Add Rigid Body
-    def add_rigid_body(self, new_rigid_body):
+    def add_rigid_body(self, new_rigid_body, deep_copy=False):
         """Add a rigid body"""
         order_name = self.generate_order_name()
 
         # generate order entry
         pos = len(self.rigid_body_list)
         self.data_order_dict[order_name] = ("rigid_body_list", pos)
-        self.rigid_body_list.append(copy.deepcopy(new_rigid_body))
+        if deep_copy:
+            new_rigid_body = copy.deepcopy(new_rigid_body)
+        self.rigid_body_list.append(new_rigid_body)
 
     # Add a skeleton
-    def add_skeleton(self, new_skeleton):
+    def add_skeleton(self, new_skeleton, deep_copy=False):
         """Add a skeleton"""
         order_name = self.generate_order_name()
 
         # generate order entry
         pos = len(self.skeleton_list)
         self.data_order_dict[order_name] = ("skeleton_list", pos)
-        self.skeleton_list.append(copy.deepcopy(new_skeleton))
+        if deep_copy:
+            new_skeleton = copy.deepcopy(new_skeleton)
+        self.skeleton_list.append(new_skeleton)
 
     # Add an asset
-    def add_asset(self, new_asset):
+    def add_asset(self, new_asset, deep_copy=False):
         """Add an asset"""
         order_name = self.generate_order_name()
 
         # generate order entry
         pos = len(self.asset_list)
         self.data_order_dict[order_name] = ("asset_list", pos)
-        self.asset_list.append(copy.deepcopy(new_asset))
+        if deep_copy:
+            new_asset = copy.deepcopy(new_asset)
+        self.asset_list.append(new_asset)
 
     # Add a force plate
-    def add_force_plate(self, new_force_plate):
+    def add_force_plate(self, new_force_plate, deep_copy=False):
         """Add a force plate"""
         order_name = self.generate_order_name()
 
         # generate order entry
         pos = len(self.force_plate_list)
         self.data_order_dict[order_name] = ("force_plate_list", pos)
-        self.force_plate_list.append(copy.deepcopy(new_force_plate))
+        if deep_copy:
+            new_force_plate = copy.deepcopy(new_force_plate)
+        self.force_plate_list.append(new_force_plate)
 
-    def add_device(self, newdevice):
+    def add_device(self, newdevice, deep_copy=False):
         """ add_device - Add a device"""
         order_name = self.generate_order_name()
 
         # generate order entry
         pos = len(self.device_list)
         self.data_order_dict[order_name] = ("device_list", pos)
-        self.device_list.append(copy.deepcopy(newdevice))
+        if deep_copy:
+            newdevice = copy.deepcopy(newdevice)
+        self.device_list.append(newdevice)
 
-    def add_camera(self, newcamera):
+    def add_camera(self, newcamera, deep_copy=False):
         """ Add a new camera """
         order_name = self.generate_order_name()
 
         # generate order entry
         pos = len(self.camera_list)
         self.data_order_dict[order_name] = ("camera_list", pos)
-        self.camera_list.append(copy.deepcopy(newcamera))
+        if deep_copy:
+            newcamera = copy.deepcopy(newcamera)
+        self.camera_list.append(newcamera)
 
-    def add_data(self, new_data):
+    def add_data(self, new_data, deep_copy=False):
         """Add data based on data type"""
         data_type = type(new_data)
         if data_type == MarkerSetDescription:
-            self.add_marker_set(new_data)
+            self.add_marker_set(new_data, deep_copy)
         elif data_type == RigidBodyDescription:
-            self.add_rigid_body(new_data)
+            self.add_rigid_body(new_data, deep_copy)
         elif data_type == SkeletonDescription:
-            self.add_skeleton(new_data)
+            self.add_skeleton(new_data, deep_copy)
         elif data_type == ForcePlateDescription:
-            self.add_force_plate(new_data)
+            self.add_force_plate(new_data, deep_copy)
         elif data_type == DeviceDescription:
-            self.add_device(new_data)
+            self.add_device(new_data, deep_copy)
         elif data_type == CameraDescription:
-            self.add_camera(new_data)
+            self.add_camera(new_data, deep_copy)
         elif data_type == AssetDescription:
-            self.add_asset(new_data)
+            self.add_asset(new_data, deep_copy)
         elif data_type is None:
             data_type = None
         else:
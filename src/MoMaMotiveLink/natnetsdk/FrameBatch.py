@@ -0,0 +1,220 @@
+# Columnar accumulation of decoded frames.
+#
+# A FrameBatch collects N frames (or T milliseconds) of skeleton poses, rigid
+# bodies, labeled markers and suffix timestamps into preallocated NumPy
+# columns. Once full, NatNetClient hands it to the registered batch sinks so
+# consumers work per batch instead of per frame.
+
+import time
+
+import numpy as np
+
+
+class FrameBatch:
+    """Preallocated columns for up to frame_capacity frames.
+
+    Frame columns have frame_capacity rows, per-entity columns are padded to
+    the max_* sizes; the *_counts columns give the valid entries per frame
+    and entities past the max_* sizes are dropped. Frames without suffix
+    data get a NaN timestamp and 0 stamps. Columns are reused once the sinks
+    return, so sinks must copy anything they keep."""
+
+    def __init__(self, frame_capacity=120, duration_ms=None,
+                 max_skeletons=8, max_bones=64, max_rigid_bodies=32,
+                 max_labeled_markers=256):
+        self.frame_capacity = frame_capacity
+        self.duration_ms = duration_ms
+        self.max_skeletons = max_skeletons
+        self.max_bones = max_bones
+        self.max_rigid_bodies = max_rigid_bodies
+        self.max_labeled_markers = max_labeled_markers
+
+        n = frame_capacity
+        # Frame columns
+        self.frame_numbers = np.zeros(n, dtype=np.int64)
+        self.timestamps = np.zeros(n, dtype=np.float64)
+        self.stamp_camera_mid_exposure = np.zeros(n, dtype=np.int64)
+        self.stamp_data_received = np.zeros(n, dtype=np.int64)
+        self.stamp_transmit = np.zeros(n, dtype=np.int64)
+
+        # Skeletons
+        self.skeleton_counts = np.zeros(n, dtype=np.int32)
+        self.skeleton_ids = np.zeros((n, max_skeletons), dtype=np.int32)
+        self.bone_counts = np.zeros((n, max_skeletons), dtype=np.int32)
+        self.bone_ids = np.zeros((n, max_skeletons, max_bones), dtype=np.int32)
+        self.bone_positions = np.zeros((n, max_skeletons, max_bones, 3),
+                                       dtype=np.float32)
+        self.bone_quaternions = np.zeros((n, max_skeletons, max_bones, 4),
+                                         dtype=np.float32)
+        self.bone_tracking_valid = np.zeros((n, max_skeletons, max_bones),
+                                            dtype=bool)
+
+        # Rigid bodies
+        self.rigid_body_counts = np.zeros(n, dtype=np.int32)
+        self.rigid_body_ids = np.zeros((n, max_rigid_bodies), dtype=np.int32)
+        self.rigid_body_positions = np.zeros((n, max_rigid_bodies, 3),
+                                             dtype=np.float32)
+        self.rigid_body_quaternions = np.zeros((n, max_rigid_bodies, 4),
+                                               dtype=np.float32)
+        self.rigid_body_errors = np.zeros((n, max_rigid_bodies),
+                                          dtype=np.float32)
+        self.rigid_body_tracking_valid = np.zeros((n, max_rigid_bodies),
+                                                  dtype=bool)
+
+        # Labeled markers
+        self.labeled_marker_counts = np.zeros(n, dtype=np.int32)
+        self.labeled_marker_ids = np.zeros((n, max_labeled_markers),
+                                           dtype=np.int32)
+        self.labeled_marker_positions = np.zeros((n, max_labeled_markers, 3),
+                                                 dtype=np.float32)
+        self.labeled_marker_sizes = np.zeros((n, max_labeled_markers),
+                                             dtype=np.float32)
+        self.labeled_marker_residuals = np.zeros((n, max_labeled_markers),
+                                                 dtype=np.float32)
+
+        self.frame_count = 0
+        self.start_time = 0.0
+
+    def get_frame_count(self):
+        return self.frame_count
+
+    def is_full(self):
+        if self.frame_count >= self.frame_capacity:
+            return True
+        if self.duration_ms is not None and self.frame_count > 0:
+            elapsed_ms = (time.perf_counter() - self.start_time) * 1000.0
+            return elapsed_ms >= self.duration_ms
+        return False
+
+    def reset(self):
+        """Empties the batch, the columns are kept and overwritten"""
+        self.frame_count = 0
+
+    def append(self, mocap_data):
+        """Copies one decoded frame into the next row.
+        Returns True once the batch is full."""
+        if self.frame_count >= self.frame_capacity:
+            return True
+        row = self.frame_count
+        if row == 0:
+            self.start_time = time.perf_counter()
+
+        self.frame_numbers[row] = mocap_data.prefix_data.frame_number
+        suffix_data = mocap_data.suffix_data
+        if suffix_data is not None:
+            self.timestamps[row] = suffix_data.timestamp
+            self.stamp_camera_mid_exposure[row] = suffix_data.stamp_camera_mid_exposure #type: ignore  # noqa E501
+            self.stamp_data_received[row] = suffix_data.stamp_data_received
+            self.stamp_transmit[row] = suffix_data.stamp_transmit
+        else:
+            # rows are reused, don't leave a previous frame's stamps behind
+            self.timestamps[row] = np.nan
+            self.stamp_camera_mid_exposure[row] = 0
+            self.stamp_data_received[row] = 0
+            self.stamp_transmit[row] = 0
+
+        self.__append_skeletons(row, mocap_data.skeleton_data)
+        self.__append_rigid_bodies(row, mocap_data.rigid_body_data)
+        self.__append_labeled_markers(row, mocap_data.labeled_marker_data)
+
+        self.frame_count += 1
+        return self.is_full()
+
+    def __append_skeletons(self, row, skeleton_data):
+        skeleton_count = 0
+        if skeleton_data is not None:
+            skeleton_list = skeleton_data.skeleton_list[:self.max_skeletons]
+            skeleton_count = len(skeleton_list)
+            for i, skeleton in enumerate(skeleton_list):
+                self.skeleton_ids[row, i] = skeleton.id_num
+                if hasattr(skeleton, "records"):
+                    # array decode, one slice copy per column
+                    bone_count = min(len(skeleton.ids), self.max_bones)
+                    self.bone_ids[row, i, :bone_count] = skeleton.ids[:bone_count] #type: ignore  # noqa E501
+                    self.bone_positions[row, i, :bone_count] = skeleton.positions[:bone_count] #type: ignore  # noqa E501
+                    self.bone_quaternions[row, i, :bone_count] = skeleton.quaternions[:bone_count] #type: ignore  # noqa E501
+                    self.bone_tracking_valid[row, i, :bone_count] = skeleton.tracking_valid[:bone_count] #type: ignore  # noqa E501
+                else:
+                    bone_list = skeleton.rigid_body_list[:self.max_bones]
+                    bone_count = len(bone_list)
+                    for j, bone in enumerate(bone_list):
+                        self.bone_ids[row, i, j] = bone.id_num
+                        self.bone_positions[row, i, j] = bone.pos
+                        self.bone_quaternions[row, i, j] = bone.rot
+                        self.bone_tracking_valid[row, i, j] = bone.tracking_valid #type: ignore  # noqa E501
+                self.bone_counts[row, i] = bone_count
+        self.skeleton_counts[row] = skeleton_count
+
+    def __append_rigid_bodies(self, row, rigid_body_data):
+        rigid_body_count = 0
+        if rigid_body_data is None:
+            pass
+        elif hasattr(rigid_body_data, "records"):
+            rigid_body_count = min(len(rigid_body_data.ids), self.max_rigid_bodies) #type: ignore  # noqa E501
+            self.rigid_body_ids[row, :rigid_body_count] = rigid_body_data.ids[:rigid_body_count] #type: ignore  # noqa E501
+            self.rigid_body_positions[row, :rigid_body_count] = rigid_body_data.positions[:rigid_body_count] #type: ignore  # noqa E501
+            self.rigid_body_quaternions[row, :rigid_body_count] = rigid_body_data.quaternions[:rigid_body_count] #type: ignore  # noqa E501
+            self.rigid_body_errors[row, :rigid_body_count] = rigid_body_data.errors[:rigid_body_count] #type: ignore  # noqa E501
+            self.rigid_body_tracking_valid[row, :rigid_body_count] = rigid_body_data.tracking_valid[:rigid_body_count] #type: ignore  # noqa E501
+        else:
+            rigid_body_list = rigid_body_data.rigid_body_list[:self.max_rigid_bodies] #type: ignore  # noqa E501
+            rigid_body_count = len(rigid_body_list)
+            for i, rigid_body in enumerate(rigid_body_list):
+                self.rigid_body_ids[row, i] = rigid_body.id_num
+                self.rigid_body_positions[row, i] = rigid_body.pos
+                self.rigid_body_quaternions[row, i] = rigid_body.rot
+                self.rigid_body_errors[row, i] = rigid_body.error
+                self.rigid_body_tracking_valid[row, i] = rigid_body.tracking_valid #type: ignore  # noqa E501
+        self.rigid_body_counts[row] = rigid_body_count
+
+    def __append_labeled_markers(self, row, labeled_marker_data):
+        labeled_marker_count = 0
+        if labeled_marker_data is not None:
+            marker_list = labeled_marker_data.labeled_marker_list[:self.max_labeled_markers] #type: ignore  # noqa E501
+            labeled_marker_count = len(marker_list)
+            for i, marker in enumerate(marker_list):
+                self.labeled_marker_ids[row, i] = marker.id_num
+                self.labeled_marker_positions[row, i] = marker.pos
+                self.labeled_marker_sizes[row, i] = marker.size
+                self.labeled_marker_residuals[row, i] = marker.residual
+        self.labeled_marker_counts[row] = labeled_marker_count
+
+    def get_columns(self):
+        """Views of every column over the frames accumulated so far"""
+        n = self.frame_count
+        return {
+            "frame_numbers": self.frame_numbers[:n],
+            "timestamps": self.timestamps[:n],
+            "stamp_camera_mid_exposure": self.stamp_camera_mid_exposure[:n],
+            "stamp_data_received": self.stamp_data_received[:n],
+            "stamp_transmit": self.stamp_transmit[:n],
+            "skeleton_counts": self.skeleton_counts[:n],
+            "skeleton_ids": self.skeleton_ids[:n],
+            "bone_counts": self.bone_counts[:n],
+            "bone_ids": self.bone_ids[:n],
+            "bone_positions": self.bone_positions[:n],
+            "bone_quaternions": self.bone_quaternions[:n],
+            "bone_tracking_valid": self.bone_tracking_valid[:n],
+            "rigid_body_counts": self.rigid_body_counts[:n],
+            "rigid_body_ids": self.rigid_body_ids[:n],
+            "rigid_body_positions": self.rigid_body_positions[:n],
+            "rigid_body_quaternions": self.rigid_body_quaternions[:n],
+            "rigid_body_errors": self.rigid_body_errors[:n],
+            "rigid_body_tracking_valid": self.rigid_body_tracking_valid[:n],
+            "labeled_marker_counts": self.labeled_marker_counts[:n],
+            "labeled_marker_ids": self.labeled_marker_ids[:n],
+            "labeled_marker_positions": self.labeled_marker_positions[:n],
+            "labeled_marker_sizes": self.labeled_marker_sizes[:n],
+            "labeled_marker_residuals": self.labeled_marker_residuals[:n],
+        }
+
+    def get_as_string(self, tab_str="  ", level=0):
+        out_tab_str = tab_str * level
+        out_str = ""
+        out_str += "%sFrame Batch: %d/%d frames\n" % (
+            out_tab_str, self.frame_count, self.frame_capacity)
+        if self.frame_count > 0:
+            out_str += "%s  Frames      : %d - %d\n" % (
+                out_tab_str, self.frame_numbers[0],
+                self.frame_numbers[self.frame_count - 1])
+        return out_str
@@ -148,6 +148,8 @@ def stringify_timecode(timecode, timecode_sub):
 
 # MoCap Frame Classes
 class FramePrefixData:
+    __slots__ = ("frame_number",)
+
     def __init__(self, frame_number):
         self.frame_number = frame_number
 
@@ -158,6 +160,8 @@ class FramePrefixData:
 
 
 class MarkerData:
+    __slots__ = ("model_name", "marker_pos_list")
+
     def __init__(self):
         self.model_name = ""
         self.marker_pos_list = []
@@ -165,8 +169,10 @@ class MarkerData:
     def set_model_name(self, model_name):
         self.model_name = model_name
 
-    def add_pos(self, pos):
-        self.marker_pos_list.append(copy.deepcopy(pos))
+    def add_pos(self, pos, deep_copy=False):
+        if deep_copy:
+            pos = copy.deepcopy(pos)
+        self.marker_pos_list.append(pos)
         return len(self.marker_pos_list)
 
     def get_num_points(self):
@@ -191,13 +197,17 @@ class MarkerData:
 
 
 class MarkerSetData:
+    __slots__ = ("marker_data_list", "unlabeled_markers")
+
     def __init__(self):
         self.marker_data_list = []
         self.unlabeled_markers = MarkerData()
         self.unlabeled_markers.set_model_name("")
 
-    def add_marker_data(self, marker_data):
-        self.marker_data_list.append(copy.deepcopy(marker_data))
+    def add_marker_data(self, marker_data, deep_copy=False):
+        if deep_copy:
+            marker_data = copy.deepcopy(marker_data)
+        self.marker_data_list.append(marker_data)
         return len(self.marker_data_list)
 
     def add_unlabeled_marker(self, pos):
@@ -230,11 +240,15 @@ class MarkerSetData:
 
 
 class LegacyMarkerData:
+    __slots__ = ("marker_pos_list",)
+
     def __init__(self):
         self.marker_pos_list = []
 
-    def add_pos(self, pos):
-        self.marker_pos_list.append(copy.deepcopy(pos))
+    def add_pos(self, pos, deep_copy=False):
+        if deep_copy:
+            pos = copy.deepcopy(pos)
+        self.marker_pos_list.append(pos)
         return len(self.marker_pos_list)
 
     def get_marker_count(self):
@@ -255,6 +269,8 @@ class LegacyMarkerData:
 
 
 class RigidBodyMarker:
+    __slots__ = ("pos", "id_num", "size", "error", "marker_num")
+
     def __init__(self):
         self.pos = [0.0, 0.0, 0.0]
         self.id_num = 0
@@ -278,6 +294,9 @@ class RigidBodyMarker:
 
 
 class RigidBody:
+    __slots__ = ("id_num", "pos", "rot", "rb_marker_list", "tracking_valid",
+                 "error", "marker_num")
+
     def __init__(self, new_id, pos, rot):
         self.id_num = new_id
         self.pos = pos
@@ -287,8 +306,10 @@ class RigidBody:
         self.error = 0.0
         self.marker_num = -1
 
-    def add_rigid_body_marker(self, rigid_body_marker):
-        self.rb_marker_list.append(copy.deepcopy(rigid_body_marker))
+    def add_rigid_body_marker(self, rigid_body_marker, deep_copy=False):
+        if deep_copy:
+            rigid_body_marker = copy.deepcopy(rigid_body_marker)
+        self.rb_marker_list.append(rigid_body_marker)
         return len(self.rb_marker_list)
 
     def get_as_string(self, tab_str=0, level=0):
@@ -333,11 +354,15 @@ class RigidBody:
 
 
 class RigidBodyData:
+    __slots__ = ("rigid_body_list",)
+
     def __init__(self):
         self.rigid_body_list = []
 
-    def add_rigid_body(self, rigid_body):
-        self.rigid_body_list.append(copy.deepcopy(rigid_body))
+    def add_rigid_body(self, rigid_body, deep_copy=False):
+        if deep_copy:
+            rigid_body = copy.deepcopy(rigid_body)
+        self.rigid_body_list.append(rigid_body)
         return len(self.rigid_body_list)
 
     def get_rigid_body_count(self):
@@ -358,12 +383,16 @@ class RigidBodyData:
 
 
 class Skeleton:
+    __slots__ = ("id_num", "rigid_body_list")
+
     def __init__(self, new_id=0):
         self.id_num = new_id
         self.rigid_body_list = []
 
-    def add_rigid_body(self, rigid_body):
-        self.rigid_body_list.append(copy.deepcopy(rigid_body))
+    def add_rigid_body(self, rigid_body, deep_copy=False):
+        if deep_copy:
+            rigid_body = copy.deepcopy(rigid_body)
+        self.rigid_body_list.append(rigid_body)
         return len(self.rigid_body_list)
 
     def get_as_string(self, tab_str="  ", level=0):
@@ -381,11 +410,15 @@ class Skeleton:
 
 
 class SkeletonData:
+    __slots__ = ("skeleton_list",)
+
     def __init__(self):
         self.skeleton_list = []
 
-    def add_skeleton(self, new_skeleton):
-        self.skeleton_list.append(copy.deepcopy(new_skeleton))
+    def add_skeleton(self, new_skeleton, deep_copy=False):
+        if deep_copy:
+            new_skeleton = copy.deepcopy(new_skeleton)
+        self.skeleton_list.append(new_skeleton)
 
     def get_skeleton_count(self):
         return len(self.skeleton_list)
@@ -404,7 +437,67 @@ class SkeletonData:
         return out_str
 
 
+# Array-backed frame classes
+# Filled by the NatNetClient array decoder. The arrays are views over the
+# received datagram, one row per rigid body.
+class RigidBodyArrays:
+    __slots__ = ("records", "ids", "positions", "quaternions", "errors",
+                 "tracking_valid")
+
+    def __init__(self, records):
+        self.records = records
+        self.ids = records['id']
+        self.positions = records['pos']
+        self.quaternions = records['rot']
+        self.errors = records['error']
+        self.tracking_valid = (records['params'] & 0x01) != 0
+
+    def get_rigid_body_count(self):
+        return len(self.ids)
+
+    def get_as_string(self, tab_str="  ", level=0):
+        out_tab_str = get_tab_str(tab_str, level)
+        out_tab_str2 = get_tab_str(tab_str, level+1)
+        out_str = ""
+        rigid_body_count = self.get_rigid_body_count()
+        out_str += "%sRigid Body Count: %3.1d\n" % (out_tab_str,
+                                                    rigid_body_count)
+        for i in range(rigid_body_count):
+            pos = self.positions[i]
+            rot = self.quaternions[i]
+            out_str += "%sRigid Body    : %3.1d\n" % (out_tab_str2, i)
+            out_str += "%s  ID            : %3.1d\n" % (out_tab_str2,
+                                                        self.ids[i])
+            out_str += "%s  Position      : [%3.2f, %3.2f, %3.2f]\n" % (
+                out_tab_str2, pos[0], pos[1], pos[2])
+            out_str += "%s  Orientation   : [%3.2f, %3.2f, %3.2f, %3.2f]\n" % (
+                out_tab_str2, rot[0], rot[1], rot[2], rot[3])
+            out_str += "%s  Marker Error  : %3.2f\n" % (out_tab_str2,
+                                                        self.errors[i])
+            out_str += "%sTracking Valid: %s\n" % (
+                out_tab_str2, str(bool(self.tracking_valid[i])))
+        return out_str
+
+
+class SkeletonArrays(RigidBodyArrays):
+    __slots__ = ("id_num",)
+
+    def __init__(self, new_id, records):
+        super().__init__(records)
+        self.id_num = new_id
+
+    def get_as_string(self, tab_str="  ", level=0):
+        out_tab_str = get_tab_str(tab_str, level)
+        out_str = " "
+        out_str += "%sID: %3.1d\n" % (out_tab_str, self.id_num)
+        out_str += super().get_as_string(tab_str, level)
+        return out_str
+
+
 class AssetMarkerData:
+    __slots__ = ("marker_id", "pos", "marker_size", "marker_params",
+                 "residual", "marker_num")
+
     def __init__(self, marker_id, pos, marker_size=0.0, marker_params=0,
                  residual=0.0, marker_num=-1):
         self.marker_id = marker_id
@@ -443,6 +536,8 @@ class AssetMarkerData:
 
 
 class AssetRigidBodyData:
+    __slots__ = ("id_num", "pos", "rot", "mean_error", "param", "rb_num")
+
     def __init__(self, new_id, pos, rot, mean_error=0.0, param=0):
         self.id_num = new_id
         self.pos = pos
@@ -471,6 +566,8 @@ class AssetRigidBodyData:
 
 
 class Asset:
+    __slots__ = ("asset_id", "rigid_body_list", "marker_list")
+
     def __init__(self):
         self.asset_id = 0
         self.rigid_body_list = []
@@ -479,12 +576,16 @@ class Asset:
     def set_id(self, new_id):
         self.asset_id = new_id
 
-    def add_rigid_body(self, rigid_body):
-        self.rigid_body_list.append(copy.deepcopy(rigid_body))
+    def add_rigid_body(self, rigid_body, deep_copy=False):
+        if deep_copy:
+            rigid_body = copy.deepcopy(rigid_body)
+        self.rigid_body_list.append(rigid_body)
         return len(self.rigid_body_list)
 
-    def add_marker(self, marker):
-        self.marker_list.append(copy.deepcopy(marker))
+    def add_marker(self, marker, deep_copy=False):
+        if deep_copy:
+            marker = copy.deepcopy(marker)
+        self.marker_list.append(marker)
         return len(self.marker_list)
 
     def get_rigid_body_count(self):
@@ -518,11 +619,15 @@ class Asset:
 
 
 class AssetData:
+    __slots__ = ("asset_list",)
+
     def __init__(self):
         self.asset_list = []
 
-    def add_asset(self, new_asset):
-        self.asset_list.append(copy.deepcopy(new_asset))
+    def add_asset(self, new_asset, deep_copy=False):
+        if deep_copy:
+            new_asset = copy.deepcopy(new_asset)
+        self.asset_list.append(new_asset)
 
     def get_asset_count(self):
         return len(self.asset_list)
@@ -542,6 +647,8 @@ class AssetData:
 
 
 class LabeledMarker:
+    __slots__ = ("id_num", "pos", "size", "param", "residual", "marker_num")
+
     def __init__(self, new_id, pos, size=0.0, param=0, residual=0.0):
         self.id_num = new_id
         self.pos = pos
@@ -591,11 +698,15 @@ class LabeledMarker:
 
 
 class LabeledMarkerData:
+    __slots__ = ("labeled_marker_list",)
+
     def __init__(self):
         self.labeled_marker_list = []
 
-    def add_labeled_marker(self, labeled_marker):
-        self.labeled_marker_list.append(copy.deepcopy(labeled_marker))
+    def add_labeled_marker(self, labeled_marker, deep_copy=False):
+        if deep_copy:
+            labeled_marker = copy.deepcopy(labeled_marker)
+        self.labeled_marker_list.append(labeled_marker)
         return len(self.labeled_marker_list)
 
     def get_labeled_marker_count(self):
@@ -616,12 +727,16 @@ class LabeledMarkerData:
 
 
 class ForcePlateChannelData:
+    __slots__ = ("frame_list",)
+
     def __init__(self):
         # list of floats
         self.frame_list = []
 
-    def add_frame_entry(self, frame_entry):
-        self.frame_list.append(copy.deepcopy(frame_entry))
+    def add_frame_entry(self, frame_entry, deep_copy=False):
+        if deep_copy:
+            frame_entry = copy.deepcopy(frame_entry)
+        self.frame_list.append(frame_entry)
         return len(self.frame_list)
 
     def get_as_string(self, tab_str, level, channel_num=-1):
@@ -645,12 +760,16 @@ class ForcePlateChannelData:
 
 
 class ForcePlate:
+    __slots__ = ("id_num", "channel_data_list")
+
     def __init__(self, new_id=0):
         self.id_num = new_id
         self.channel_data_list = []
 
-    def add_channel_data(self, channel_data):
-        self.channel_data_list.append(copy.deepcopy(channel_data))
+    def add_channel_data(self, channel_data, deep_copy=False):
+        if deep_copy:
+            channel_data = copy.deepcopy(channel_data)
+        self.channel_data_list.append(channel_data)
         return len(self.channel_data_list)
 
     def get_as_string(self, tab_str, level):
@@ -667,11 +786,15 @@ class ForcePlate:
 
 
 class ForcePlateData:
+    __slots__ = ("force_plate_list",)
+
     def __init__(self):
         self.force_plate_list = []
 
-    def add_force_plate(self, force_plate):
-        self.force_plate_list.append(copy.deepcopy(force_plate))
+    def add_force_plate(self, force_plate, deep_copy=False):
+        if deep_copy:
+            force_plate = copy.deepcopy(force_plate)
+        self.force_plate_list.append(force_plate)
         return len(self.force_plate_list)
 
     def get_force_plate_count(self):
@@ -693,12 +816,16 @@ class ForcePlateData:
 
 
 class DeviceChannelData:
+    __slots__ = ("frame_list",)
+
     def __init__(self):
         # list of floats
         self.frame_list = []
 
-    def add_frame_entry(self, frame_entry):
-        self.frame_list.append(copy.deepcopy(frame_entry))
+    def add_frame_entry(self, frame_entry, deep_copy=False):
+        if deep_copy:
+            frame_entry = copy.deepcopy(frame_entry)
+        self.frame_list.append(frame_entry)
         return len(self.frame_list)
 
     def get_as_string(self, tab_str, level, channel_num=-1):
@@ -722,12 +849,16 @@ class DeviceChannelData:
 
 
 class Device:
+    __slots__ = ("id_num", "channel_data_list")
+
     def __init__(self, new_id):
         self.id_num = new_id
         self.channel_data_list = []
 
-    def add_channel_data(self, channel_data):
-        self.channel_data_list.append(copy.deepcopy(channel_data))
+    def add_channel_data(self, channel_data, deep_copy=False):
+        if deep_copy:
+            channel_data = copy.deepcopy(channel_data)
+        self.channel_data_list.append(channel_data)
         return len(self.channel_data_list)
 
     def get_as_string(self, tab_str, level, device_num):
@@ -746,11 +877,15 @@ class Device:
 
 
 class DeviceData:
+    __slots__ = ("device_list",)
+
     def __init__(self):
         self.device_list = []
 
-    def add_device(self, device):
-        self.device_list.append(copy.deepcopy(device))
+    def add_device(self, device, deep_copy=False):
+        if deep_copy:
+            device = copy.deepcopy(device)
+        self.device_list.append(device)
         return len(self.device_list)
 
     def get_device_count(self):
@@ -769,6 +904,12 @@ class DeviceData:
 
 
 class FrameSuffixData:
+    __slots__ = ("timecode", "timecode_sub", "timestamp",
+                 "stamp_camera_mid_exposure", "stamp_data_received",
+                 "stamp_transmit", "prec_timestamp_secs",
+                 "prec_timestamp_frac_secs", "param", "is_recording",
+                 "tracked_models_changed")
+
     def __init__(self):
         self.timecode = -1
         self.timecode_sub = -1
@@ -822,6 +963,11 @@ class FrameSuffixData:
 
 
 class MoCapData:
+    __slots__ = ("prefix_data", "marker_set_data", "legacy_other_markers",
+                 "rigid_body_data", "asset_data", "skeleton_data",
+                 "labeled_marker_data", "force_plate_data", "device_data",
+                 "suffix_data")
+
     def __init__(self):
         # Packet Parts
         self.prefix_data = None
@@ -24,30 +24,73 @@ import socket
 import threading #type: ignore  # noqa F401
 import struct
 from threading import Thread
+from functools import partial
 import copy
 import time
+import numpy as np
 from MoMaMotiveLink.natnetsdk import DataDescriptions, MoCapData
+from MoMaMotiveLink.natnetsdk.BufferPool import BufferPool
+from MoMaMotiveLink.natnetsdk.FrameBatch import FrameBatch
+from MoMaMotiveLink.natnetsdk.PacketQueue import PacketQueue
 
 
-def trace(*args):
-    # uncomment the one you want to use
-    # print("".join(map(str,args)))
-    pass
+# Trace sinks, None disables the category. Messages are %-formatted by the
+# trace functions, and only when their category has a sink, so call sites
+# pass the format and its values: trace_mf("RB: %3.1d", rb_id)
+trace_sink = None
+trace_dd_sink = None
+trace_mf_sink = None
 
 
-# Used for Data Description functions
-def trace_dd(*args):
-    # uncomment the one you want to use
+def set_trace_sinks(general=None, data_descriptions=None, mocap_frames=None):
+    """Sets the callables receiving trace messages, e.g.
+    set_trace_sinks(mocap_frames=print). None disables a category."""
+    global trace_sink, trace_dd_sink, trace_mf_sink
+    trace_sink = general
+    trace_dd_sink = data_descriptions
+    trace_mf_sink = mocap_frames
+
 
-    # print("".join(map(str,args)))
-    pass
+def trace(message, *args):
+    if trace_sink is not None:
+        trace_sink(message % args if args else message)
+
+
+# Used for Data Description functions
+def trace_dd(message, *args):
+    if trace_dd_sink is not None:
+        trace_dd_sink(message % args if args else message)
 
 
 # Used for MoCap Frame Data functions
-def trace_mf(*args):
-    # uncomment the one you want to use
-    # print("".join(map(str,args)))
-    pass
+def trace_mf(message, *args):
+    if trace_mf_sink is not None:
+        trace_mf_sink(message % args if args else message)
+
+
+def get_channel_frames_str(frame_list, n_frames_show_max):
+    """Force plate and device channel frames, for tracing"""
+    frame_count = len(frame_list)
+    n_frames_show = min(frame_count, n_frames_show_max)
+    out_string = "  %3.1d Frames - Frame Data: " % (frame_count)
+    for k in range(n_frames_show):
+        out_string += " %3.2f " % (frame_list[k])
+    if n_frames_show < frame_count:
+        out_string += " showing %3.1d of %3.1d frames" % (n_frames_show, frame_count) #type: ignore  # noqa E501
+    return out_string
+
+
+def unpack_string(data, offset, max_length=256):
+    """Null terminated string at offset, returns (bytes, offset past the
+    terminator). Copies at most max_length bytes before searching."""
+    chunk = bytes(data[offset:offset+max_length])
+    end = chunk.find(b'\0')
+    if end < 0:
+        chunk = bytes(data[offset:])
+        end = chunk.find(b'\0')
+        if end < 0:
+            end = len(chunk)
+    return chunk[:end], offset + end + 1
 
 
 def get_message_id(data):
@@ -65,6 +108,198 @@ NNIntValue = struct.Struct('<I')
 FPCalMatrixRow = struct.Struct('<ffffffffffff')
 FPCorners = struct.Struct('<ffffffffffff')
 
+# Packed NatNet 3.0+ rigid body record (38 bytes) used by the array decoder.
+RigidBodyRecord = np.dtype([('id', '<i4'),
+                            ('pos', '<f4', (3,)),
+                            ('rot', '<f4', (4,)),
+                            ('error', '<f4'),
+                            ('params', '<i2')])
+
+
+def unpack_rigid_body_records(data, offset, count):
+    """Maps count NatNet 3.0+ rigid body records starting at offset as a
+    structured array view over data (no copy). Returns the records and the
+    offset just past them."""
+    records = np.frombuffer(data, dtype=RigidBodyRecord, count=count, offset=offset) #type: ignore  # noqa E501
+    return records, offset + count * RigidBodyRecord.itemsize
+
+
+# Fixed-size frame records, selected per bitstream version by the decode plan
+IntValue = struct.Struct('<i')
+RigidBody3 = struct.Struct('<iffffffffh')
+LabeledMarker3 = struct.Struct('<iffffhf')
+LabeledMarker2_6 = struct.Struct('<iffffh')
+LabeledMarker2_4 = struct.Struct('<iffff')
+
+# Section header: object count, followed by the section size in bytes
+# from NatNet 4.1 on.
+SectionHeader = struct.Struct('<i')
+SectionHeaderWithSize = struct.Struct('<ii')
+
+# Frame sections that can be left out with set_decode_sections, in stream
+# order. The frame prefix is always decoded.
+FRAME_SECTIONS = ("marker_sets", "legacy_markers", "rigid_bodies", "skeletons",
+                  "assets", "labeled_markers", "force_plates", "devices",
+                  "suffix")
+
+
+# Section skippers
+# Each returns the number of bytes taken by a section without decoding it.
+def skip_sized_section(data, header):
+    """NatNet 4.1+ sections carry their size in bytes after the count"""
+    count, size_in_bytes = header.unpack_from(data, 0)
+    return header.size + size_in_bytes
+
+
+def skip_fixed_records(data, header, record_size):
+    count = header.unpack_from(data, 0)[0]
+    return header.size + count * record_size
+
+
+def skip_rigid_body_3_and_above(data, offset):
+    return offset + RigidBody3.size
+
+
+def skip_rigid_body_2_6_to_3(data, offset):
+    # ID, position and orientation
+    offset += 32
+    marker_count = IntValue.unpack_from(data, offset)[0]
+    # marker positions, IDs and sizes, then mean error and params
+    return offset + 4 + marker_count * 20 + 6
+
+
+def skip_rigid_body_pre_2_6(data, offset, major):
+    offset += 32
+    marker_count = IntValue.unpack_from(data, offset)[0]
+    offset += 4 + marker_count * 12
+    if major >= 2:
+        # marker IDs and sizes, then mean error
+        offset += marker_count * 8 + 4
+    return offset
+
+
+def skip_rigid_bodies(data, header, skip_rigid_body):
+    count = header.unpack_from(data, 0)[0]
+    offset = header.size
+    for _ in range(count):
+        offset = skip_rigid_body(data, offset)
+    return offset
+
+
+def skip_skeletons(data, header, skip_rigid_body):
+    count = header.unpack_from(data, 0)[0]
+    offset = header.size
+    for _ in range(count):
+        # skeleton ID, then its rigid bodies
+        rigid_body_count = IntValue.unpack_from(data, offset+4)[0]
+        offset += 8
+        for _ in range(rigid_body_count):
+            offset = skip_rigid_body(data, offset)
+    return offset
+
+
+def skip_marker_sets(data, header):
+    count = header.unpack_from(data, 0)[0]
+    offset = header.size
+    for _ in range(count):
+        # model name
+        offset = unpack_string(data, offset)[1]
+        marker_count = IntValue.unpack_from(data, offset)[0]
+        offset += 4 + marker_count * 12
+    return offset
+
+
+def skip_channel_sets(data, header):
+    """Force plates and devices: ID, then frames of each channel"""
+    count = header.unpack_from(data, 0)[0]
+    offset = header.size
+    for _ in range(count):
+        channel_count = IntValue.unpack_from(data, offset+4)[0]
+        offset += 8
+        for _ in range(channel_count):
+            frame_count = IntValue.unpack_from(data, offset)[0]
+            offset += 4 + frame_count * 4
+    return offset
+
+
+def skip_empty_section(data):
+    """Sections absent from this version, and the suffix: nothing follows it"""
+    return 0
+
+
+def get_section_skippers(major, minor):
+    """Skipper fn(data) -> size in bytes for each of FRAME_SECTIONS in a
+    bitstream version. Sections absent from the version are not checked."""
+    skippers = {"suffix": skip_empty_section}
+    if ((major == 4) and (minor > 0)) or (major > 4):
+        header = SectionHeaderWithSize
+        for name in FRAME_SECTIONS[:-1]:
+            skippers[name] = partial(skip_sized_section, header=header)
+        return skippers
+
+    header = SectionHeader
+    if major >= 3:
+        skip_rigid_body = skip_rigid_body_3_and_above
+        labeled_marker_size = LabeledMarker3.size
+    elif (major == 2 and minor >= 6):
+        skip_rigid_body = skip_rigid_body_2_6_to_3
+        labeled_marker_size = LabeledMarker2_6.size
+    else:
+        skip_rigid_body = partial(skip_rigid_body_pre_2_6, major=major)
+        labeled_marker_size = LabeledMarker2_4.size
+    skippers["marker_sets"] = partial(skip_marker_sets, header=header)
+    skippers["legacy_markers"] = partial(skip_fixed_records, header=header, record_size=Vector3.size) #type: ignore  # noqa E501
+    skippers["rigid_bodies"] = partial(skip_rigid_bodies, header=header, skip_rigid_body=skip_rigid_body) #type: ignore  # noqa E501
+    skippers["skeletons"] = partial(skip_skeletons, header=header, skip_rigid_body=skip_rigid_body) #type: ignore  # noqa E501
+    skippers["labeled_markers"] = partial(skip_fixed_records, header=header, record_size=labeled_marker_size) #type: ignore  # noqa E501
+    skippers["force_plates"] = partial(skip_channel_sets, header=header)
+    skippers["devices"] = partial(skip_channel_sets, header=header)
+    return skippers
+
+
+class DecodeSection:
+    """One step of a frame decode plan. decoder(data, packet_size) returns
+    (offset, section_data), section_data is stored as mocap_data.attr_name"""
+    def __init__(self, name, attr_name, decoder, header=None, record=None):
+        self.name = name
+        self.attr_name = attr_name
+        self.decoder = decoder
+        self.header = header
+        self.record = record
+        self.skipped = False
+
+    def get_as_string(self, tab_str="  ", level=0):
+        out_tab_str = tab_str * level
+        out_str = "%s%-16s: %s" % (out_tab_str, self.name, self.attr_name)
+        if self.header is not None:
+            out_str += "  header='%s'" % self.header.format
+        if self.record is not None:
+            out_str += "  record='%s' (%d bytes)" % (self.record.format,
+                                                      self.record.size)
+        if self.skipped:
+            out_str += "  (skipped)"
+        out_str += "\n"
+        return out_str
+
+
+class DecodePlan:
+    """Ordered frame section decoders compiled for one bitstream version"""
+    def __init__(self, major, minor, sections):
+        self.major = major
+        self.minor = minor
+        self.sections = sections
+
+    def get_section_names(self):
+        return [section.name for section in self.sections]
+
+    def get_as_string(self, tab_str="  ", level=0):
+        out_str = "%sDecode Plan for NatNet %d.%d\n" % (tab_str * level,
+                                                        self.major,
+                                                        self.minor)
+        for section in self.sections:
+            out_str += section.get_as_string(tab_str, level+1)
+        return out_str
+
 
 class NatNetClient:
     # print_level = 0 off
@@ -97,6 +332,26 @@ class NatNetClient:
         self.new_frame_with_data_listener = None
         self.model_description_listener = None
 
+        # Receive buffers of the data thread
+        self.buffer_pool = BufferPool()
+
+        # Queue between the receive and decode threads, None decodes in the
+        # receive thread. See set_decode_queue.
+        self.__packet_queue = None
+        self.decode_thread = None
+
+        # Callbacks receiving a full FrameBatch, see set_frame_batch.
+        self.batch_sinks = []
+        self.__frame_batch = None
+
+        # Decode skeletons and rigid bodies as NumPy array views instead of
+        # MoCapData object graphs (NatNet 3.0 and later only).
+        self.use_array_decode = False
+
+        # Frame sections to decode, None decodes all of them.
+        # Other sections are skipped without touching their contents.
+        self.decode_sections = None
+
         # Set Application Name
         self.__application_name = "Not Set"
 
@@ -125,6 +380,10 @@ class NatNetClient:
 
         self.stop_threads = False
 
+        # Frame decoders specialized for the requested bitstream version
+        self.__decode_plan = None
+        self.__build_decode_plan()
+
     # Client/server message ids
     NAT_CONNECT = 0
     NAT_SERVERINFO = 1
@@ -158,6 +417,73 @@ class NatNetClient:
         if not self.__is_locked:
             self.use_multicast = use_multicast
 
+    def set_array_decode(self, use_array_decode):
+        self.use_array_decode = use_array_decode
+        self.__build_decode_plan()
+
+    def set_decode_sections(self, decode_sections=None):
+        """Restricts frame decoding to the given sections (see
+        FRAME_SECTIONS), e.g. {"skeletons", "suffix"}. None decodes all."""
+        if decode_sections is not None:
+            decode_sections = frozenset(decode_sections)
+            unknown = decode_sections.difference(FRAME_SECTIONS + ("prefix",))
+            if unknown:
+                raise ValueError("Unknown frame sections: %s" % ", ".join(sorted(unknown))) #type: ignore  # noqa E501
+        self.decode_sections = decode_sections
+        self.__build_decode_plan()
+
+    def get_decode_sections(self):
+        return self.decode_sections
+
+    def set_decode_queue(self, capacity=64, policy="drop_oldest"):
+        """Splits receiving and decoding into two threads joined by a queue
+        of capacity datagrams. policy is "block", "drop_oldest" or
+        "keep_latest" (see PacketQueue). A capacity of 0 decodes in the
+        receive thread. Must be set before run."""
+        if self.__is_locked:
+            return False
+        if capacity:
+            self.__packet_queue = PacketQueue(capacity, policy)
+            # queued datagrams hold their buffer
+            self.buffer_pool = BufferPool(buffer_count=capacity + 8)
+        else:
+            self.__packet_queue = None
+        return True
+
+    def get_decode_queue_stats(self):
+        """Queue depth and drop counters, None when decoding inline"""
+        if self.__packet_queue is None:
+            return None
+        return self.__packet_queue.get_stats()
+
+    def set_frame_batch(self, frame_batch=None, **batch_args):
+        """Accumulates frames into frame_batch, or into a new
+        FrameBatch(**batch_args), and hands it to the batch sinks whenever
+        it is full. None stops batching."""
+        if frame_batch is None and batch_args:
+            frame_batch = FrameBatch(**batch_args)
+        self.__frame_batch = frame_batch
+        return frame_batch
+
+    def get_frame_batch(self):
+        return self.__frame_batch
+
+    def add_batch_sink(self, batch_sink):
+        """batch_sink(frame_batch) is called from the data thread, the
+        batch columns are overwritten once it returns"""
+        self.batch_sinks.append(batch_sink)
+
+    def remove_batch_sink(self, batch_sink):
+        self.batch_sinks.remove(batch_sink)
+
+    def flush_frame_batch(self):
+        """Hands a partially filled batch to the sinks"""
+        frame_batch = self.__frame_batch
+        if frame_batch is not None and frame_batch.get_frame_count() > 0:
+            for batch_sink in self.batch_sinks:
+                batch_sink(frame_batch)
+            frame_batch.reset()
+
     def can_change_bitstream_version(self):
         return self.__can_change_bitstream_version
 
@@ -175,6 +501,7 @@ class NatNetClient:
                 self.__nat_net_requested_version[1] = minor
                 self.__nat_net_requested_version[2] = 0
                 self.__nat_net_requested_version[3] = 0
+                self.__build_decode_plan()
                 print("changing bitstream MAIN")
                 # get original output state
                 # print_results = self.get_print_results()
@@ -205,6 +532,9 @@ class NatNetClient:
     def get_minor(self):
         return self.__nat_net_requested_version[1]
 
+    def get_decode_plan(self):
+        return self.__decode_plan
+
     def set_print_level(self, print_level=0):
         if (print_level >= 0):
             self.print_level = print_level
@@ -296,22 +626,15 @@ class NatNetClient:
     def __unpack_rigid_body_3_and_above(self, data, rb_num):
         """Calculates offset for NatNet 3 and above for rigid body
         unpacking"""
-        offset = 0
-
-        # ID (4 bytes)
-        new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-        offset += 4
-
-        trace_mf("RB: %3.1d ID: %3.1d" % (rb_num, new_id))
+        # ID, position, orientation, mean marker error and params (38 bytes)
+        new_id, pos_x, pos_y, pos_z, rot_x, rot_y, rot_z, rot_w, marker_error, param = RigidBody3.unpack_from(data, 0) #type: ignore  # noqa E501
+        offset = RigidBody3.size
+        pos = (pos_x, pos_y, pos_z)
+        rot = (rot_x, rot_y, rot_z, rot_w)
 
-        # Position and orientation
-        pos = Vector3.unpack(data[offset:offset+12])
-        offset += 12
-        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
-
-        rot = Quaternion.unpack(data[offset:offset+16])
-        offset += 16
-        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]" % (rot[0], rot[1], rot[2], rot[3])) #type: ignore  # noqa E501
+        trace_mf("RB: %3.1d ID: %3.1d", rb_num, new_id)
+        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
+        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]", rot[0], rot[1], rot[2], rot[3]) #type: ignore  # noqa E501
 
         rigid_body = MoCapData.RigidBody(new_id, pos, rot)
 
@@ -319,18 +642,11 @@ class NatNetClient:
         if self.rigid_body_listener is not None:
             self.rigid_body_listener(new_id, pos, rot)
 
-        marker_error, = FloatValue.unpack(data[offset:offset+4])
-        offset += 4
-        trace_mf("\tMean Marker Error: %3.2f" % marker_error)
+        trace_mf("\tMean Marker Error: %3.2f", marker_error)
         rigid_body.error = marker_error
 
-        param, = struct.unpack('h', data[offset:offset+2])
         tracking_valid = (param & 0x01) != 0
-        offset += 2
-        is_valid_str = 'False'
-        if tracking_valid:
-            is_valid_str = 'True'
-        trace_mf("\tTracking Valid: %s" % is_valid_str)
+        trace_mf("\tTracking Valid: %s", tracking_valid)
         if tracking_valid:
             rigid_body.tracking_valid = True
         else:
@@ -347,16 +663,16 @@ class NatNetClient:
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
 
-        trace_mf("RB: %3.1d ID: %3.1d" % (rb_num, new_id))
+        trace_mf("RB: %3.1d ID: %3.1d", rb_num, new_id)
 
         # Position and orientation
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
-        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
         rot = Quaternion.unpack(data[offset:offset+16])
         offset += 16
-        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]" % (rot[0], rot[1], rot[2], rot[3])) #type: ignore  # noqa E501
+        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]", rot[0], rot[1], rot[2], rot[3]) #type: ignore  # noqa E501
 
         rigid_body = MoCapData.RigidBody(new_id, pos, rot)
 
@@ -367,7 +683,7 @@ class NatNetClient:
         marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         marker_count_range = range(0, marker_count)
-        trace_mf("\tMarker Count:", marker_count)
+        trace_mf("\tMarker Count:%s", marker_count)
 
         rb_marker_list = []
         for i in marker_count_range:
@@ -377,20 +693,20 @@ class NatNetClient:
         for i in marker_count_range:
             pos = Vector3.unpack(data[offset:offset+12])
             offset += 12
-            trace_mf("\tMarker", i, ":", pos[0], ",", pos[1], ",", pos[2])
+            trace_mf("\tMarker%s:%s,%s,%s", i, pos[0], pos[1], pos[2])
             rb_marker_list[i].pos = pos
 
         for i in marker_count_range:
             new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
             offset += 4
-            trace_mf("\tMarker ID", i, ":", new_id)
-            rb_marker_list[i].id = new_id
+            trace_mf("\tMarker ID%s:%s", i, new_id)
+            rb_marker_list[i].id_num = new_id
 
         # Marker sizes
         for i in marker_count_range:
             size = FloatValue.unpack(data[offset:offset+4])
             offset += 4
-            trace_mf("\tMarker Size", i, ":", size[0])
+            trace_mf("\tMarker Size%s:%s", i, size[0])
             rb_marker_list[i].size = size
 
         for i in marker_count_range:
@@ -398,23 +714,20 @@ class NatNetClient:
 
         marker_error, = FloatValue.unpack(data[offset:offset+4])
         offset += 4
-        trace_mf("\tMean Marker Error: %3.2f" % marker_error)
+        trace_mf("\tMean Marker Error: %3.2f", marker_error)
         rigid_body.error = marker_error
 
         param, = struct.unpack('h', data[offset:offset+2])
         tracking_valid = (param & 0x01) != 0
         offset += 2
-        is_valid_str = 'False'
-        if tracking_valid:
-            is_valid_str = 'True'
-        trace_mf("\tTracking Valid: %s" % is_valid_str)
+        trace_mf("\tTracking Valid: %s", tracking_valid)
         if tracking_valid:
             rigid_body.tracking_valid = True
         else:
             rigid_body.tracking_valid = False
         return offset, rigid_body
 
-    def __unpack_rigid_body_pre_2_6(self, data, major, rb_num):
+    def __unpack_rigid_body_pre_2_6(self, data, rb_num, major):
         """Calculates offset for anything below NatNet 2.6"""
         offset = 0
 
@@ -422,16 +735,16 @@ class NatNetClient:
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
 
-        trace_mf("RB: %3.1d ID: %3.1d" % (rb_num, new_id))
+        trace_mf("RB: %3.1d ID: %3.1d", rb_num, new_id)
 
         # Position and orientation
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
-        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
         rot = Quaternion.unpack(data[offset:offset+16])
         offset += 16
-        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]" % (rot[0], rot[1], rot[2], rot[3])) #type: ignore  # noqa E501
+        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]", rot[0], rot[1], rot[2], rot[3]) #type: ignore  # noqa E501
 
         rigid_body = MoCapData.RigidBody(new_id, pos, rot)
 
@@ -442,7 +755,7 @@ class NatNetClient:
         marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         marker_count_range = range(0, marker_count)
-        trace_mf("\tMarker Count:", marker_count)
+        trace_mf("\tMarker Count:%s", marker_count)
 
         rb_marker_list = []
         for i in marker_count_range:
@@ -452,7 +765,7 @@ class NatNetClient:
         for i in marker_count_range:
             pos = Vector3.unpack(data[offset:offset+12])
             offset += 12
-            trace_mf("\tMarker", i, ":", pos[0], ",", pos[1], ",", pos[2])
+            trace_mf("\tMarker%s:%s,%s,%s", i, pos[0], pos[1], pos[2])
             rb_marker_list[i].pos = pos
 
         if major >= 2:
@@ -460,14 +773,14 @@ class NatNetClient:
             for i in marker_count_range:
                 new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
                 offset += 4
-                trace_mf("\tMarker ID", i, ":", new_id)
-                rb_marker_list[i].id = new_id
+                trace_mf("\tMarker ID%s:%s", i, new_id)
+                rb_marker_list[i].id_num = new_id
 
             # Marker sizes
             for i in marker_count_range:
                 size = FloatValue.unpack(data[offset:offset+4])
                 offset += 4
-                trace_mf("\tMarker Size", i, ":", size[0])
+                trace_mf("\tMarker Size%s:%s", i, size[0])
                 rb_marker_list[i].size = size
 
             for i in marker_count_range:
@@ -476,7 +789,7 @@ class NatNetClient:
             if major >= 2:
                 marker_error, = FloatValue.unpack(data[offset:offset+4])
                 offset += 4
-                trace_mf("\tMean Marker Error: %3.2f" % marker_error)
+                trace_mf("\tMean Marker Error: %3.2f", marker_error)
                 rigid_body.error = marker_error
         return offset, rigid_body
 
@@ -488,16 +801,16 @@ class NatNetClient:
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
 
-        trace_mf("RB: %3.1d ID: %3.1d" % (rb_num, new_id))
+        trace_mf("RB: %3.1d ID: %3.1d", rb_num, new_id)
 
         # Position and orientation
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
-        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
         rot = Quaternion.unpack(data[offset:offset+16])
         offset += 16
-        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]" % (rot[0], rot[1], rot[2], rot[3])) #type: ignore  # noqa E501
+        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]", rot[0], rot[1], rot[2], rot[3]) #type: ignore  # noqa E501
 
         rigid_body = MoCapData.RigidBody(new_id, pos, rot)
 
@@ -506,55 +819,51 @@ class NatNetClient:
             self.rigid_body_listener(new_id, pos, rot)
         return offset, rigid_body
 
-    def __unpack_rigid_body(self, data, major, minor, rb_num):
+    def __select_rigid_body_unpacker(self, major, minor):
+        """Returns the rigid body unpacker fn(data, rb_num) for a version"""
         if (major >= 3):
-            offset, rigid_body = self.__unpack_rigid_body_3_and_above(data, rb_num) #type: ignore  # noqa E501
+            return self.__unpack_rigid_body_3_and_above
         elif (major == 2 and minor >= 6):
-            offset, rigid_body = self.__unpack_rigid_body_2_6_to_3(data, rb_num) #type: ignore  # noqa E501
-        elif (major < 2 or (major == 2 and minor < 6)):
-            offset, rigid_body = self.__unpack_rigid_body_pre_2_6(data, major, rb_num) #type: ignore  # noqa E501
-        elif (major == 0):
-            offset, rigid_body = self.__unpack_rigid_body_0_case(data, rb_num)
+            return self.__unpack_rigid_body_2_6_to_3
         else:
-            pass
-        return offset, rigid_body
+            return partial(self.__unpack_rigid_body_pre_2_6, major=major)
 
     # Unpack a skeleton object from a data packet
-    def __unpack_skeleton(self, data, major, minor, skeleton_num=0):
+    def __unpack_skeleton(self, data, unpack_rigid_body, skeleton_num=0):
         offset = 0
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_mf("Skeleton %3.1d ID: %3.1d" % (skeleton_num, new_id))
+        trace_mf("Skeleton %3.1d ID: %3.1d", skeleton_num, new_id)
         skeleton = MoCapData.Skeleton(new_id)
 
         rigid_body_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_mf("Rigid Body Count: %3.1d" % rigid_body_count)
+        trace_mf("Rigid Body Count: %3.1d", rigid_body_count)
         if (rigid_body_count > 0):
             for rb_num in range(0, rigid_body_count):
-                offset_tmp, rigid_body = self.__unpack_rigid_body(data[offset:], major, minor, rb_num) #type: ignore  # noqa E501
+                offset_tmp, rigid_body = unpack_rigid_body(data[offset:], rb_num) #type: ignore  # noqa E501
                 skeleton.add_rigid_body(rigid_body)
                 offset += offset_tmp
 
         return offset, skeleton
 
-    def __unpack_asset(self, data, major, minor, asset_num=0):
+    def __unpack_asset(self, data, asset_num=0):
         offset = 0
-        trace_dd("\tAsset       : %d" % (asset_num))
+        trace_dd("\tAsset       : %d", asset_num)
         # Asset ID 4 bytes
         new_id = int.from_bytes(data[offset:offset+4], 'little',  signed=True)
         offset += 4
         asset = MoCapData.Asset()
-        trace_dd("\tAsset ID    : %d" % (new_id))
+        trace_dd("\tAsset ID    : %d", new_id)
         asset.set_id(new_id)
         # # of RigidBodies
         numRBs = int.from_bytes(data[offset:offset+4], 'little',  signed=True)
         offset += 4
-        trace_dd("\tRigid Bodies: %d" % (numRBs))
+        trace_dd("\tRigid Bodies: %d", numRBs)
         offset1 = 0
         for rb_num in range(numRBs):
             # # of RigidBodies
-            offset1, rigid_body = self.__unpack_asset_rigid_body_data(data[offset:], major, minor) #type: ignore  # noqa E501
+            offset1, rigid_body = self.__unpack_asset_rigid_body_data(data[offset:]) #type: ignore  # noqa E501
             offset += offset1
             rigid_body.rb_num = rb_num
             asset.add_rigid_body(rigid_body)
@@ -562,11 +871,11 @@ class NatNetClient:
         # # of Markers
         numMarkers = int.from_bytes(data[offset:offset+4], 'little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tMarkers     : %d" % (numMarkers))
+        trace_dd("\tMarkers     : %d", numMarkers)
 
         for marker_num in range(numMarkers):
             # # of Markers
-            offset1, marker = self.__unpack_asset_marker_data(data[offset:], major, minor) #type: ignore  # noqa E501
+            offset1, marker = self.__unpack_asset_marker_data(data[offset:]) #type: ignore  # noqa E501
             offset += offset1
             marker.marker_num = marker_num
             asset.add_marker(marker)
@@ -575,37 +884,28 @@ class NatNetClient:
 
 # Unpack Mocap Data Functions
 
-    def __unpack_frame_prefix_data(self, data):
+    def __unpack_frame_prefix_data(self, data, packet_size):
         offset = 0
         # Frame number (4 bytes)
         frame_number = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_mf("Frame #: %3.1d" % frame_number)
+        trace_mf("Frame #: %3.1d", frame_number)
         frame_prefix_data = MoCapData.FramePrefixData(frame_number)
         return offset, frame_prefix_data
 
-    def __unpack_data_size(self, data, major, minor):
-        sizeInBytes = 0
-        offset = 0
-
-        if (((major == 4) and (minor > 0)) or (major > 4)):
-            sizeInBytes = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-            offset += 4
-            trace_mf("Byte Count: %3.1d" % sizeInBytes)
-
-        return offset, sizeInBytes
-
-    def __unpack_legacy_other_markers(self, data, packet_size, major, minor):
-        offset = 0
+    def __unpack_empty_section(self, data, packet_size, container):
+        """Section not present in this bitstream version"""
+        return 0, container()
 
-        # Markerset count (4 bytes)
-        other_marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-        offset += 4
-        trace_mf("Other Marker Count:", other_marker_count)
+    def __skip_section(self, data, packet_size, skip):
+        """Section left out by set_decode_sections"""
+        return skip(data), None
 
-        # get data size (4 bytes)
-        offset_tmp, unpackedDataSize = self.__unpack_data_size(data[offset:], major, minor) #type: ignore  # noqa E501
-        offset += offset_tmp
+    def __unpack_legacy_other_markers(self, data, packet_size, header):
+        # Markerset count (4 bytes) and data size (4 bytes, NatNet 4.1+)
+        other_marker_count = header.unpack_from(data, 0)[0]
+        offset = header.size
+        trace_mf("Other Marker Count:%s", other_marker_count)
 
         other_marker_data = MoCapData.LegacyMarkerData()
         if (other_marker_count > 0):
@@ -614,28 +914,23 @@ class NatNetClient:
             for j in range(0, other_marker_count):
                 pos = Vector3.unpack(data[offset:offset+12])
                 offset += 12
-                trace_mf("\tMarker %3.1d: [x=%3.2f,y=%3.2f,z=%3.2f]" % (j, pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+                trace_mf("\tMarker %3.1d: [x=%3.2f,y=%3.2f,z=%3.2f]", j, pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
                 other_marker_data.add_pos(pos)
         return offset, other_marker_data
 
-    def __unpack_marker_set_data(self, data, packet_size, major, minor):
+    def __unpack_marker_set_data(self, data, packet_size, header):
         marker_set_data = MoCapData.MarkerSetData()
-        offset = 0
-        # Markerset count (4 bytes)
-        marker_set_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501s
-        offset += 4
-        trace_mf("Markerset Count:", marker_set_count)
-
-        # get data size (4 bytes)
-        offset_tmp, unpackedDataSize = self.__unpack_data_size(data[offset:], major, minor) #type: ignore  # noqa E501
-        offset += offset_tmp
+        # Markerset count (4 bytes) and data size (4 bytes, NatNet 4.1+)
+        marker_set_count = header.unpack_from(data, 0)[0]
+        offset = header.size
+        trace_mf("Markerset Count:%s", marker_set_count)
 
         for i in range(0, marker_set_count):
             marker_data = MoCapData.MarkerData()
             # Model name
-            model_name, separator, remainder = bytes(data[offset:]).partition(b'\0') #type: ignore  # noqa E501
-            offset += len(model_name) + 1
-            trace_mf("Model Name     : ", model_name.decode('utf-8',"replace")) #type: ignore  # noqa E501
+            model_name, offset = unpack_string(data, offset)
+            if trace_mf_sink is not None:
+                trace_mf("Model Name     : %s", model_name.decode('utf-8',"replace")) #type: ignore  # noqa E501
             marker_data.set_model_name(model_name)
             # Marker count (4 bytes)
             marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
@@ -649,7 +944,7 @@ class NatNetClient:
                 offset = len(data)
                 return offset, marker_set_data
 
-            trace_mf("Marker Count   : ", marker_count)
+            trace_mf("Marker Count   : %s", marker_count)
             for j in range(0, marker_count):
                 if (len(data) < (offset+12)):
                     print("WARNING: Early return.  Out of data at marker ", j, " of ", marker_count) #type: ignore  # noqa E501
@@ -658,7 +953,7 @@ class NatNetClient:
                     break
                 pos = Vector3.unpack(data[offset:offset+12])
                 offset += 12
-                trace_mf("\tMarker %3.1d: [x=%3.2f,y=%3.2f,z=%3.2f]" % (j, pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+                trace_mf("\tMarker %3.1d: [x=%3.2f,y=%3.2f,z=%3.2f]", j, pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
                 marker_data.add_pos(pos)
             marker_set_data.add_marker_data(marker_data)
 
@@ -674,43 +969,58 @@ class NatNetClient:
         #    marker_set_data.add_unlabeled_marker(pos)
         return offset, marker_set_data
 
-    def __unpack_rigid_body_data(self, data, packet_size, major, minor):
+    def __unpack_rigid_body_data(self, data, packet_size, header, unpack_rigid_body): #type: ignore  # noqa E501
         rigid_body_data = MoCapData.RigidBodyData()
-        offset = 0
-        # Rigid body count (4 bytes)
-        rigid_body_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-        offset += 4
-        trace_mf("Rigid Body Count:", rigid_body_count)
-
-        # get data size (4 bytes)
-        offset_tmp, unpackedDataSize = self.__unpack_data_size(data[offset:], major, minor) #type: ignore  # noqa E501
-        offset += offset_tmp
+        # Rigid body count (4 bytes) and data size (4 bytes, NatNet 4.1+)
+        rigid_body_count = header.unpack_from(data, 0)[0]
+        offset = header.size
+        trace_mf("Rigid Body Count:%s", rigid_body_count)
 
         for i in range(0, rigid_body_count):
-            offset_tmp, rigid_body = self.__unpack_rigid_body(data[offset:], major, minor, i) #type: ignore  # noqa E501
+            offset_tmp, rigid_body = unpack_rigid_body(data[offset:], i)
             offset += offset_tmp
             rigid_body_data.add_rigid_body(rigid_body)
 
         return offset, rigid_body_data
 
-    def __unpack_skeleton_data(self, data, packet_size, major, minor):
+    def __unpack_rigid_body_array_data(self, data, packet_size, header):
+        """Rigid body section as NumPy views (NatNet 3.0 and later)"""
+        rigid_body_count = header.unpack_from(data, 0)[0]
+        trace_mf("Rigid Body Count:%s", rigid_body_count)
+        records, offset = unpack_rigid_body_records(data, header.size, rigid_body_count) #type: ignore  # noqa E501
+        rigid_body_data = MoCapData.RigidBodyArrays(records)
+
+        # Send information to any listener.
+        if self.rigid_body_listener is not None:
+            for i in range(0, rigid_body_count):
+                self.rigid_body_listener(int(rigid_body_data.ids[i]), tuple(rigid_body_data.positions[i]), tuple(rigid_body_data.quaternions[i])) #type: ignore  # noqa E501
+        return offset, rigid_body_data
+
+    def __unpack_skeleton_data(self, data, packet_size, header, unpack_rigid_body): #type: ignore  # noqa E501
         skeleton_data = MoCapData.SkeletonData()
+        # Skeleton count (4 bytes) and data size (4 bytes, NatNet 4.1+)
+        skeleton_count = header.unpack_from(data, 0)[0]
+        offset = header.size
+        trace_mf("Skeleton Count:%s", skeleton_count)
+        for skeleton_num in range(0, skeleton_count):
+            rel_offset, skeleton = self.__unpack_skeleton(data[offset:], unpack_rigid_body, skeleton_num) #type: ignore  # noqa E501
+            offset += rel_offset
+            skeleton_data.add_skeleton(skeleton)
 
-        offset = 0
-        # Version 2.1 and later
-        skeleton_count = 0
-        if ((major == 2 and minor > 0) or major > 2):
-            skeleton_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501v
-            offset += 4
-            trace_mf("Skeleton Count:", skeleton_count)
-            # Get data size (4 bytes)
-            offset_tmp, unpackedDataSize = self.__unpack_data_size(data[offset:], major, minor) #type: ignore  # noqa E501
-            offset += offset_tmp
-            if (skeleton_count > 0):
-                for skeleton_num in range(0, skeleton_count):
-                    rel_offset, skeleton = self.__unpack_skeleton(data[offset:], major, minor, skeleton_num) #type: ignore  # noqa E501
-                    offset += rel_offset
-                    skeleton_data.add_skeleton(skeleton)
+        return offset, skeleton_data
+
+    def __unpack_skeleton_array_data(self, data, packet_size, header):
+        """Skeleton section as NumPy views (NatNet 3.0 and later)"""
+        skeleton_data = MoCapData.SkeletonData()
+        skeleton_count = header.unpack_from(data, 0)[0]
+        offset = header.size
+        trace_mf("Skeleton Count:%s", skeleton_count)
+        for skeleton_num in range(0, skeleton_count):
+            new_id, rigid_body_count = struct.unpack_from('<ii', data, offset) #type: ignore  # noqa E501
+            offset += 8
+            trace_mf("Skeleton %3.1d ID: %3.1d", skeleton_num, new_id)
+            records, offset = unpack_rigid_body_records(data, offset, rigid_body_count) #type: ignore  # noqa E501
+            skeleton_data.add_skeleton(MoCapData.SkeletonArrays(new_id, records)) #type: ignore  # noqa E501
 
         return offset, skeleton_data
 
@@ -721,176 +1031,133 @@ class NatNetClient:
         marker_id = new_id & 0x0000ffff
         return model_id, marker_id
 
-    def __unpack_labeled_marker_data(self, data, packet_size, major, minor):
+    def __unpack_labeled_marker_data(self, data, packet_size, header, record, record_pad, residual_scale): #type: ignore  # noqa E501
+        """Labeled markers (Version 2.4 and later). record holds the id, pos
+        and size, followed by params (2.6+) and residual (3.0+). Fields
+        missing from older versions are filled from record_pad."""
         labeled_marker_data = MoCapData.LabeledMarkerData()
-        offset = 0
-        # Labeled markers (Version 2.3 and later)
-        labeled_marker_count = 0
-        if ((major == 2 and minor > 3) or major > 2):
-            labeled_marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-            offset += 4
-            trace_mf("Labeled Marker Count:", labeled_marker_count)
-
-            # get data size (4 bytes)
-            offset_tmp, unpackedDataSize = self.__unpack_data_size(data[offset:], major, minor) #type: ignore  # noqa E501
-            offset += offset_tmp
-
-            for lm_num in range(0, labeled_marker_count):
-                model_id = 0
-                marker_id = 0
-                tmp_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-                offset += 4
+        # Labeled marker count (4 bytes) and data size (4 bytes, NatNet 4.1+)
+        labeled_marker_count = header.unpack_from(data, 0)[0]
+        offset = header.size
+        trace_mf("Labeled Marker Count:%s", labeled_marker_count)
+
+        for lm_num in range(0, labeled_marker_count):
+            tmp_id, pos_x, pos_y, pos_z, size, param, residual = record.unpack_from(data, offset) + record_pad #type: ignore  # noqa E501
+            offset += record.size
+            pos = (pos_x, pos_y, pos_z)
+            residual = residual * residual_scale
+            if trace_mf_sink is not None:
                 model_id, marker_id = self.__decode_marker_id(tmp_id)
-                pos = Vector3.unpack(data[offset:offset+12])
-                offset += 12
-                size = FloatValue.unpack(data[offset:offset+4])
-                offset += 4
-                trace_mf(" %3.1d ID    : [MarkerID: %3.1d] [ModelID: %3.1d]" % (lm_num, marker_id,model_id)) #type: ignore  # noqa E501
-                trace_mf("    pos : [%3.2f, %3.2f, %3.2f]" % (pos[0],pos[1],pos[2])) #type: ignore  # noqa E501
-                trace_mf("    size: [%3.2f]" % size)
-
-                # Version 2.6 and later
-                param = 0
-                if ((major == 2 and minor >= 6) or major > 2):
-                    param, = struct.unpack('h', data[offset:offset+2])
-                    offset += 2
-                    # occluded = (param & 0x01) != 0
-                    # point_cloud_solved = (param & 0x02) != 0
-                    # model_solved = (param & 0x04) != 0
-
-                # Version 3.0 and later
-                residual = 0.0
-                if major >= 3:
-                    residual, = FloatValue.unpack(data[offset:offset+4])
-                    offset += 4
-                    residual = residual * 1000.0
-                    trace_mf("    err : [%3.2f]" % residual)
+                trace_mf(" %3.1d ID    : [MarkerID: %3.1d] [ModelID: %3.1d]", lm_num, marker_id, model_id) #type: ignore  # noqa E501
+            trace_mf("    pos : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2])
+            trace_mf("    size: [%3.2f]", size)
+            trace_mf("    err : [%3.2f]", residual)
+            # occluded = (param & 0x01) != 0
+            # point_cloud_solved = (param & 0x02) != 0
+            # model_solved = (param & 0x04) != 0
 
-                labeled_marker = MoCapData.LabeledMarker(tmp_id, pos, size, param, residual) #type: ignore  # noqa E501
-                labeled_marker_data.add_labeled_marker(labeled_marker)
+            labeled_marker = MoCapData.LabeledMarker(tmp_id, pos, size, param, residual) #type: ignore  # noqa E501
+            labeled_marker_data.add_labeled_marker(labeled_marker)
 
         return offset, labeled_marker_data
 
-    def __unpack_force_plate_data(self, data, packet_size, major, minor):
+    def __unpack_force_plate_data(self, data, packet_size, header):
+        """Force Plate data (version 2.9 and later)"""
         force_plate_data = MoCapData.ForcePlateData()
         n_frames_show_max = 4
-        offset = 0
-        # Force Plate data (version 2.9 and later)
-        force_plate_count = 0
-        if ((major == 2 and minor >= 9) or major > 2):
-            force_plate_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
+        # Force plate count (4 bytes) and data size (4 bytes, NatNet 4.1+)
+        force_plate_count = header.unpack_from(data, 0)[0]
+        offset = header.size
+        trace_mf("Force Plate Count:%s", force_plate_count)
+
+        for i in range(0, force_plate_count):
+            # ID
+            force_plate_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
             offset += 4
-            trace_mf("Force Plate Count:", force_plate_count)
+            force_plate = MoCapData.ForcePlate(force_plate_id)
 
-            # get data size (4 bytes)
-            offset_tmp, unpackedDataSize = self.__unpack_data_size(data[offset:], major, minor) #type: ignore  # noqa E501
-            offset += offset_tmp
+            # Channel Count
+            force_plate_channel_count = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
+            offset += 4
 
-            for i in range(0, force_plate_count):
-                # ID
-                force_plate_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-                offset += 4
-                force_plate = MoCapData.ForcePlate(force_plate_id)
+            trace_mf("\tForce Plate %3.1d ID: %3.1d Num Channels: %3.1d", i, force_plate_id, force_plate_channel_count) #type: ignore  # noqa E501
 
-                # Channel Count
-                force_plate_channel_count = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
+            # Channel Data
+            for j in range(force_plate_channel_count):
+                fp_channel_data = MoCapData.ForcePlateChannelData()
+                force_plate_channel_frame_count = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
                 offset += 4
 
-                trace_mf("\tForce Plate %3.1d ID: %3.1d Num Channels: %3.1d" % (i, force_plate_id, force_plate_channel_count)) #type: ignore  # noqa E501
-
-                # Channel Data
-                for j in range(force_plate_channel_count):
-                    fp_channel_data = MoCapData.ForcePlateChannelData()
-                    force_plate_channel_frame_count = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
+                # Force plate frames
+                for k in range(force_plate_channel_frame_count):
+                    force_plate_channel_val = FloatValue.unpack(data[offset:offset+4]) #type: ignore  # noqa E501
                     offset += 4
-                    out_string = "\tChannel %3.1d: " % (j)
-                    out_string += "  %3.1d Frames - Frame Data: " % (force_plate_channel_frame_count) #type: ignore  # noqa E501
-
-                    # Force plate frames
-                    n_frames_show = min(force_plate_channel_frame_count, n_frames_show_max) #type: ignore  # noqa E501
-                    for k in range(force_plate_channel_frame_count):
-                        force_plate_channel_val = FloatValue.unpack(data[offset:offset+4]) #type: ignore  # noqa E501
-                        offset += 4
-                        fp_channel_data.add_frame_entry(force_plate_channel_val) #type: ignore  # noqa E501
-
-                        if k < n_frames_show:
-                            out_string += " %3.2f " % (force_plate_channel_val)
-                    if n_frames_show < force_plate_channel_frame_count:
-                        out_string += " showing %3.1d of %3.1d frames" % (n_frames_show, force_plate_channel_frame_count) #type: ignore  # noqa E501
-                    force_plate.add_channel_data(fp_channel_data)
-                force_plate_data.add_force_plate(force_plate)
+                    fp_channel_data.add_frame_entry(force_plate_channel_val) #type: ignore  # noqa E501
+
+                if trace_mf_sink is not None:
+                    trace_mf("\tChannel %3.1d: %s", j, get_channel_frames_str(fp_channel_data.frame_list, n_frames_show_max)) #type: ignore  # noqa E501
+                force_plate.add_channel_data(fp_channel_data)
+            force_plate_data.add_force_plate(force_plate)
         return offset, force_plate_data
 
-    def __unpack_device_data(self, data, packet_size, major, minor):
+    def __unpack_device_data(self, data, packet_size, header):
+        """Device data (version 2.11 and later)"""
         device_data = MoCapData.DeviceData()
         n_frames_show_max = 4
-        offset = 0
-        # Device data (version 2.11 and later)
-        device_count = 0
-        if (major == 2 and minor >= 11) or (major > 2):
-            device_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-            offset += 4
-            trace_mf("Device Count:", device_count)
+        # Device count (4 bytes) and data size (4 bytes, NatNet 4.1+)
+        device_count = header.unpack_from(data, 0)[0]
+        offset = header.size
+        trace_mf("Device Count:%s", device_count)
 
-            # get data size (4 bytes)
-            offset_tmp, unpackedDataSize = self.__unpack_data_size(data[offset:], major, minor) #type: ignore  # noqa E501
-            offset += offset_tmp
+        for i in range(0, device_count):
 
-            for i in range(0, device_count):
+            # ID
+            device_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
+            offset += 4
+            device = MoCapData.Device(device_id)
+            # Channel Count
+            device_channel_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
+            offset += 4
 
-                # ID
-                device_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-                offset += 4
-                device = MoCapData.Device(device_id)
-                # Channel Count
-                device_channel_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-                offset += 4
+            trace_mf("\tDevice %3.1d      ID: %3.1d Num Channels: %3.1d", i, device_id, device_channel_count) #type: ignore  # noqa E501
 
-                trace_mf("\tDevice %3.1d      ID: %3.1d Num Channels: %3.1d" % (i, device_id, device_channel_count)) #type: ignore  # noqa E501
+            # Channel Data
+            for j in range(0, device_channel_count):
+                device_channel_data = MoCapData.DeviceChannelData()
+                device_channel_frame_count = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
+                offset += 4
 
-                # Channel Data
-                for j in range(0, device_channel_count):
-                    device_channel_data = MoCapData.DeviceChannelData()
-                    device_channel_frame_count = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
+                # Device Frame Data
+                for k in range(0, device_channel_frame_count):
+                    device_channel_val = FloatValue.unpack(data[offset:offset+4]) #type: ignore  # noqa E501
                     offset += 4
-                    out_string = "\tChannel %3.1d " % (j)
-                    out_string += "  %3.1d Frames - Frame Data: " % (device_channel_frame_count) #type: ignore  # noqa E501
-
-                    # Device Frame Data
-                    n_frames_show = min(device_channel_frame_count, n_frames_show_max) #type: ignore  # noqa E501
-                    for k in range(0, device_channel_frame_count):
-                        device_channel_val = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
-                        device_channel_val = FloatValue.unpack(data[offset:offset+4]) #type: ignore  # noqa E501
-                        offset += 4
-                        if k < n_frames_show:
-                            out_string += " %3.2f " % (device_channel_val)
-
-                        device_channel_data.add_frame_entry(device_channel_val)
-                    if n_frames_show < device_channel_frame_count:
-                        out_string += " showing %3.1d of %3.1d frames" % (n_frames_show, device_channel_frame_count) #type: ignore  # noqa E501
-                    trace_mf(" %s" % out_string)
-                    device.add_channel_data(device_channel_data)
-                device_data.add_device(device)
+                    device_channel_data.add_frame_entry(device_channel_val)
+
+                if trace_mf_sink is not None:
+                    trace_mf(" \tChannel %3.1d %s", j, get_channel_frames_str(device_channel_data.frame_list, n_frames_show_max)) #type: ignore  # noqa E501
+                device.add_channel_data(device_channel_data)
+            device_data.add_device(device)
         return offset, device_data
 
     def __unpack_frame_suffix_data_4_1_to_present(self, data, offset, frame_suffix_data, param): #type: ignore  # noqa E501
         """Unpacks frame suffix data from NatNet 4.1 to present NatNet"""
         timestamp, = DoubleValue.unpack(data[offset:offset+8])
         offset += 8
-        trace_mf("Timestamp: %3.2f" % timestamp)
+        trace_mf("Timestamp: %3.2f", timestamp)
         frame_suffix_data.timestamp = timestamp
-        trace_mf("Mid-exposure timestamp        : %3.1d" % stamp_camera_mid_exposure) #type: ignore  # noqa E501
+        stamp_camera_mid_exposure = int.from_bytes(data[offset:offset+8], byteorder='little',  signed=True) #type: ignore  # noqa E501
+        trace_mf("Mid-exposure timestamp        : %3.1d", stamp_camera_mid_exposure) #type: ignore  # noqa E501
         offset += 8
         frame_suffix_data.stamp_camera_mid_exposure = stamp_camera_mid_exposure #type: ignore  # noqa E501
 
         stamp_data_received = int.from_bytes(data[offset:offset+8], byteorder='little',  signed=True) #type: ignore  # noqa E501
         offset += 8
         frame_suffix_data.stamp_data_received = stamp_data_received
-        trace_mf("Camera data received timestamp: %3.1d" %stamp_data_received) #type: ignore  # noqa E501
+        trace_mf("Camera data received timestamp: %3.1d", stamp_data_received) #type: ignore  # noqa E501
 
         stamp_transmit = int.from_bytes(data[offset:offset+8], byteorder='little',  signed=True) #type: ignore  # noqa E501
         offset += 8
-        trace_mf("Transmit timestamp            : %3.1d" % stamp_transmit)  #type: ignore  # noqa E501
+        trace_mf("Transmit timestamp            : %3.1d", stamp_transmit)  #type: ignore  # noqa E501
         frame_suffix_data.stamp_transmit = stamp_transmit
 
         prec_timestamp_secs = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
@@ -899,12 +1166,12 @@ class NatNetClient:
         # seconds=prec_timestamp_secs%60
         # out_string= "Precision timestamp (h:m:s) - %4.1d:%2.2d:%2.2d" % (hours, minutes, seconds) #type: ignore  # noqa E501
         # trace_mf(" %s" %out_string)
-        trace_mf("Precision timestamp (sec)     : %3.1d" % prec_timestamp_secs) #type: ignore  # noqa E501
+        trace_mf("Precision timestamp (sec)     : %3.1d", prec_timestamp_secs) #type: ignore  # noqa E501
         offset += 4
         frame_suffix_data.prec_timestamp_secs = prec_timestamp_secs
 
         prec_timestamp_frac_secs = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-        trace_mf("Precision timestamp (frac sec): %3.1d" % prec_timestamp_frac_secs) #type: ignore  # noqa E501
+        trace_mf("Precision timestamp (frac sec): %3.1d", prec_timestamp_frac_secs) #type: ignore  # noqa E501
         offset += 4
         frame_suffix_data.prec_timestamp_frac_secs = prec_timestamp_frac_secs #type: ignore  # noqa E501
         param, = struct.unpack('h', data[offset:offset+2])
@@ -916,21 +1183,21 @@ class NatNetClient:
         """Unpacks frame suffix data inclusive from NatNet 3 to NatNet 4"""
         timestamp, = DoubleValue.unpack(data[offset:offset+8])
         offset += 8
-        trace_mf("Timestamp: %3.2f" % timestamp)
+        trace_mf("Timestamp: %3.2f", timestamp)
         frame_suffix_data.timestamp = timestamp
         stamp_camera_mid_exposure = int.from_bytes(data[offset:offset+8], byteorder='little',  signed=True) #type: ignore  # noqa E501
-        trace_mf("Mid-exposure timestamp        : %3.1d" % stamp_camera_mid_exposure) #type: ignore  # noqa E501
+        trace_mf("Mid-exposure timestamp        : %3.1d", stamp_camera_mid_exposure) #type: ignore  # noqa E501
         offset += 8
         frame_suffix_data.stamp_camera_mid_exposure = stamp_camera_mid_exposure #type: ignore  # noqa E501
 
         stamp_data_received = int.from_bytes(data[offset:offset+8], byteorder='little',  signed=True) #type: ignore  # noqa E501
         offset += 8
         frame_suffix_data.stamp_data_received = stamp_data_received
-        trace_mf("Camera data received timestamp: %3.1d" %stamp_data_received) #type: ignore  # noqa E501
+        trace_mf("Camera data received timestamp: %3.1d", stamp_data_received) #type: ignore  # noqa E501
 
         stamp_transmit = int.from_bytes(data[offset:offset+8], byteorder='little',  signed=True) #type: ignore  # noqa E501
         offset += 8
-        trace_mf("Transmit timestamp            : %3.1d" % stamp_transmit)  #type: ignore  # noqa E501
+        trace_mf("Transmit timestamp            : %3.1d", stamp_transmit)  #type: ignore  # noqa E501
         frame_suffix_data.stamp_transmit = stamp_transmit
         param, = struct.unpack('h', data[offset:offset+2])
         offset += 2
@@ -940,7 +1207,7 @@ class NatNetClient:
         including NatNet 3"""
         timestamp, = DoubleValue.unpack(data[offset:offset+8])
         offset += 8
-        trace_mf("Timestamp: %3.2f" % timestamp)
+        trace_mf("Timestamp: %3.2f", timestamp)
         frame_suffix_data.timestamp = timestamp
         param, = struct.unpack('h', data[offset:offset+2])
         offset += 2
@@ -952,7 +1219,7 @@ class NatNetClient:
           NatNet 2.7"""
         timestamp, = FloatValue.unpack(data[offset:offset+4])
         offset += 4
-        trace_mf("Timestamp: %3.2f" % timestamp)
+        trace_mf("Timestamp: %3.2f", timestamp)
         frame_suffix_data.timestamp = timestamp
         param, = struct.unpack('h', data[offset:offset+2])
         offset += 2
@@ -963,13 +1230,26 @@ class NatNetClient:
         """Unpacks frame suffix data if the major case is 0 """
         timestamp, = DoubleValue.unpack(data[offset:offset+8])
         offset += 8
-        trace_mf("Timestamp: %3.2f" % timestamp)
+        trace_mf("Timestamp: %3.2f", timestamp)
         frame_suffix_data.timestamp = timestamp
         param, = struct.unpack('h', data[offset:offset+2])
         offset += 2
         return data, offset, frame_suffix_data, param
 
-    def __unpack_frame_suffix_data(self, data, packet_size, major, minor):
+    def __select_frame_suffix_unpacker(self, major, minor):
+        """Returns the timestamp/params unpacker of the frame suffix"""
+        if (major == 0):
+            return self.__unpack_frame_suffix_data_0_case
+        elif (major < 2 or (major == 2 and minor < 7)):
+            return self.__unpack_frame_suffix_data_pre_2_7
+        elif (major == 2):
+            return self.__unpack_frame_suffix_data_2_7_to_3
+        elif (major == 3 or (major == 4 and minor == 0)):
+            return self.__unpack_frame_suffix_data_3_to_4
+        else:
+            return self.__unpack_frame_suffix_data_4_1_to_present
+
+    def __unpack_frame_suffix_data(self, data, packet_size, unpack_timestamps): #type: ignore  # noqa E501
         frame_suffix_data = MoCapData.FrameSuffixData()
         offset = 0
 
@@ -988,16 +1268,7 @@ class NatNetClient:
             print("ERROR: Early End of Data Frame Suffix Data")
             print("\tNo time stamp info available")
         else:
-            if (major == 0):
-                data, offset, frame_suffix_data = self.__unpack_frame_suffix_data_0_case(data, offset, frame_suffix_data, param) #type: ignore  # noqa E501
-            elif (major < 2 or (major <= 2 and minor < 7)):
-                data, offset, frame_suffix_data, param = self.__unpack_frame_suffix_data_pre_2_7(data, offset, frame_suffix_data, param)#type: ignore  # noqa E501
-            elif (major == 2 and minor >= 7 and major < 3):
-                data, offset, frame_suffix_data, param = self.__unpack_frame_suffix_data_2_7_to_3(data, offset, frame_suffix_data, param) #type: ignore  # noqa E501
-            elif (major >= 3 or (major == 4 and minor == 0)):
-                data, offset, frame_suffix_data, param = self.__unpack_frame_suffix_data_3_to_4(data, offset, frame_suffix_data, param) #type: ignore  # noqa E501
-            elif (major >= 4 and minor != 0):
-                data, offset, frame_suffix_data, param = self.__unpack_frame_suffix_data_4_1_to_present(data, offset, frame_suffix_data, param) #type: ignore  # noqa E501
+            data, offset, frame_suffix_data, param = unpack_timestamps(data, offset, frame_suffix_data, param) #type: ignore  # noqa E501
 
         is_recording = (param & 0x01) != 0
         tracked_models_changed = (param & 0x02) != 0
@@ -1007,74 +1278,135 @@ class NatNetClient:
 
         return offset, frame_suffix_data
 
-    # Unpack data from a motion capture frame message
-    def __unpack_mocap_data(self, data: bytes, packet_size, major, minor):
-        mocap_data = MoCapData.MoCapData()
-        data = memoryview(data)
-        offset = 0
-        rel_offset = 0
-        # Frame Prefix Data
-        rel_offset, frame_prefix_data = self.__unpack_frame_prefix_data(data[offset:]) #type: ignore  # noqa E501
-        offset += rel_offset
-        mocap_data.set_prefix_data(frame_prefix_data)
-        frame_number = frame_prefix_data.frame_number
-
-        # Markerset Data
-        rel_offset, marker_set_data = self.__unpack_marker_set_data(data[offset:], (packet_size - offset), major, minor) #type: ignore  # noqa E501
-        offset += rel_offset
-        mocap_data.set_marker_set_data(marker_set_data)
-        marker_set_count = marker_set_data.get_marker_set_count()
-        unlabeled_markers_count = marker_set_data.get_unlabeled_marker_count()
-
-        # Legacy Other Markers
-        rel_offset, legacy_other_markers = self.__unpack_legacy_other_markers(data[offset:], (packet_size - offset),major, minor) #type: ignore  # noqa E501
-        offset += rel_offset
-        mocap_data.set_legacy_other_markers(legacy_other_markers)
-        marker_set_count = legacy_other_markers.get_marker_count()
-        legacy_other_markers_count = marker_set_data.get_unlabeled_marker_count() #type: ignore  # noqa F401
+    def __build_decode_plan(self):
+        """Compiles the frame decode plan for the requested bitstream version.
+        Rebuilt only when the version or the decode mode changes, so frame
+        decoding never checks the version."""
+        major = self.get_major()
+        minor = self.get_minor()
 
-        # Rigid Body Data
-        rel_offset, rigid_body_data = self.__unpack_rigid_body_data(data[offset:], (packet_size - offset), major, minor) #type: ignore  # noqa E501
-        offset += rel_offset
-        mocap_data.set_rigid_body_data(rigid_body_data)
-        rigid_body_count = rigid_body_data.get_rigid_body_count()
+        header = SectionHeader
+        if ((major == 4) and (minor > 0)) or (major > 4):
+            header = SectionHeaderWithSize
+        unpack_rigid_body = self.__select_rigid_body_unpacker(major, minor)
+        rigid_body_record = None
+        if major >= 3:
+            rigid_body_record = RigidBody3
+
+        sections = []
+        sections.append(DecodeSection("prefix", "prefix_data", self.__unpack_frame_prefix_data, record=IntValue)) #type: ignore  # noqa E501
+        sections.append(DecodeSection("marker_sets", "marker_set_data", partial(self.__unpack_marker_set_data, header=header), header)) #type: ignore  # noqa E501
+        sections.append(DecodeSection("legacy_markers", "legacy_other_markers", partial(self.__unpack_legacy_other_markers, header=header), header, Vector3)) #type: ignore  # noqa E501
 
-        # Skeleton Data
-        rel_offset, skeleton_data = self.__unpack_skeleton_data(data[offset:], (packet_size - offset), major, minor) #type: ignore  # noqa E501
-        offset += rel_offset
-        mocap_data.set_skeleton_data(skeleton_data)
-        skeleton_count = skeleton_data.get_skeleton_count()
+        # Rigid Body Data
+        if self.use_array_decode and major >= 3:
+            rigid_body_decoder = partial(self.__unpack_rigid_body_array_data, header=header) #type: ignore  # noqa E501
+        else:
+            rigid_body_decoder = partial(self.__unpack_rigid_body_data, header=header, unpack_rigid_body=unpack_rigid_body) #type: ignore  # noqa E501
+        sections.append(DecodeSection("rigid_bodies", "rigid_body_data", rigid_body_decoder, header, rigid_body_record)) #type: ignore  # noqa E501
+
+        # Skeleton Data (Version 2.1 and later)
+        skeleton_header = header
+        if self.use_array_decode and major >= 3:
+            skeleton_decoder = partial(self.__unpack_skeleton_array_data, header=header) #type: ignore  # noqa E501
+        elif ((major == 2 and minor > 0) or major > 2):
+            skeleton_decoder = partial(self.__unpack_skeleton_data, header=header, unpack_rigid_body=unpack_rigid_body) #type: ignore  # noqa E501
+        else:
+            skeleton_decoder = partial(self.__unpack_empty_section, container=MoCapData.SkeletonData) #type: ignore  # noqa E501
+            skeleton_header = None
+        sections.append(DecodeSection("skeletons", "skeleton_data", skeleton_decoder, skeleton_header, rigid_body_record)) #type: ignore  # noqa E501
 
         # Assets (Motive 3.1/NatNet 4.1 and greater)
-        asset_count = 0
         if (((major >= 4) and (minor >= 1)) or (major > 4)):
-            rel_offset, asset_data = self.__unpack_asset_data(data[offset:], (packet_size - offset), major, minor) #type: ignore  # noqa E501
-            offset += rel_offset
-            mocap_data.set_asset_data(asset_data)
-            asset_count = asset_data.get_asset_count()
+            sections.append(DecodeSection("assets", "asset_data", partial(self.__unpack_asset_data, header=header), header)) #type: ignore  # noqa E501
 
-        # Labeled Marker Data
-        rel_offset, labeled_marker_data = self.__unpack_labeled_marker_data(data[offset:], (packet_size - offset), major, minor) #type: ignore  # noqa E501
-        offset += rel_offset
-        mocap_data.set_labeled_marker_data(labeled_marker_data)
-        labeled_marker_count = labeled_marker_data.get_labeled_marker_count()
+        # Labeled Marker Data (Version 2.4 and later)
+        labeled_marker_header = header
+        if major >= 3:
+            labeled_marker_decoder = partial(self.__unpack_labeled_marker_data, header=header, record=LabeledMarker3, record_pad=(), residual_scale=1000.0) #type: ignore  # noqa E501
+            labeled_marker_record = LabeledMarker3
+        elif (major == 2 and minor >= 6):
+            labeled_marker_decoder = partial(self.__unpack_labeled_marker_data, header=header, record=LabeledMarker2_6, record_pad=(0.0,), residual_scale=1.0) #type: ignore  # noqa E501
+            labeled_marker_record = LabeledMarker2_6
+        elif (major == 2 and minor > 3):
+            labeled_marker_decoder = partial(self.__unpack_labeled_marker_data, header=header, record=LabeledMarker2_4, record_pad=(0, 0.0), residual_scale=1.0) #type: ignore  # noqa E501
+            labeled_marker_record = LabeledMarker2_4
+        else:
+            labeled_marker_decoder = partial(self.__unpack_empty_section, container=MoCapData.LabeledMarkerData) #type: ignore  # noqa E501
+            labeled_marker_header = None
+            labeled_marker_record = None
+        sections.append(DecodeSection("labeled_markers", "labeled_marker_data", labeled_marker_decoder, labeled_marker_header, labeled_marker_record)) #type: ignore  # noqa E501
 
-        # Force Plate Data
-        rel_offset, force_plate_data = self.__unpack_force_plate_data(data[offset:], (packet_size - offset), major, minor) #type: ignore  # noqa E501
-        offset += rel_offset
-        mocap_data.set_force_plate_data(force_plate_data)
+        # Force Plate Data (Version 2.9 and later)
+        force_plate_header = header
+        if ((major == 2 and minor >= 9) or major > 2):
+            force_plate_decoder = partial(self.__unpack_force_plate_data, header=header) #type: ignore  # noqa E501
+        else:
+            force_plate_decoder = partial(self.__unpack_empty_section, container=MoCapData.ForcePlateData) #type: ignore  # noqa E501
+            force_plate_header = None
+        sections.append(DecodeSection("force_plates", "force_plate_data", force_plate_decoder, force_plate_header)) #type: ignore  # noqa E501
 
-        # Device Data
-        rel_offset, device_data = self.__unpack_device_data(data[offset:], (packet_size - offset), major, minor) #type: ignore  # noqa E501
-        offset += rel_offset
-        mocap_data.set_device_data(device_data)
+        # Device Data (Version 2.11 and later)
+        device_header = header
+        if (major == 2 and minor >= 11) or (major > 2):
+            device_decoder = partial(self.__unpack_device_data, header=header)
+        else:
+            device_decoder = partial(self.__unpack_empty_section, container=MoCapData.DeviceData) #type: ignore  # noqa E501
+            device_header = None
+        sections.append(DecodeSection("devices", "device_data", device_decoder, device_header)) #type: ignore  # noqa E501
 
         # Frame Suffix Data
-        # rel_offset, timecode, timecode_sub, timestamp, is_recording, tracked_models_changed = #type: ignore  # noqa E501
-        rel_offset, frame_suffix_data = self.__unpack_frame_suffix_data(data[offset:], (packet_size - offset), major, minor) #type: ignore  # noqa E501
-        offset += rel_offset
-        mocap_data.set_suffix_data(frame_suffix_data)
+        sections.append(DecodeSection("suffix", "suffix_data", partial(self.__unpack_frame_suffix_data, unpack_timestamps=self.__select_frame_suffix_unpacker(major, minor)))) #type: ignore  # noqa E501
+
+        if self.decode_sections is not None:
+            skippers = get_section_skippers(major, minor)
+            for section in sections:
+                if section.name == "prefix" or section.name in self.decode_sections: #type: ignore  # noqa E501
+                    continue
+                if section.header is None:
+                    section.decoder = partial(self.__skip_section, skip=skip_empty_section) #type: ignore  # noqa E501
+                else:
+                    section.decoder = partial(self.__skip_section, skip=skippers[section.name]) #type: ignore  # noqa E501
+                section.skipped = True
 
+        self.__decode_plan = DecodePlan(major, minor, sections)
+        if trace_sink is not None:
+            trace(self.__decode_plan.get_as_string())
+
+    # Unpack data from a motion capture frame message
+    def __unpack_mocap_data(self, data: bytes, packet_size, buffer_lease=None): #type: ignore  # noqa E501
+        mocap_data = MoCapData.MoCapData()
+        data = memoryview(data)
+        offset = 0
+        # Sections in stream order, specialized for the requested version
+        for section in self.__decode_plan.sections:
+            rel_offset, section_data = section.decoder(data[offset:], (packet_size - offset)) #type: ignore  # noqa E501
+            offset += rel_offset
+            setattr(mocap_data, section.attr_name, section_data)
+
+        # Sections skipped by set_decode_sections are None and count as empty
+        frame_number = mocap_data.prefix_data.frame_number
+        marker_set_count = 0
+        unlabeled_markers_count = 0
+        if mocap_data.marker_set_data is not None:
+            marker_set_count = mocap_data.marker_set_data.get_marker_set_count() #type: ignore  # noqa E501
+            unlabeled_markers_count = mocap_data.marker_set_data.get_unlabeled_marker_count() #type: ignore  # noqa E501
+        rigid_body_count = 0
+        if mocap_data.rigid_body_data is not None:
+            rigid_body_count = mocap_data.rigid_body_data.get_rigid_body_count() #type: ignore  # noqa E501
+        skeleton_count = 0
+        if mocap_data.skeleton_data is not None:
+            skeleton_count = mocap_data.skeleton_data.get_skeleton_count()
+        asset_count = 0
+        if mocap_data.asset_data is not None:
+            asset_count = mocap_data.asset_data.get_asset_count()
+        labeled_marker_count = 0
+        if mocap_data.labeled_marker_data is not None:
+            labeled_marker_count = mocap_data.labeled_marker_data.get_labeled_marker_count() #type: ignore  # noqa E501
+
+        frame_suffix_data = mocap_data.suffix_data
+        if frame_suffix_data is None:
+            frame_suffix_data = MoCapData.FrameSuffixData()
         timecode = frame_suffix_data.timecode
         timecode_sub = frame_suffix_data.timecode_sub
         timestamp = frame_suffix_data.timestamp
@@ -1115,8 +1447,17 @@ class NatNetClient:
             data_dict["tracked_models_changed"] = tracked_models_changed
             data_dict["offset"] = offset
             data_dict["mocap_data"] = mocap_data
+            # Array decoded data views the receive buffer: retain the lease
+            # to keep it past this call
+            data_dict["buffer_lease"] = buffer_lease
             self.new_frame_with_data_listener(data_dict)
 
+        frame_batch = self.__frame_batch
+        if frame_batch is not None and frame_batch.append(mocap_data):
+            for batch_sink in self.batch_sinks:
+                batch_sink(frame_batch)
+            frame_batch.reset()
+
         return offset, mocap_data
 
     def __unpack_marker_set_description(self, data, major, minor):
@@ -1127,17 +1468,17 @@ class NatNetClient:
 
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
-        trace_dd("Markerset Name: %s" % (name.decode('utf-8')))
+        trace_dd("Markerset Name: %s", name.decode('utf-8'))
         ms_desc.set_name(name)
 
         marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("Marker Count: %3.1d" % marker_count)
+        trace_dd("Marker Count: %3.1d", marker_count)
         if (marker_count > 0):
             for i in range(0, marker_count):
                 name, separator, remainder = bytes(data[offset:]).partition(b'\0') #type: ignore  # noqa E501
                 offset += len(name) + 1
-                trace_dd("\t%2.1d Marker Name: %s" % (i, name.decode('utf-8')))
+                trace_dd("\t%2.1d Marker Name: %s", i, name.decode('utf-8'))
                 ms_desc.add_marker_name(name)
 
         return offset, ms_desc
@@ -1150,36 +1491,36 @@ class NatNetClient:
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
         rb_desc.set_name(name)
-        trace_dd("\tRigid Body Name  : ", name.decode('utf-8'))
+        trace_dd("\tRigid Body Name  : %s", name.decode('utf-8'))
 
         # ID
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_id(new_id)
-        trace_dd("\tRigid Body ID      : ", str(new_id))
+        trace_dd("\tRigid Body ID      : %s", new_id)
 
         # Parent ID
         parent_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_parent_id(parent_id)
-        trace_dd("\tParent ID        : ", parent_id)
+        trace_dd("\tParent ID        : %s", parent_id)
 
         # Position Offsets
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
         rb_desc.set_pos(pos[0], pos[1], pos[2])
 
-        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
         quat = Quaternion.unpack(data[offset:offset+16])
         offset += 16
         rb_desc.set_rot(quat[0], quat[1], quat[2], quat[3])
-        trace_dd("\tRotation         : [%3.2f, %3.2f, %3.2f, %3.2f]" % (quat[0], quat[1], quat[2], quat[3])) #type: ignore  # noqa E501
+        trace_dd("\tRotation         : [%3.2f, %3.2f, %3.2f, %3.2f]", quat[0], quat[1], quat[2], quat[3]) #type: ignore  # noqa E501
 
         # Marker Count
         marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tNumber of Markers: ", marker_count)
+        trace_dd("\tNumber of Markers: %s", marker_count)
         if marker_count > 0:
             trace_dd("\tMarker Positions: ")
         marker_count_range = range(0, marker_count)
@@ -1203,13 +1544,10 @@ class NatNetClient:
 
             rb_marker = DataDescriptions.RBMarker(marker_name, active_label, marker_offset) #type: ignore  # noqa E501
             rb_desc.add_rb_marker(rb_marker)
-            trace_dd("\t%3.1d Marker Label: %s Position: [ %3.2f %3.2f %3.2f] %s" % (marker, active_label, #type: ignore  # noqa E501
-                                                                                        marker_offset[0], #type: ignore  # noqa E501
-                                                                                        marker_offset[1], #type: ignore  # noqa E501
-                                                                                        marker_offset[2], #type: ignore  # noqa E501
-                                                                                        marker_name)) #type: ignore  # noqa E501
+            trace_dd("\t%3.1d Marker Label: %s Position: [ %3.2f %3.2f %3.2f] %s", marker, active_label,
+                     marker_offset[0], marker_offset[1], marker_offset[2], marker_name)
             offset = offset3
-        trace_dd("\tunpack_rigid_body_description processed bytes: ", offset)
+        trace_dd("\tunpack_rigid_body_description processed bytes: %s", offset)
         return offset, rb_desc
 
     def __unpack_rigid_body_descript_4_n_4_1(self, data):
@@ -1222,31 +1560,31 @@ class NatNetClient:
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
         rb_desc.set_name(name)
-        trace_dd("\tRigid Body Name  : ", name.decode('utf-8'))
+        trace_dd("\tRigid Body Name  : %s", name.decode('utf-8'))
 
         # ID
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_id(new_id)
-        trace_dd("\tRigid Body ID      : ", str(new_id))
+        trace_dd("\tRigid Body ID      : %s", new_id)
 
         # Parent ID
         parent_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_parent_id(parent_id)
-        trace_dd("\tParent ID        : ", parent_id)
+        trace_dd("\tParent ID        : %s", parent_id)
 
         # Position Offsets
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
         rb_desc.set_pos(pos[0], pos[1], pos[2])
 
-        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
         # Marker Count
         marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tNumber of Markers: ", marker_count)
+        trace_dd("\tNumber of Markers: %s", marker_count)
         if marker_count > 0:
             trace_dd("\tMarker Positions: ")
         marker_count_range = range(0, marker_count)
@@ -1270,14 +1608,11 @@ class NatNetClient:
 
             rb_marker = DataDescriptions.RBMarker(marker_name, active_label, marker_offset) #type: ignore  # noqa E501
             rb_desc.add_rb_marker(rb_marker)
-            trace_dd("\t%3.1d Marker Label: %s Position: [ %3.2f %3.2f %3.2f] %s" % (marker, active_label, #type: ignore  # noqa E501
-                                                                                        marker_offset[0], #type: ignore  # noqa E501
-                                                                                        marker_offset[1], #type: ignore  # noqa E501
-                                                                                        marker_offset[2], #type: ignore  # noqa E501
-                                                                                        marker_name)) #type: ignore  # noqa E501
+            trace_dd("\t%3.1d Marker Label: %s Position: [ %3.2f %3.2f %3.2f] %s", marker, active_label,
+                     marker_offset[0], marker_offset[1], marker_offset[2], marker_name)
             offset = offset3
 
-        trace_dd("\tunpack_rigid_body_description processed bytes: ", offset)
+        trace_dd("\tunpack_rigid_body_description processed bytes: %s", offset)
         return offset, rb_desc
 
     def __unpack_rigid_body_descript_3_to_4_0(self, data):
@@ -1289,31 +1624,31 @@ class NatNetClient:
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
         rb_desc.set_name(name)
-        trace_dd("\tRigid Body Name  : ", name.decode('utf-8'))
+        trace_dd("\tRigid Body Name  : %s", name.decode('utf-8'))
 
         # ID
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_id(new_id)
-        trace_dd("\tRigid Body ID      : ", str(new_id))
+        trace_dd("\tRigid Body ID      : %s", new_id)
 
         # Parent ID
         parent_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_parent_id(parent_id)
-        trace_dd("\tParent ID        : ", parent_id)
+        trace_dd("\tParent ID        : %s", parent_id)
 
         # Position Offsets
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
         rb_desc.set_pos(pos[0], pos[1], pos[2])
 
-        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
         # Marker Count
         marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tNumber of Markers: ", marker_count)
+        trace_dd("\tNumber of Markers: %s", marker_count)
         if marker_count > 0:
             trace_dd("\tMarker Positions: ")
         marker_count_range = range(0, marker_count)
@@ -1333,14 +1668,11 @@ class NatNetClient:
 
             rb_marker = DataDescriptions.RBMarker(marker_name, active_label, marker_offset) #type: ignore  # noqa E501
             rb_desc.add_rb_marker(rb_marker)
-            trace_dd("\t%3.1d Marker Label: %s Position: [ %3.2f %3.2f %3.2f] %s" % (marker, active_label, #type: ignore  # noqa E501
-                                                                                        marker_offset[0], #type: ignore  # noqa E501
-                                                                                        marker_offset[1], #type: ignore  # noqa E501
-                                                                                        marker_offset[2], #type: ignore  # noqa E501
-                                                                                        marker_name)) #type: ignore  # noqa E501
+            trace_dd("\t%3.1d Marker Label: %s Position: [ %3.2f %3.2f %3.2f] %s", marker, active_label,
+                     marker_offset[0], marker_offset[1], marker_offset[2], marker_name)
             offset = offset3
 
-        trace_dd("\tunpack_rigid_body_description processed bytes: ", offset)
+        trace_dd("\tunpack_rigid_body_description processed bytes: %s", offset)
         return offset, rb_desc
 
     def __unpack_rigid_body_descript_2_to_3(self, data):
@@ -1352,28 +1684,28 @@ class NatNetClient:
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
         rb_desc.set_name(name)
-        trace_dd("\tRigid Body Name  : ", name.decode('utf-8'))
+        trace_dd("\tRigid Body Name  : %s", name.decode('utf-8'))
 
         # ID
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_id(new_id)
-        trace_dd("\tRigid Body ID      : ", str(new_id))
+        trace_dd("\tRigid Body ID      : %s", new_id)
 
         # Parent ID
         parent_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_parent_id(parent_id)
-        trace_dd("\tParent ID        : ", parent_id)
+        trace_dd("\tParent ID        : %s", parent_id)
 
         # Position Offsets
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
         rb_desc.set_pos(pos[0], pos[1], pos[2])
 
-        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
-        trace_dd("\tunpack_rigid_body_description processed bytes: ", offset)
+        trace_dd("\tunpack_rigid_body_description processed bytes: %s", offset)
         return offset, rb_desc
 
     def __unpack_rigid_body_descript_under_2(self, data):
@@ -1385,22 +1717,22 @@ class NatNetClient:
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_id(new_id)
-        trace_dd("\tRigid Body ID      : ", str(new_id))
+        trace_dd("\tRigid Body ID      : %s", new_id)
 
         # Parent ID
         parent_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_parent_id(parent_id)
-        trace_dd("\tParent ID        : ", parent_id)
+        trace_dd("\tParent ID        : %s", parent_id)
 
         # Position Offsets
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
         rb_desc.set_pos(pos[0], pos[1], pos[2])
 
-        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
-        trace_dd("\tunpack_rigid_body_description processed bytes: ", offset)
+        trace_dd("\tunpack_rigid_body_description processed bytes: %s", offset)
         return offset, rb_desc
 
     def __unpack_rigid_body_descript_0_case(self, data):
@@ -1411,35 +1743,35 @@ class NatNetClient:
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
         rb_desc.set_name(name)
-        trace_dd("\tRigid Body Name  : ", name.decode('utf-8'))
+        trace_dd("\tRigid Body Name  : %s", name.decode('utf-8'))
 
         # ID
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_id(new_id)
-        trace_dd("\tRigid Body ID      : ", str(new_id))
+        trace_dd("\tRigid Body ID      : %s", new_id)
 
         # Parent ID
         parent_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         rb_desc.set_parent_id(parent_id)
-        trace_dd("\tParent ID        : ", parent_id)
+        trace_dd("\tParent ID        : %s", parent_id)
 
         # Position Offsets
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
         rb_desc.set_pos(pos[0], pos[1], pos[2])
 
-        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_dd("\tPosition         : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
         quat = Quaternion.unpack(data[offset:offset+16])
         offset += 16
-        trace_dd("\tRotation         : [%3.2f, %3.2f, %3.2f, %3.2f]" % (quat[0], quat[1], quat[2], quat[3])) #type: ignore  # noqa E501
+        trace_dd("\tRotation         : [%3.2f, %3.2f, %3.2f, %3.2f]", quat[0], quat[1], quat[2], quat[3]) #type: ignore  # noqa E501
 
         # Marker Count
         marker_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tNumber of Markers: ", marker_count)
+        trace_dd("\tNumber of Markers: %s", marker_count)
         if marker_count > 0:
             trace_dd("\tMarker Positions: ")
         marker_count_range = range(0, marker_count)
@@ -1463,13 +1795,10 @@ class NatNetClient:
 
             rb_marker = DataDescriptions.RBMarker(marker_name, active_label, marker_offset) #type: ignore  # noqa E501
             rb_desc.add_rb_marker(rb_marker)
-            trace_dd("\t%3.1d Marker Label: %s Position: [ %3.2f %3.2f %3.2f] %s" % (marker, active_label, #type: ignore  # noqa E501
-                                                                                        marker_offset[0], #type: ignore  # noqa E501
-                                                                                        marker_offset[1], #type: ignore  # noqa E501
-                                                                                        marker_offset[2], #type: ignore  # noqa E501
-                                                                                        marker_name)) #type: ignore  # noqa E501
+            trace_dd("\t%3.1d Marker Label: %s Position: [ %3.2f %3.2f %3.2f] %s", marker, active_label,
+                     marker_offset[0], marker_offset[1], marker_offset[2], marker_name)
             offset = offset3
-        trace_dd("\tunpack_rigid_body_description processed bytes: ", offset)
+        trace_dd("\tunpack_rigid_body_description processed bytes: %s", offset)
         return offset, rb_desc
 
     def __unpack_rigid_body_description(self, data, major, minor):
@@ -1497,22 +1826,22 @@ class NatNetClient:
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
         skeleton_desc.set_name(name)
-        trace_dd("Name: %s" % name.decode('utf-8'))
+        trace_dd("Name: %s", name.decode('utf-8'))
 
         # ID
         new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
         skeleton_desc.set_id(new_id)
-        trace_dd("ID: %3.1d" % new_id)
+        trace_dd("ID: %3.1d", new_id)
 
         # # of RigidBodies
         rigid_body_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("Rigid Body (Bone) Count: %3.1d" % rigid_body_count)
+        trace_dd("Rigid Body (Bone) Count: %3.1d", rigid_body_count)
 
         # Loop over all Rigid Bodies
         for i in range(0, rigid_body_count):
-            trace_dd("Rigid Body (Bone) %d:" % (i))
+            trace_dd("Rigid Body (Bone) %d:", i)
             offset_tmp, rb_desc_tmp = self.__unpack_rigid_body_description(data[offset:], major, minor) #type: ignore  # noqa E501
             offset += offset_tmp
             skeleton_desc.add_rigid_body_description(rb_desc_tmp)
@@ -1527,28 +1856,28 @@ class NatNetClient:
             new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
             offset += 4
             fp_desc.set_id(new_id)
-            trace_dd("\tID: ", str(new_id))
+            trace_dd("\tID: %s", new_id)
 
             # Serial Number
             serial_number, separator, remainder = bytes(data[offset:]).partition(b'\0') #type: ignore  # noqa F401
             offset += len(serial_number) + 1
             fp_desc.set_serial_number(serial_number)
-            trace_dd("\tSerial Number: ", serial_number.decode('utf-8'))
+            trace_dd("\tSerial Number: %s", serial_number.decode('utf-8'))
 
             # Dimensions
             f_width = FloatValue.unpack(data[offset:offset+4])
             offset += 4
-            trace_dd("\tWidth : %3.2f" % f_width)
+            trace_dd("\tWidth : %3.2f", f_width)
             f_length = FloatValue.unpack(data[offset:offset+4])
             offset += 4
             fp_desc.set_dimensions(f_width[0], f_length[0])
-            trace_dd("\tLength: %3.2f" % f_length)
+            trace_dd("\tLength: %3.2f", f_length)
 
             # Origin
             origin = Vector3.unpack(data[offset:offset+12])
             offset += 12
             fp_desc.set_origin(origin[0], origin[1], origin[2])
-            trace_dd("\tOrigin: [%3.2f, %3.2f, %3.2f]" % (origin[0], origin[1], origin[2])) #type: ignore  # noqa E501
+            trace_dd("\tOrigin: [%3.2f, %3.2f, %3.2f]", origin[0], origin[1], origin[2]) #type: ignore  # noqa E501
 
             # Calibration Matrix 12x12 floats
             trace_dd("Cal Matrix:")
@@ -1556,10 +1885,7 @@ class NatNetClient:
 
             for i in range(0, 12):
                 cal_matrix_row = FPCalMatrixRow.unpack(data[offset:offset+(12 * 4)]) #type: ignore  # noqa E501
-                trace_dd("\t%3.1d %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e" % (i #type: ignore  # noqa E501
-                      , cal_matrix_row[0], cal_matrix_row[1], cal_matrix_row[2], cal_matrix_row[3] #type: ignore  # noqa E501
-                      , cal_matrix_row[4], cal_matrix_row[5], cal_matrix_row[6], cal_matrix_row[7] #type: ignore  # noqa E501
-                      , cal_matrix_row[8], cal_matrix_row[9], cal_matrix_row[10], cal_matrix_row[11])) #type: ignore  # noqa E501
+                trace_dd("\t%3.1d %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e %3.3e", i, *cal_matrix_row) #type: ignore  # noqa E501
                 cal_matrix_tmp[i] = copy.deepcopy(cal_matrix_row)
                 offset += (12*4)
             fp_desc.set_cal_matrix(cal_matrix_tmp)
@@ -1570,7 +1896,7 @@ class NatNetClient:
             trace_dd("Corners:")
             corners_tmp = [[0.0 for col in range(3)] for row in range(4)]
             for i in range(0, 4):
-                trace_dd("\t%3.1d %3.3e %3.3e %3.3e" % (i, corners[o_2], corners[o_2+1], corners[o_2+2])) #type: ignore  # noqa E501
+                trace_dd("\t%3.1d %3.3e %3.3e %3.3e", i, corners[o_2], corners[o_2+1], corners[o_2+2]) #type: ignore  # noqa E501
                 corners_tmp[i][0] = corners[o_2]
                 corners_tmp[i][1] = corners[o_2+1]
                 corners_tmp[i][2] = corners[o_2+2]
@@ -1581,27 +1907,27 @@ class NatNetClient:
             plate_type = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
             offset += 4
             fp_desc.set_plate_type(plate_type)
-            trace_dd("Plate Type: ", plate_type)
+            trace_dd("Plate Type: %s", plate_type)
 
             # Channel Data Type int
             channel_data_type = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
             offset += 4
             fp_desc.set_channel_data_type(channel_data_type)
-            trace_dd("Channel Data Type: ", channel_data_type)
+            trace_dd("Channel Data Type: %s", channel_data_type)
 
             # Number of Channels int
             num_channels = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
             offset += 4
-            trace_dd("Number of Channels: ", num_channels)
+            trace_dd("Number of Channels: %s", num_channels)
 
             # Channel Names list of NoC strings
             for i in range(0, num_channels):
                 channel_name, separator, remainder = bytes(data[offset:]).partition(b'\0') #type: ignore  # noqa E501
                 offset += len(channel_name) + 1
-                trace_dd("\tChannel Name %3.1d: %s" % (i, channel_name.decode('utf-8'))) #type: ignore  # noqa E501
+                trace_dd("\tChannel Name %3.1d: %s", i, channel_name.decode('utf-8')) #type: ignore  # noqa E501
                 fp_desc.add_channel_name(channel_name)
 
-        trace_dd("unpackForcePlate processed ", offset, " bytes")
+        trace_dd("unpackForcePlate processed %s bytes", offset)
         return offset, fp_desc
 
     def __unpack_device_description(self, data, major, minor):
@@ -1611,43 +1937,43 @@ class NatNetClient:
             # new_id
             new_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
             offset += 4
-            trace_dd("\tID: ", str(new_id))
+            trace_dd("\tID: %s", new_id)
 
             # Name
             name, separator, remainder = bytes(data[offset:]).partition(b'\0')
             offset += len(name) + 1
-            trace_dd("\tName: ", name.decode('utf-8'))
+            trace_dd("\tName: %s", name.decode('utf-8'))
 
             # Serial Number
             serial_number, separator, remainder = bytes(data[offset:]).partition(b'\0') #type: ignore  # noqa E501
             offset += len(serial_number) + 1
-            trace_dd("\tSerial Number: ", serial_number.decode('utf-8'))
+            trace_dd("\tSerial Number: %s", serial_number.decode('utf-8'))
 
             # Device Type int
             device_type = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
             offset += 4
-            trace_dd("Device Type: ", device_type)
+            trace_dd("Device Type: %s", device_type)
 
             # Channel Data Type int
             channel_data_type = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
             offset += 4
-            trace_dd("Channel Data Type: ", channel_data_type)
+            trace_dd("Channel Data Type: %s", channel_data_type)
 
             device_desc = DataDescriptions.DeviceDescription(new_id, name, serial_number, device_type, channel_data_type) #type: ignore  # noqa E501
 
             # Number of Channels int
             num_channels = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
             offset += 4
-            trace_dd("Number of Channels ", num_channels)
+            trace_dd("Number of Channels %s", num_channels)
 
             # Channel Names list of NoC strings
             for i in range(0, num_channels):
                 channel_name, separator, remainder = bytes(data[offset:]).partition(b'\0') #type: ignore  # noqa E501
                 offset += len(channel_name) + 1
                 device_desc.add_channel_name(channel_name)
-                trace_dd("\tChannel ", i, " Name: ", channel_name.decode('utf-8')) #type: ignore  # noqa E501
+                trace_dd("\tChannel %s Name: %s", i, channel_name.decode('utf-8')) #type: ignore  # noqa E501
 
-        trace_dd("unpack_device_description processed ", offset, " bytes")
+        trace_dd("unpack_device_description processed %s bytes", offset)
         return offset, device_desc
 
     def __unpack_camera_description(self, data, major, minor):
@@ -1655,17 +1981,17 @@ class NatNetClient:
         # Name
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
-        trace_dd("\tName      : %s" % name.decode('utf-8'))
+        trace_dd("\tName      : %s", name.decode('utf-8'))
         # Position
         position = Vector3.unpack(data[offset:offset+12])
         offset += 12
-        trace_dd("\tPosition  : [%3.2f, %3.2f, %3.2f]" % (position[0], position[1], position[2])) #type: ignore  # noqa E501
+        trace_dd("\tPosition  : [%3.2f, %3.2f, %3.2f]", position[0], position[1], position[2]) #type: ignore  # noqa E501
 
         # Orientation
         orientation = Quaternion.unpack(data[offset:offset+16])
         offset += 16
-        trace_dd("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]" % (orientation[0], orientation[1], orientation[2], orientation[3])) #type: ignore  # noqa E501
-        trace_dd("unpack_camera_description processed %3.1d bytes" % offset)
+        trace_dd("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]", orientation[0], orientation[1], orientation[2], orientation[3]) #type: ignore  # noqa E501
+        trace_dd("unpack_camera_description processed %3.1d bytes", offset)
 
         camera_desc = DataDescriptions.CameraDescription(name, position, orientation) #type: ignore  # noqa E501
         return offset, camera_desc
@@ -1676,114 +2002,108 @@ class NatNetClient:
         # Name
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
-        trace_dd("\tName      : %s" % name.decode('utf-8'))
+        trace_dd("\tName      : %s", name.decode('utf-8'))
 
         # ID
         marker_id = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tID        : %d" % (marker_id))
+        trace_dd("\tID        : %d", marker_id)
 
         # Initial Position
         initialPosition = Vector3.unpack(data[offset:offset+12])
         offset += 12
-        trace_dd("\tPosition  : [%3.2f, %3.2f, %3.2f]" % (initialPosition[0], initialPosition[1], initialPosition[2])) #type: ignore  # noqa E501
+        trace_dd("\tPosition  : [%3.2f, %3.2f, %3.2f]", initialPosition[0], initialPosition[1], initialPosition[2]) #type: ignore  # noqa E501
 
         # Size
         marker_size = FloatValue.unpack(data[offset:offset+4])
         offset += 4
-        trace_mf("\tMarker Size:", marker_size)
+        trace_mf("\tMarker Size:%s", marker_size)
 
         # Params
         marker_params, = struct.unpack('h', data[offset:offset+2])
         offset += 2
-        trace_mf("\tParams    :", marker_params)
+        trace_mf("\tParams    :%s", marker_params)
 
-        trace_dd("\tunpack_marker_description processed %3.1d bytes" % offset)
+        trace_dd("\tunpack_marker_description processed %3.1d bytes", offset)
 
         # Package for return object
         marker_desc = DataDescriptions.MarkerDescription(name, marker_id, initialPosition, marker_size, marker_params) #type: ignore  # noqa E501
         return offset, marker_desc
 
-    def __unpack_asset_rigid_body_data(self, data, major, minor):
+    def __unpack_asset_rigid_body_data(self, data):
         offset = 0
         # ID
         rbID = int.from_bytes(data[offset:offset+4], 'little',  signed=True)
         offset += 4
-        trace_dd("\tID        : %d" % (rbID))
+        trace_dd("\tID        : %d", rbID)
 
         # Position: x,y,z
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
-        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
         # Orientation: qx, qy, qz, qw
         rot = Quaternion.unpack(data[offset:offset+16])
         offset += 16
-        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]" % (rot[0], rot[1], rot[2], rot[3])) #type: ignore  # noqa E501
+        trace_mf("\tOrientation: [%3.2f, %3.2f, %3.2f, %3.2f]", rot[0], rot[1], rot[2], rot[3]) #type: ignore  # noqa E501
 
         # Mean error
         mean_error, = FloatValue.unpack(data[offset:offset+4])
         offset += 4
-        trace_mf("\tMean Error : %3.2f" % mean_error)
+        trace_mf("\tMean Error : %3.2f", mean_error)
 
         # Params
         marker_params, = struct.unpack('h', data[offset:offset+2])
         offset += 2
-        trace_mf("\tParams     :", marker_params)
+        trace_mf("\tParams     :%s", marker_params)
 
-        trace_dd("unpack_marker_description processed %3.1d bytes" % offset)
+        trace_dd("unpack_marker_description processed %3.1d bytes", offset)
         # Package for return object
         rigid_body_data = MoCapData.AssetRigidBodyData(rbID, pos, rot, mean_error, marker_params) #type: ignore  # noqa E501
 
         return offset, rigid_body_data
 
-    def __unpack_asset_marker_data(self, data, major, minor):
+    def __unpack_asset_marker_data(self, data):
         offset = 0
         # ID
         marker_id = int.from_bytes(data[offset:offset+4], 'little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tID         : %d" % (marker_id))
+        trace_dd("\tID         : %d", marker_id)
 
         # Position: x,y,z
         pos = Vector3.unpack(data[offset:offset+12])
         offset += 12
-        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]" % (pos[0], pos[1], pos[2])) #type: ignore  # noqa E501
+        trace_mf("\tPosition   : [%3.2f, %3.2f, %3.2f]", pos[0], pos[1], pos[2]) #type: ignore  # noqa E501
 
         # Size
         marker_size, = FloatValue.unpack(data[offset:offset+4])
         offset += 4
-        trace_mf("\tMarker Size: %3.2f" % marker_size)
+        trace_mf("\tMarker Size: %3.2f", marker_size)
 
         # Params
         marker_params, = struct.unpack('h', data[offset:offset+2])
         offset += 2
-        trace_mf("\tParams     :", marker_params)
+        trace_mf("\tParams     :%s", marker_params)
 
         # Residual
         residual, = FloatValue.unpack(data[offset:offset+4])
         offset += 4
-        trace_mf("\tResidual   : %3.2f" % residual)
+        trace_mf("\tResidual   : %3.2f", residual)
 
         marker_data = MoCapData.AssetMarkerData(marker_id, pos, marker_size, marker_params, residual) #type: ignore  # noqa E501
         return offset, marker_data
 
-    def __unpack_asset_data(self, data, packet_size, major, minor):
+    def __unpack_asset_data(self, data, packet_size, header):
         asset_data = MoCapData.AssetData()
 
-        offset = 0
-
-        # Asset Count
-        asset_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
-        offset += 4
-        trace_mf("Asset Count:", asset_count)
-
-        # Get data size (4 bytes)
-        offset_tmp, unpackedDataSize = self.__unpack_data_size(data[offset:], major, minor) #type: ignore  # noqa E501
-        offset += offset_tmp
+        # Asset count (4 bytes) and data size (4 bytes)
+        asset_count = header.unpack_from(data, 0)[0]
+        offset = header.size
+        trace_mf("Asset Count:%s", asset_count)
 
         # Unpack assets
         for asset_num in range(0, asset_count):
-            rel_offset, asset = self.__unpack_asset(data[offset:], major, minor, asset_num) #type: ignore  # noqa E501
+            rel_offset, asset = self.__unpack_asset(data[offset:], asset_num) #type: ignore  # noqa E501
             offset += rel_offset
             asset_data.add_asset(asset)
 
@@ -1795,43 +2115,43 @@ class NatNetClient:
         # Name
         name, separator, remainder = bytes(data[offset:]).partition(b'\0')
         offset += len(name) + 1
-        trace_dd("\tName      : %s" % name.decode('utf-8'))
+        trace_dd("\tName      : %s", name.decode('utf-8'))
 
         # Asset Type 4 bytes
         assetType = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tType      : %d" % (assetType))
+        trace_dd("\tType      : %d", assetType)
 
         # ID 4 bytes
         assetID = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tID        : %d" % (assetID))
+        trace_dd("\tID        : %d", assetID)
 
         # # of RigidBodies
         numRBs = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tRigid Body (Bone) Count: %d" % (numRBs))
+        trace_dd("\tRigid Body (Bone) Count: %d", numRBs)
         rigidbodyArray = []
         offset1 = 0
         for rbNum in range(numRBs):
             # # of RigidBodies
-            trace_dd("\tRigid Body (Bone) %d:" % (rbNum))
+            trace_dd("\tRigid Body (Bone) %d:", rbNum)
             offset1, rigidbody = self.__unpack_rigid_body_description(data[offset:], major, minor) #type: ignore  # noqa E501
             offset += offset1
             rigidbodyArray.append(rigidbody)
         # # of Markers
         numMarkers = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("\tMarker Count: %d" % (numMarkers))
+        trace_dd("\tMarker Count: %d", numMarkers)
         markerArray = []
         for markerNum in range(numMarkers):
             # # of Markers
-            trace_dd("\tMarker %d:" % (markerNum))
+            trace_dd("\tMarker %d:", markerNum)
             offset1, marker = self.__unpack_marker_description(data[offset:], major, minor) #type: ignore  # noqa E501
             offset += offset1
             markerArray.append(marker)
 
-        trace_dd("\tunpack_asset_description processed %3.1d bytes" % offset)
+        trace_dd("\tunpack_asset_description processed %3.1d bytes", offset)
 
         # package for output
         asset_desc = DataDescriptions.AssetDescription(name, assetType, assetID, rigidbodyArray, markerArray) #type: ignore  # noqa E501
@@ -1844,9 +2164,9 @@ class NatNetClient:
         # # of data sets to process
         dataset_count = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
         offset += 4
-        trace_dd("Dataset Count: ", str(dataset_count))
+        trace_dd("Dataset Count: %s", dataset_count)
         for i in range(0, dataset_count):
-            trace_dd("Dataset ", str(i))
+            trace_dd("Dataset %s", i)
             data_type = int.from_bytes(data[offset:offset+4], byteorder='little', signed=True) #type: ignore  # noqa E501
             offset += 4
             if ((major == 4) and (minor >= 1)) or (major > 4):
@@ -1883,8 +2203,8 @@ class NatNetClient:
                 return offset
             offset += offset_tmp
             data_descs.add_data(data_tmp)
-            trace_dd("\t" + str(i+1) + " datasets processed of " + str(dataset_count)) #type: ignore  # noqa E501
-            trace_dd("\t " + str(offset) + " bytes processed of " + str(packet_size)) #type: ignore  # noqa E501
+            trace_dd("\t%s datasets processed of %s", i+1, dataset_count) #type: ignore  # noqa E501
+            trace_dd("\t %s bytes processed of %s", offset, packet_size) #type: ignore  # noqa E501
 
         return offset, data_descs
 
@@ -1929,20 +2249,15 @@ class NatNetClient:
             self.__nat_net_requested_version[1] = self.__nat_net_stream_version_server[1] #type: ignore  # noqa E501
             self.__nat_net_requested_version[2] = self.__nat_net_stream_version_server[2] #type: ignore  # noqa E501
             self.__nat_net_requested_version[3] = self.__nat_net_stream_version_server[3] #type: ignore  # noqa E501
+            self.__build_decode_plan()
             # Determine if the bitstream version can be changed
             if (self.__nat_net_stream_version_server[0] >= 4) and (self.use_multicast is False): #type: ignore  # noqa E501
                 self.__can_change_bitstream_version = True
 
-        trace_mf("Sending Application Name: ", self.__application_name)
-        trace_mf("NatNetVersion ", str(self.__nat_net_stream_version_server[0]), " ", #type: ignore  # noqa E501
-                                   str(self.__nat_net_stream_version_server[1]), " ", #type: ignore  # noqa E501
-                                   str(self.__nat_net_stream_version_server[2]), " ", #type: ignore  # noqa E501
-                                   str(self.__nat_net_stream_version_server[3])) #type: ignore  # noqa E501
+        trace_mf("Sending Application Name: %s", self.__application_name)
+        trace_mf("NatNetVersion %s %s %s %s", *self.__nat_net_stream_version_server)
 
-        trace_mf("ServerVersion ", str(self.__server_version[0]), " " #type: ignore  # noqa E203
-                                 , str(self.__server_version[1]), " " #type: ignore  # noqa E203
-                                 , str(self.__server_version[2]), " " #type: ignore  # noqa E203
-                                 , str(self.__server_version[3]))
+        trace_mf("ServerVersion %s %s %s %s", *self.__server_version)
         return offset
 
     # __unpack_bitstream_info is for local use of the client
@@ -2018,12 +2333,13 @@ class NatNetClient:
 
     def __data_thread_function(self, in_socket, stop, gprint_level):
         message_id_dict = {}
-        data = bytearray(0)
-        # 64k buffer size
-        recv_buffer_size = 128*1024
+        buffer_pool = self.buffer_pool
+        packet_queue = self.__packet_queue
         while not stop():
+            # Datagrams land in pooled buffers and are decoded in place
+            buffer_lease = None
             try:
-                data, addr = in_socket.recvfrom(recv_buffer_size)
+                buffer_lease, addr = buffer_pool.recv_into(in_socket)
             except socket.timeout:
                 # Ce bloc sera exécuté si aucune donnée n'arrive après le délai
                 print("TimeOut: Aucune donnée reçue sur le socket de données (vérifiez Pare-feu/IP).")
@@ -2045,26 +2361,53 @@ class NatNetClient:
             except Exception as e:
                 print("ERROR: data socket access exception occurred: %s" % str(e)) #type: ignore  # noqa E501
                 # return 5
-            if len(data) > 0:
+            if buffer_lease is None:
+                continue
+            if packet_queue is not None:
+                # two-stage mode, the decode thread takes it from here
+                packet_queue.put(buffer_lease)
+            else:
+                self.__dispatch_packet(buffer_lease, message_id_dict, gprint_level) #type: ignore  # noqa E501
+
+        return 0
+
+    def __decode_thread_function(self, packet_queue, stop, gprint_level):
+        message_id_dict = {}
+        while True:
+            buffer_lease = packet_queue.get(timeout=0.5)
+            if buffer_lease is None:
+                if stop():
+                    break
+                continue
+            try:
+                self.__dispatch_packet(buffer_lease, message_id_dict, gprint_level) #type: ignore  # noqa E501
+            except Exception as e:
+                # a failing listener must not stop the decode thread, the
+                # receive thread would block on a full queue
+                print("ERROR: frame decode or listener exception occurred: %s" % str(e)) #type: ignore  # noqa E501
+        return 0
+
+    def __dispatch_packet(self, buffer_lease, message_id_dict, gprint_level):
+        """Decodes a received datagram and calls the listeners,
+        then releases its buffer, also when a listener raises"""
+        try:
+            if buffer_lease.size > 0:
+                data = buffer_lease.get_view()
                 # peek ahead at message_id
                 message_id = get_message_id(data)
-                tmp_str = "mi_%1.1d" % message_id
-                if tmp_str not in message_id_dict:
-                    message_id_dict[tmp_str] = 0
-                message_id_dict[tmp_str] += 1
+                message_id_dict[message_id] = message_id_dict.get(message_id, 0) + 1 #type: ignore  # noqa E501
                 print_level = gprint_level()
                 if message_id == self.NAT_FRAMEOFDATA:
                     if print_level > 0:
-                        if (message_id_dict[tmp_str] % print_level) == 0:
+                        if (message_id_dict[message_id] % print_level) == 0:
                             print_level = 1
                         else:
                             print_level = 0
-                message_id = self.__process_message(data, print_level)
-                data = bytearray(0)
-
-        return 0
+                self.__process_message(data, print_level, buffer_lease)
+        finally:
+            buffer_lease.release()
 
-    def __process_message(self, data: bytes, print_level=0):
+    def __process_message(self, data: bytes, print_level=0, buffer_lease=None): #type: ignore  # noqa E501
         # return message ID
         major = self.get_major()
         minor = self.get_minor()
@@ -2072,10 +2415,7 @@ class NatNetClient:
         trace("Begin Packet\n-----------------")
         show_nat_net_version = False
         if show_nat_net_version:
-            trace("NatNetVersion ", str(self.__nat_net_requested_version[0]), " " #type: ignore  # noqa E501
-                                  , str(self.__nat_net_requested_version[1]), " " #type: ignore  # noqa E501
-                                  , str(self.__nat_net_requested_version[2]), " " #type: ignore  # noqa E501
-                                  , str(self.__nat_net_requested_version[3]))
+            trace("NatNetVersion %s %s %s %s", *self.__nat_net_requested_version)
 
         message_id = get_message_id(data)
 
@@ -2084,10 +2424,10 @@ class NatNetClient:
         # skip the 4 bytes for message ID and packet_size
         offset = 4
         if message_id == self.NAT_FRAMEOFDATA:
-            trace("Message ID : %3.1d NAT_FRAMEOFDATA" % message_id)
-            trace("Packet Size: ", packet_size)
+            trace("Message ID : %3.1d NAT_FRAMEOFDATA", message_id)
+            trace("Packet Size: %s", packet_size)
 
-            offset_tmp, mocap_data = self.__unpack_mocap_data(data[offset:], packet_size, major, minor) #type: ignore  # noqa E501
+            offset_tmp, mocap_data = self.__unpack_mocap_data(data[offset:], packet_size, buffer_lease) #type: ignore  # noqa E501
             offset += offset_tmp
             # get a string version of the data for output
             if print_level >= 1:
@@ -2096,8 +2436,8 @@ class NatNetClient:
                 print(" %s\n" % mocap_data_str)
 
         elif message_id == self.NAT_MODELDEF:
-            trace("Message ID : %3.1d NAT_MODELDEF" % message_id)
-            trace("Packet Size: %d" % packet_size)
+            trace("Message ID : %3.1d NAT_MODELDEF", message_id)
+            trace("Packet Size: %d", packet_size)
             offset_tmp, data_descs = self.__unpack_data_descriptions(data[offset:], packet_size, major, minor) #type: ignore  # noqa E501
 
             # Custom Event to handle the data descriptions when they are received. T
@@ -2107,27 +2447,24 @@ class NatNetClient:
                 self.model_description_listener(data_descs)
 
             offset += offset_tmp
-            print("Data Descriptions:\n")
             # get a string version of the data for output
-            data_descs_str = data_descs.get_as_string()
             if print_level > 0:
+                print("Data Descriptions:\n")
+                data_descs_str = data_descs.get_as_string()
                 print(" %s\n" % (data_descs_str))
 
         elif message_id == self.NAT_SERVERINFO:
-            trace("Message ID : %3.1d NAT_SERVERINFO" % message_id)
-            trace("Packet Size: ", packet_size)
+            trace("Message ID : %3.1d NAT_SERVERINFO", message_id)
+            trace("Packet Size: %s", packet_size)
             offset += self.__unpack_server_info(data[offset:], packet_size, major, minor) #type: ignore  # noqa E501
 
         elif message_id == self.NAT_RESPONSE:
-            trace("Message ID : %3.1d NAT_RESPONSE" % message_id)
-            trace("Packet Size: ", packet_size)
+            trace("Message ID : %3.1d NAT_RESPONSE", message_id)
+            trace("Packet Size: %s", packet_size)
             if packet_size == 4:
                 command_response = int.from_bytes(data[offset:offset+4], byteorder='little',  signed=True) #type: ignore  # noqa E501
-                trace("Command response: %d - %d %d %d %d" % (command_response,
-                                                              data[offset],
-                                                              data[offset+1],
-                                                              data[offset+2],
-                                                              data[offset+3]))
+                trace("Command response: %d - %d %d %d %d", command_response,
+                      data[offset], data[offset+1], data[offset+2], data[offset+3])
                 offset += 4
             else:
                 show_remainder = False
@@ -2147,28 +2484,48 @@ class NatNetClient:
                 offset += len(message) + 1
 
                 if (show_remainder):
-                    trace("Command response:", message.decode('utf-8'),
-                          " separator:", separator, " remainder:", remainder)
+                    trace("Command response:%s separator:%s remainder:%s",
+                          message.decode('utf-8'), separator, remainder)
                 else:
-                    trace("Command response:", message.decode('utf-8'))
+                    trace("Command response:%s", message.decode('utf-8'))
         elif message_id == self.NAT_UNRECOGNIZED_REQUEST:
-            trace("Message ID : %3.1d NAT_UNRECOGNIZED_REQUEST: " % message_id)
-            trace("Packet Size: ", packet_size)
+            trace("Message ID : %3.1d NAT_UNRECOGNIZED_REQUEST: ", message_id)
+            trace("Packet Size: %s", packet_size)
             trace("Received 'Unrecognized request' from server")
         elif message_id == self.NAT_MESSAGESTRING:
-            trace("Message ID : %3.1d NAT_MESSAGESTRING" % message_id)
-            trace("Packet Size: ", packet_size)
+            trace("Message ID : %3.1d NAT_MESSAGESTRING", message_id)
+            trace("Packet Size: %s", packet_size)
             message, separator, remainder = bytes(data[offset:]).partition(b'\0') #type: ignore  # noqa E501
             offset += len(message) + 1
-            trace("Received message from server:", message.decode('utf-8'))
+            trace("Received message from server:%s", message.decode('utf-8'))
         else:
-            trace("Message ID : %3.1d UNKNOWN" % message_id)
-            trace("Packet Size: ", packet_size)
+            trace("Message ID : %3.1d UNKNOWN", message_id)
+            trace("Packet Size: %s", packet_size)
             trace("ERROR: Unrecognized packet type")
 
         trace("End Packet\n-----------------")
         return message_id
 
+    # Entry points for clients running their own receive loop, such as
+    # AsyncNatNetClient. Listeners are called as from the threads.
+    def process_message(self, data, print_level=0, buffer_lease=None):
+        """Decodes one packet of any type, returns its message id"""
+        return self.__process_message(data, print_level, buffer_lease)
+
+    def decode_frame(self, data, buffer_lease=None):
+        """Decodes a NAT_FRAMEOFDATA packet, returns its MoCapData"""
+        packet_size = int.from_bytes(data[2:4], byteorder='little', signed=True) #type: ignore  # noqa E501
+        offset, mocap_data = self.__unpack_mocap_data(data[4:], packet_size, buffer_lease) #type: ignore  # noqa E501
+        return mocap_data
+
+    def decode_model_def(self, data):
+        """Decodes a NAT_MODELDEF packet, returns its DataDescriptions"""
+        packet_size = int.from_bytes(data[2:4], byteorder='little', signed=True) #type: ignore  # noqa E501
+        offset, data_descs = self.__unpack_data_descriptions(data[4:], packet_size, self.get_major(), self.get_minor()) #type: ignore  # noqa E501
+        if self.model_description_listener is not None:
+            self.model_description_listener(data_descs)
+        return data_descs
+
     def send_request(self, in_socket, command, command_str, address):
         # Compose the message in our known message format
         packet_size = 0
@@ -2261,7 +2618,9 @@ class NatNetClient:
     def get_server_version(self):
         return self.__server_version
 
-    def run(self, thread_option):
+    def open_sockets(self):
+        """Creates the data and command sockets and locks the settings.
+        Returns False if either could not be opened."""
         # Create the data socket
         self.data_socket = self.__create_data_socket()
         if self.data_socket is None:
@@ -2274,16 +2633,25 @@ class NatNetClient:
             print("Could not open command channel")
             return False
         self.__is_locked = True
+        return True
+
+    def run(self, thread_option):
+        if not self.open_sockets():
+            return False
 
         self.stop_threads = False
 
         # Create a separate thread for receiving data packets
         self.data_thread = Thread(target=self.__data_thread_function, args=(self.data_socket, lambda: self.stop_threads, lambda: self.print_level,)) #type: ignore  # noqa E501
         self.command_thread = Thread(target=self.__command_thread_function, args=(self.command_socket, lambda: self.stop_threads, lambda: self.print_level, thread_option,)) #type: ignore  # noqa E501
+        if self.__packet_queue is not None:
+            self.decode_thread = Thread(target=self.__decode_thread_function, args=(self.__packet_queue, lambda: self.stop_threads, lambda: self.print_level,)) #type: ignore  # noqa E501
         if thread_option == 'd':
             print("starting data thread")
             self.command_thread.start()
             if self.command_thread.is_alive():
+                if self.decode_thread is not None:
+                    self.decode_thread.start()
                 self.data_thread.start()
 
         # Create a separate thread for receiving command packets
@@ -2306,10 +2674,28 @@ class NatNetClient:
         self.stop_threads = True
         # closing sockets causes blocking recvfrom to throw
         # an exception and break the loop
+        for in_socket in (self.command_socket, self.data_socket):
+            try:
+                # on Linux close alone leaves recvfrom blocked until the
+                # next datagram, shutdown wakes it up (and raises ENOTCONN
+                # on an unconnected UDP socket)
+                in_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
         self.command_socket.close()
         self.data_socket.close()
+        if self.__packet_queue is not None:
+            # wakes up a receive thread blocked on a full queue
+            self.__packet_queue.close()
         # attempt to join the threads back.
         if self.command_thread.is_alive():
             self.command_thread.join()
         if self.data_thread.is_alive():
             self.data_thread.join()
+        if self.decode_thread is not None:
+            # queued datagrams are dropped
+            self.__packet_queue.clear()
+            if self.decode_thread.is_alive():
+                self.decode_thread.join()
+        # frames still waiting in a partial batch
+        self.flush_frame_batch()
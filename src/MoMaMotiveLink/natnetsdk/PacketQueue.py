@@ -0,0 +1,104 @@
+# Bounded queue between the receive thread and the decode thread.
+#
+# The receive thread only timestamps datagrams and puts their buffer leases
+# here; the decode thread takes them out, decodes and calls the listeners.
+# When decoding falls behind, the policy decides what gives:
+#   block       - the receive thread waits for room (the kernel may drop)
+#   drop_oldest - the oldest queued datagram is dropped for the new one
+#   keep_latest - the decode thread only ever takes the newest datagram,
+#                 everything older is dropped
+
+import threading
+from collections import deque
+
+QUEUE_POLICY_BLOCK = "block"
+QUEUE_POLICY_DROP_OLDEST = "drop_oldest"
+QUEUE_POLICY_KEEP_LATEST = "keep_latest"
+QUEUE_POLICIES = (QUEUE_POLICY_BLOCK, QUEUE_POLICY_DROP_OLDEST,
+                  QUEUE_POLICY_KEEP_LATEST)
+
+
+class PacketQueue:
+    def __init__(self, capacity=64, policy=QUEUE_POLICY_DROP_OLDEST):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if policy not in QUEUE_POLICIES:
+            raise ValueError("Unknown queue policy: %s" % policy)
+        self.capacity = capacity
+        self.policy = policy
+        self.__queue = deque()
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+        self.__closed = False
+
+        # Counters
+        self.enqueued_count = 0
+        self.dequeued_count = 0
+        self.dropped_count = 0
+        self.max_depth = 0
+
+    def get_depth(self):
+        return len(self.__queue)
+
+    def get_stats(self):
+        with self.__lock:
+            return {
+                "policy": self.policy,
+                "capacity": self.capacity,
+                "depth": len(self.__queue),
+                "max_depth": self.max_depth,
+                "enqueued": self.enqueued_count,
+                "dequeued": self.dequeued_count,
+                "dropped": self.dropped_count,
+            }
+
+    def put(self, buffer_lease):
+        """Takes over the caller's reference on buffer_lease.
+        Returns False if the queue is closed, the lease is then released."""
+        with self.__lock:
+            if self.policy == QUEUE_POLICY_BLOCK:
+                while len(self.__queue) >= self.capacity and not self.__closed: #type: ignore  # noqa E501
+                    self.__not_full.wait()
+            elif len(self.__queue) >= self.capacity:
+                self.__queue.popleft().release()
+                self.dropped_count += 1
+            if self.__closed:
+                buffer_lease.release()
+                return False
+            self.__queue.append(buffer_lease)
+            self.enqueued_count += 1
+            if len(self.__queue) > self.max_depth:
+                self.max_depth = len(self.__queue)
+            self.__not_empty.notify()
+        return True
+
+    def get(self, timeout=None):
+        """Next buffer lease, owned by the caller, or None on timeout or
+        once closed and empty"""
+        with self.__lock:
+            if not self.__queue and not self.__closed:
+                self.__not_empty.wait(timeout)
+            if not self.__queue:
+                return None
+            if self.policy == QUEUE_POLICY_KEEP_LATEST:
+                while len(self.__queue) > 1:
+                    self.__queue.popleft().release()
+                    self.dropped_count += 1
+            buffer_lease = self.__queue.popleft()
+            self.dequeued_count += 1
+            self.__not_full.notify()
+        return buffer_lease
+
+    def close(self):
+        """Wakes up both threads, queued leases stay available to get"""
+        with self.__lock:
+            self.__closed = True
+            self.__not_empty.notify_all()
+            self.__not_full.notify_all()
+
+    def clear(self):
+        with self.__lock:
+            while self.__queue:
+                self.__queue.popleft().release()
+            self.__not_full.notify_all()
@@ -0,0 +1,56 @@
+"""Bone subsets and LOD streams: per-frame cost of the full skeleton, of
+the full skeleton plus subsets, and of the subsets alone
+(full_skeleton=False, only the bones their chains need are scattered and
+composed). Also checks subset matrices against the full skeleton.
+
+    python tests/benchmarks/bench_bone_subsets.py
+"""
+import numpy as np
+
+from MoMaMotiveLink.core import BoneSubset
+
+from bench_motive_link_frame import BONE_COUNT, decode_frames, make_link, time_frames
+from check_frame_allocations import frame_peak
+
+SUBSETS = [BoneSubset("extremities", ["Bone1", "Bone20", "Bone35", "Bone50"]),
+           BoneSubset("lod", ["Bone%d" % bone for bone in range(1, BONE_COUNT + 1, 3)])]
+
+
+def check(full, subsets, data_dicts):
+    for data_dict in data_dicts:
+        full.receive_frame_with_skeleton(data_dict)
+        subsets.receive_frame_with_skeleton(data_dict)
+    full, subsets = full.pose_pipeline, subsets.pose_pipeline
+    for stream, subset_stream in zip(full.subset_streams, subsets.subset_streams):
+        present = stream.bone_indices >= 0
+        # Mêmes matrices globales que le squelette complet
+        assert np.allclose(stream.world_matrices[present], full.world_matrices[stream.bone_indices[present]])
+        # Matrices locales relatives à l'ancêtre conservé
+        parents = stream.parent_indices
+        has_parent = parents >= 0
+        assert np.allclose(stream.world_matrices[parents[has_parent]] @ stream.matrices[has_parent],
+                           stream.world_matrices[has_parent])
+        assert np.allclose(subset_stream.matrices, stream.matrices)
+        assert np.allclose(subset_stream.world_matrices, stream.world_matrices)
+
+
+def main():
+    print("%6s %6s %12s %14s %14s %10s" % ("actors", "bones", "full us", "full+subsets us", "subsets us", "chain bones")) #type: ignore  # noqa E501
+    peaks = []
+    for actor_count in (1, 4, 10):
+        data_dicts = decode_frames(actor_count, True)
+        full = make_link(actor_count)
+        with_subsets = make_link(actor_count, bone_subsets=SUBSETS)
+        subsets_only = make_link(actor_count, bone_subsets=SUBSETS, full_skeleton=False)
+        check(with_subsets, subsets_only, data_dicts)
+        peaks.append(frame_peak(subsets_only, data_dicts))
+
+        chain_bones = len(subsets_only.pose_pipeline.subset_group.get_required_indices())
+        print("%6d %6d %12.1f %14.1f %14.1f %10d" % (
+            actor_count, full.skeleton_layout.bone_count, time_frames(full, data_dicts) * 1e6,
+            time_frames(with_subsets, data_dicts) * 1e6, time_frames(subsets_only, data_dicts) * 1e6, chain_bones)) #type: ignore  # noqa E501
+    assert peaks[-1] - peaks[0] < 1024, "subset frame allocations grow with the bone count"
+
+
+if __name__ == "__main__":
+    main()
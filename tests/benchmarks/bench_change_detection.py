@@ -0,0 +1,120 @@
+"""Change detection and delta publishing: per-frame cost and delta payload
+of a static scene, a low-motion scene (a few bones moving) and a full-motion
+scene, with and without change_epsilon. Checks that recomposing only the
+changed bones matches a full recomposition, also where the link falls back
+to the dense path, that deltas rebuild the full pose on the reader side, and
+that the sparse path does not allocate per frame.
+
+    python tests/benchmarks/bench_change_detection.py
+"""
+import random
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+
+from MoMaMotiveLink.core import POSE_REPRESENTATIONS
+
+from bench_motive_link_frame import decode_frames, make_link, time_frames
+from check_frame_allocations import frame_peak
+
+EPSILON = 1e-5
+SCENES = {"static": 0.0, "low motion": 0.05, "full motion": 1.0}
+RUNS = 5
+LINK_ARGS = {"representations": tuple(POSE_REPRESENTATIONS), "skinning_palette": "matrix"}
+
+
+def make_scene(data_dicts, moving_fraction, seed=0):
+    """Frames where only moving_fraction of the bones differ from the first frame"""
+    rng = random.Random(seed)
+    first = data_dicts[0]["mocap_data"].skeleton_data.skeleton_list
+    for data_dict in data_dicts[1:]:
+        for skeleton, first_skeleton in zip(data_dict["mocap_data"].skeleton_data.skeleton_list, first):
+            moving = np.array([rng.random() < moving_fraction for _ in skeleton.ids])[:, None]
+            skeleton.positions = np.where(moving, skeleton.positions, first_skeleton.positions)
+            skeleton.quaternions = np.where(moving, skeleton.quaternions, first_skeleton.quaternions)
+    return data_dicts
+
+
+def payload_bytes(delta):
+    return sum(values.nbytes + (0 if indices is None else indices.nbytes)
+               for indices, values in zip(delta.indices.values(), delta.arrays.values()))
+
+
+@contextmanager
+def sparse_compose():
+    """Links made inside recompose only the changed bones whatever their count, as large skeletons do"""
+    module = sys.modules["MoMaMotiveLink.core.PosePipeline"]
+    limits = module.SPARSE_COMPOSE_MIN_BONES, module.SPARSE_COMPOSE_MAX_FRACTION
+    module.SPARSE_COMPOSE_MIN_BONES, module.SPARSE_COMPOSE_MAX_FRACTION = 0, 1.0
+    try:
+        yield
+    finally:
+        module.SPARSE_COMPOSE_MIN_BONES, module.SPARSE_COMPOSE_MAX_FRACTION = limits
+
+
+def check(actor_count, data_dicts):
+    """Sparse recomposition and the dense fallback equal full recomposition"""
+    with sparse_compose():
+        check_link(make_link(actor_count, change_epsilon=0.0, delta_fraction=1.0, **LINK_ARGS), data_dicts)
+    check_link(make_link(actor_count, change_epsilon=0.0, **LINK_ARGS), data_dicts)
+
+
+def check_link(sparse, data_dicts):
+    """Same pose as a link without change detection, deltas rebuild the published pose"""
+    full = make_link(sparse.skeleton_layout.actor_count, **LINK_ARGS)
+    reader = sparse.new_delta_reader()
+    mirror = None
+    for data_dict in data_dicts:
+        full.receive_frame_with_skeleton(data_dict)
+        sparse.receive_frame_with_skeleton(data_dict)
+        for name in ("matrices", "affines", "pos_quats", "dual_quats", "world_matrices", "skinning_palette"):
+            assert np.array_equal(full.get_latest_pose()[name], sparse.get_latest_pose()[name]), name
+        delta = sparse.get_latest_delta(reader)
+        if mirror is None:
+            assert delta.is_full()
+            mirror = {name: values.copy() for name, values in delta.arrays.items()}
+        for name, values in delta.arrays.items():
+            if delta.indices[name] is None:
+                mirror[name][...] = values
+            else:
+                mirror[name][delta.indices[name]] = values
+        for name, values in mirror.items():
+            assert np.array_equal(values, delta.snapshot[name]), name
+
+
+def main():
+    print("%6s %12s %10s %12s %12s %12s %12s" % ("actors", "scene", "changed", "full us", "epsilon us",
+                                                 "full B", "delta B"))
+    peaks = []
+    for actor_count in (1, 4, 10):
+        for scene, moving_fraction in SCENES.items():
+            data_dicts = make_scene(decode_frames(actor_count, True), moving_fraction)
+            check(actor_count, data_dicts)
+            full = make_link(actor_count, **LINK_ARGS)
+            detecting = make_link(actor_count, change_epsilon=EPSILON, **LINK_ARGS)
+            # best of alternating passes, both links see the same machine load
+            full_time, detecting_time = float("inf"), float("inf")
+            for _ in range(RUNS):
+                full_time = min(full_time, time_frames(full, data_dicts, repeat=10))
+                detecting_time = min(detecting_time, time_frames(detecting, data_dicts, repeat=10))
+
+            reader = detecting.new_delta_reader()
+            detecting.receive_frame_with_skeleton(data_dicts[0])
+            full_bytes = payload_bytes(detecting.get_latest_delta(reader))
+            detecting.receive_frame_with_skeleton(data_dicts[1])
+            delta_bytes = payload_bytes(detecting.get_latest_delta(reader))
+            print("%6d %12s %10d %12.1f %12.1f %12d %12d" % (
+                actor_count, scene, detecting.pose_pipeline.changed_bone_count, full_time * 1e6,
+                detecting_time * 1e6, full_bytes, delta_bytes))
+            if scene == "low motion":
+                with sparse_compose():
+                    sparse = make_link(actor_count, change_epsilon=EPSILON, **LINK_ARGS)
+                # the first traced pass still warms up NumPy caches
+                frame_peak(sparse, data_dicts)
+                peaks.append(frame_peak(sparse, data_dicts))
+    assert peaks[-1] - peaks[0] < 1024, "sparse recomposition frame allocations grow with the bone count"
+
+
+if __name__ == "__main__":
+    main()
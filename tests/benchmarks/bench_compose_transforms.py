@@ -0,0 +1,66 @@
+"""Cost of building every bone matrix of a frame: compose_transform per
+bone, as MotiveLink used to, against one compose_transforms call into
+preallocated buffers.
+
+    python tests/benchmarks/bench_compose_transforms.py
+"""
+import time
+
+import numpy as np
+
+from MoMaMotiveLink.core import Tools
+
+BONE_COUNTS = (21, 51, 500)
+REPEAT = 2000
+
+
+def make_bones(bone_count, seed=0):
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-2, 2, (bone_count, 3))
+    rotations = rng.normal(size=(bone_count, 4))
+    rotations /= np.linalg.norm(rotations, axis=1)[:, np.newaxis]
+    return positions, rotations
+
+
+def per_bone(positions, rotations):
+    matrices = []
+    for pos, rot in zip(positions.tolist(), rotations.tolist()):
+        position = np.array(pos) * 100
+        rotation = np.array(rot)
+        scale = np.array([1.0, 1.0, 1.0])
+        matrices.append(Tools.compose_transform(position, rotation, scale))
+    return np.array(matrices, dtype=np.float64)
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print("%6s %14s %14s %8s" % ("bones", "per bone us", "batched us", "speedup"))
+    for bone_count in BONE_COUNTS:
+        positions, rotations = make_bones(bone_count)
+        scales = np.ones((bone_count, 3))
+        frame_positions = np.empty_like(positions)
+        out = np.empty((bone_count, 4, 4))
+        work = np.empty((13, bone_count))
+
+        def batched():
+            np.multiply(positions, 100, out=frame_positions)
+            Tools.compose_transforms(frame_positions, rotations, scales, out=out, work=work) #type: ignore  # noqa E501
+
+        batched()
+        assert np.allclose(out, per_bone(positions, rotations))
+        repeat = max(REPEAT * 21 // bone_count, 50)
+        per_bone_time = timed(lambda: per_bone(positions, rotations), repeat)
+        batched_time = timed(batched, repeat)
+        print("%6d %14.1f %14.1f %7.1fx" % (
+            bone_count, per_bone_time * 1e6, batched_time * 1e6,
+            per_bone_time / batched_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Unit and axis conversion fused before composition, against converting
+the local and world matrices in a second pass as the engines did. Also
+checks both give the same matrices and rest pose.
+
+    python tests/benchmarks/bench_coordinate_conversion.py
+"""
+import time
+
+import numpy as np
+
+from MoMaMotiveLink.core import CoordinateConversion
+
+from bench_motive_link_frame import decode_frames, make_link, time_frames
+
+# Motive (m, Y up, right-handed) -> cm, Z up, left-handed
+ENGINE = CoordinateConversion(unit_scale=100.0, axes=("x", "-z", "y"), mirror_axis="y")
+REPEAT = 50
+
+
+def second_pass(link, data_dicts):
+    """receive_frame_with_skeleton in Motive units, then the conversion of every matrix"""
+    local_matrices, world_matrices = link.pose_pipeline.local_matrices, link.pose_pipeline.world_matrices
+    for data_dict in data_dicts:
+        link.receive_frame_with_skeleton(data_dict)
+        ENGINE.convert_matrices(local_matrices, out=local_matrices)
+        ENGINE.convert_matrices(world_matrices, out=world_matrices)
+
+
+def check(actor_count, data_dicts):
+    motive = make_link(actor_count, conversion=CoordinateConversion())
+    engine = make_link(actor_count, conversion=ENGINE)
+    for data_dict in data_dicts:
+        motive.receive_frame_with_skeleton(data_dict)
+        engine.receive_frame_with_skeleton(data_dict)
+    motive, engine = motive.pose_pipeline, engine.pose_pipeline
+    assert np.allclose(ENGINE.convert_matrices(motive.local_matrices), engine.local_matrices)
+    assert np.allclose(ENGINE.convert_matrices(motive.world_matrices), engine.world_matrices)
+    assert np.allclose(ENGINE.convert_positions(motive.rest_positions), engine.rest_positions)
+    assert np.allclose(ENGINE.convert_rotations(motive.rest_rotations), engine.rest_rotations)
+
+
+def timed(function, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print("%6s %6s %14s %14s %8s" % ("actors", "bones", "second pass us", "fused us", "speedup")) #type: ignore  # noqa E501
+    for actor_count in (1, 4, 10):
+        data_dicts = decode_frames(actor_count, True)
+        check(actor_count, data_dicts)
+        motive = make_link(actor_count, conversion=CoordinateConversion())
+        engine = make_link(actor_count, conversion=ENGINE)
+        second_pass_time = timed(lambda: second_pass(motive, data_dicts)) / len(data_dicts)
+        fused_time = time_frames(engine, data_dicts, repeat=REPEAT)
+        print("%6d %6d %14.1f %14.1f %7.1fx" % (actor_count, engine.skeleton_layout.bone_count,
+                                                second_pass_time * 1e6, fused_time * 1e6,
+                                                second_pass_time / fused_time))
+
+
+if __name__ == "__main__":
+    main()
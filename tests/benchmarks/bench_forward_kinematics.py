@@ -0,0 +1,70 @@
+"""World matrices from local matrices: a per-bone Python loop over the
+parents, as consumers used to do, against ForwardKinematics computing
+one batched matmul per depth level.
+
+    python tests/benchmarks/bench_forward_kinematics.py
+"""
+import time
+
+import numpy as np
+
+from MoMaMotiveLink.core import Tools
+from MoMaMotiveLink.core.ForwardKinematics import ForwardKinematics
+
+REPEAT = 500
+
+
+def make_tree(bone_count, depth_count, seed=0):
+    """Parent indices of bone_count bones over depth_count levels"""
+    rng = np.random.default_rng(seed)
+    depths = np.sort(np.concatenate([np.arange(depth_count),
+                                     rng.integers(1, depth_count, bone_count - depth_count)])) #type: ignore  # noqa E501
+    parents = np.full(bone_count, -1, dtype=np.int32)
+    for bone in range(1, bone_count):
+        candidates = np.flatnonzero(depths[:bone] == depths[bone] - 1)
+        parents[bone] = rng.choice(candidates)
+    return parents
+
+
+def per_bone(local_matrices, parents, out):
+    for bone in range(len(parents)):
+        parent = parents[bone]
+        if parent < 0:
+            out[bone] = local_matrices[bone]
+        else:
+            out[bone] = out[parent] @ local_matrices[bone]
+    return out
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print("%6s %6s %14s %14s %8s" % ("bones", "depth", "per bone us", "levels us", "speedup")) #type: ignore  # noqa E501
+    for bone_count, depth_count in ((21, 6), (51, 8), (51, 16), (500, 8), (500, 16)): #type: ignore  # noqa E501
+        parents = make_tree(bone_count, depth_count)
+        positions = rng.normal(size=(bone_count, 3))
+        rotations = rng.normal(size=(bone_count, 4))
+        rotations /= np.linalg.norm(rotations, axis=1)[:, np.newaxis]
+        local_matrices = Tools.compose_transforms(positions, rotations)
+        forward_kinematics = ForwardKinematics(parents)
+        reference = np.empty_like(local_matrices)
+        out = np.empty_like(local_matrices)
+
+        per_bone(local_matrices, parents, reference)
+        assert np.allclose(forward_kinematics.compute(local_matrices, out), reference) #type: ignore  # noqa E501
+        per_bone_time = timed(lambda: per_bone(local_matrices, parents, reference), REPEAT) #type: ignore  # noqa E501
+        levels_time = timed(lambda: forward_kinematics.compute(local_matrices, out), REPEAT) #type: ignore  # noqa E501
+        print("%6d %6d %14.1f %14.1f %7.1fx" % (
+            bone_count, forward_kinematics.get_depth_count(),
+            per_bone_time * 1e6, levels_time * 1e6,
+            per_bone_time / levels_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Per-frame time and peak allocations of the frame decoder, with and
+without the deep copies in the MoCapData container adders.
+
+    python tests/benchmarks/bench_frame_allocations.py
+"""
+import functools
+import time
+import tracemalloc
+
+from MoMaMotiveLink.natnetsdk import MoCapData
+from MoMaMotiveLink.natnetsdk.NatNetClient import NatNetClient
+
+from natnet_packets import make_frame, set_version
+
+FRAME_COUNT = 200
+
+
+def force_deep_copies():
+    """Makes every MoCapData adder deep copy, as it did before ownership
+    transfer became the default"""
+    for cls in vars(MoCapData).values():
+        if not isinstance(cls, type):
+            continue
+        for name, method in list(vars(cls).items()):
+            if name.startswith("add_") and "deep_copy" in method.__code__.co_varnames: #type: ignore  # noqa E501
+                setattr(cls, name, functools.partialmethod(method, deep_copy=True)) #type: ignore  # noqa E501
+
+
+def measure(packets):
+    client = NatNetClient()
+    client.set_print_level(0)
+    set_version(client, 4, 1)
+    process_message = client._NatNetClient__process_message
+
+    start = time.perf_counter()
+    for packet in packets:
+        process_message(packet)
+    elapsed = time.perf_counter() - start
+
+    # peak traced memory while decoding one frame
+    tracemalloc.start()
+    peak = 0
+    for packet in packets:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        process_message(packet)
+        peak += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return elapsed / len(packets), peak // len(packets)
+
+
+def main():
+    packets = [make_frame(i, 4, 1, actor_count=2, bone_count=51, seed=i)
+               for i in range(FRAME_COUNT)]
+    results = [("ownership transfer", measure(packets))]
+    force_deep_copies()
+    results.append(("deep copy", measure(packets)))
+    print("%-20s %10s %16s" % ("adders", "us/frame", "peak bytes/frame"))
+    for name, (per_frame, peak) in results:
+        print("%-20s %10.1f %16d" % (name, per_frame * 1e6, peak))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Bytes per retained frame for a 5-actor scene, slotted MoCapData classes
+against dict-backed copies of the same classes.
+
+    python tests/benchmarks/bench_frame_memory.py
+"""
+import tracemalloc
+
+from MoMaMotiveLink.natnetsdk import MoCapData
+from MoMaMotiveLink.natnetsdk.NatNetClient import NatNetClient
+
+from natnet_packets import make_frame, set_version
+
+ACTOR_COUNT = 5
+BONE_COUNT = 51
+FRAME_COUNT = 240
+
+
+def use_dict_backed_classes():
+    """Replaces the slotted MoCapData classes by copies without __slots__.
+    Only the object decode path is measured with them, the array classes
+    rely on super()."""
+    for name, cls in list(vars(MoCapData).items()):
+        if not isinstance(cls, type) or "__slots__" not in vars(cls):
+            continue
+        namespace = {key: value for key, value in vars(cls).items()
+                     if key != "__slots__" and key not in cls.__slots__}
+        setattr(MoCapData, name, type(name, cls.__bases__, namespace))
+
+
+def measure(packets, use_array_decode):
+    retained = []
+    client = NatNetClient()
+    client.set_print_level(0)
+    client.set_array_decode(use_array_decode)
+    set_version(client, 4, 1)
+    client.new_frame_with_data_listener = lambda data_dict: retained.append(data_dict["mocap_data"]) #type: ignore  # noqa E501
+    process_message = client._NatNetClient__process_message
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for packet in packets:
+        process_message(packet)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) // len(retained)
+
+
+def main():
+    packets = [make_frame(i, 4, 1, actor_count=ACTOR_COUNT,
+                          bone_count=BONE_COUNT, seed=i)
+               for i in range(FRAME_COUNT)]
+    results = [("slots", measure(packets, False)),
+               ("slots, arrays", measure(packets, True))]
+    use_dict_backed_classes()
+    results.append(("dict", measure(packets, False)))
+    print("%d actors x %d bones, %d frames retained" % (ACTOR_COUNT, BONE_COUNT, FRAME_COUNT)) #type: ignore  # noqa E501
+    print("%-16s %16s" % ("classes", "bytes/frame"))
+    for name, per_frame in results:
+        print("%-16s %16d" % (name, per_frame))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Per-frame cost of MotiveLink.receive_frame_with_skeleton against the
+number of actors, all actors being transformed in one pass. Frames are
+decoded once up front, only the MotiveLink stage is timed.
+
+    python tests/benchmarks/bench_motive_link_frame.py
+"""
+import io
+import random
+import time
+from contextlib import redirect_stdout
+
+from MoMaMotiveLink.core import MotiveLink
+from MoMaMotiveLink.natnetsdk import DataDescriptions
+from MoMaMotiveLink.natnetsdk.NatNetClient import NatNetClient
+
+from natnet_packets import make_frame, set_version
+
+BONE_COUNT = 51
+FRAME_COUNT = 16
+REPEAT = 50
+
+
+def make_descriptions(actor_count, bone_count, seed=0):
+    """Skeleton descriptions matching make_frame, random bone hierarchy"""
+    rng = random.Random(seed)
+    data_descs = DataDescriptions.DataDescriptions()
+    for actor in range(actor_count):
+        skeleton = DataDescriptions.SkeletonDescription(b"Actor%d" % (actor + 1), actor + 1) #type: ignore  # noqa E501
+        for bone in range(bone_count):
+            parent_id = 0 if bone == 0 else rng.randint(1, bone)
+            skeleton.add_rigid_body_description(DataDescriptions.RigidBodyDescription( #type: ignore  # noqa E501
+                b"Bone%d" % (bone + 1), bone + 1, parent_id, [0.0, 0.1, 0.0], [0.0, 0.0, 0.0, 1.0])) #type: ignore  # noqa E501
+        data_descs.add_skeleton(skeleton)
+    return data_descs
+
+
+def make_link(actor_count, bone_count=BONE_COUNT, **link_args):
+    link = MotiveLink(**link_args)
+    with redirect_stdout(io.StringIO()):
+        link.receive_model_descriptions(make_descriptions(actor_count, bone_count)) #type: ignore  # noqa E501
+    return link
+
+
+def decode_frames(actor_count, use_array_decode, bone_count=BONE_COUNT):
+    """data_dicts of FRAME_COUNT decoded frames, as the listener gets them"""
+    client = NatNetClient()
+    client.set_print_level(0)
+    client.set_array_decode(use_array_decode)
+    client.set_decode_sections({"skeletons", "suffix"})
+    set_version(client, 4, 1)
+    data_dicts = []
+    client.new_frame_with_data_listener = data_dicts.append
+    for i in range(FRAME_COUNT):
+        client.process_message(make_frame(i + 1, 4, 1, actor_count=actor_count,
+                                          bone_count=bone_count, seed=i))
+    return data_dicts
+
+
+def time_frames(link, data_dicts, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data_dict in data_dicts:
+            link.receive_frame_with_skeleton(data_dict)
+    return (time.perf_counter() - start) / (repeat * len(data_dicts))
+
+
+def main():
+    print("%6s %6s %14s %14s" % ("actors", "bones", "objects us", "arrays us"))
+    for actor_count in (1, 4, 10):
+        link = make_link(actor_count)
+        objects_time = time_frames(link, decode_frames(actor_count, False))
+        arrays_time = time_frames(link, decode_frames(actor_count, True))
+        print("%6d %6d %14.1f %14.1f" % (actor_count, actor_count * BONE_COUNT,
+                                         objects_time * 1e6, arrays_time * 1e6)) #type: ignore  # noqa E501
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Writer latency and reader throughput of PoseBuffer against the number
+of reader threads, next to a pose guarded by a lock. Readers also check
+that every snapshot is consistent (matrices, frame number and timestamp
+of the same frame).
+
+    python tests/benchmarks/bench_pose_buffer.py
+"""
+import threading
+import time
+
+import numpy as np
+
+from MoMaMotiveLink.core.PoseBuffer import PoseBuffer
+
+BONE_COUNT = 51
+DURATION = 1.0
+READER_COUNTS = (0, 1, 4, 16)
+
+
+class LockedPose:
+    """Reference: writer and readers share one pose under a lock"""
+
+    def __init__(self, layout):
+        self.lock = threading.Lock()
+        self.pose_buffer = PoseBuffer(layout)
+
+    def new_snapshot(self):
+        return self.pose_buffer.new_snapshot()
+
+    def write(self, arrays, frame_number, timestamp):
+        with self.lock:
+            self.pose_buffer.write(arrays, frame_number, timestamp)
+
+    def read(self, out=None):
+        with self.lock:
+            return self.pose_buffer.read(out)
+
+
+def run(pose, reader_count):
+    stop = threading.Event()
+    reads = [0] * reader_count
+    torn = [0] * reader_count
+
+    def reader(i):
+        snapshot = pose.new_snapshot()
+        while not stop.is_set():
+            pose.read(snapshot)
+            if snapshot.sequence == 0:
+                # nothing published yet
+                continue
+            matrices = snapshot["matrices"]
+            # every element holds the frame number it was written for
+            if matrices[0, 0, 0] != snapshot.frame_number or \
+               matrices[-1, 3, 3] != snapshot.frame_number or \
+               snapshot.timestamp != snapshot.frame_number:
+                torn[i] += 1
+            reads[i] += 1
+
+    readers = [threading.Thread(target=reader, args=(i,))
+               for i in range(reader_count)]
+    for thread in readers:
+        thread.start()
+
+    matrices = np.zeros((BONE_COUNT, 4, 4))
+    arrays = {"matrices": matrices}
+    latencies = []
+    frame_number = 0
+    end = time.perf_counter() + DURATION
+    while time.perf_counter() < end:
+        frame_number += 1
+        matrices.fill(frame_number)
+        start = time.perf_counter()
+        pose.write(arrays, frame_number, float(frame_number))
+        latencies.append(time.perf_counter() - start)
+
+    stop.set()
+    for thread in readers:
+        thread.join()
+    latencies = np.array(latencies) * 1e6
+    return (frame_number / DURATION, np.percentile(latencies, 50),
+            np.percentile(latencies, 99), sum(reads) / DURATION, sum(torn))
+
+
+def main():
+    layout = {"matrices": ((BONE_COUNT, 4, 4), np.float64)}
+    print("%-10s %8s %10s %10s %10s %12s %6s" % (
+        "pose", "readers", "writes/s", "p50 us", "p99 us", "reads/s", "torn"))
+    for name, factory in (("seqlock", PoseBuffer), ("lock", LockedPose)):
+        for reader_count in READER_COUNTS:
+            writes, p50, p99, reads, torn = run(factory(layout), reader_count)
+            print("%-10s %8d %10.0f %10.1f %10.1f %12.0f %6d" % (
+                name, reader_count, writes, p50, p99, reads, torn))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""PosePipeline stages timed one by one, on a pipeline compiled without
+MotiveLink from a SkeletonLayout: scatter, gating, local pose, forward
+kinematics, skinning palette, retargeting and bone subsets. Running the
+stages in order must give the arrays MotiveLink publishes for the same
+frames.
+
+    python tests/benchmarks/bench_pose_pipeline.py
+"""
+import time
+
+import numpy as np
+
+from MoMaMotiveLink.core import POSE_REPRESENTATIONS, PosePipeline, PosePipelineConfig, SkeletonLayout
+
+from bench_bone_subsets import SUBSETS
+from bench_motive_link_frame import BONE_COUNT, decode_frames, make_descriptions, make_link
+from bench_retargeting import make_rig
+
+REPEAT = 200
+CONFIG_ARGS = {"representations": tuple(POSE_REPRESENTATIONS), "skinning_palette": "matrix",
+               "retarget_targets": [make_rig("rig%d" % rig, rig) for rig in range(2)],
+               "bone_subsets": SUBSETS, "hold_last_valid": True, "max_marker_error": 0.005}
+
+
+def skeleton_lists(data_dicts):
+    return [data_dict["mocap_data"].skeleton_data.skeleton_list for data_dict in data_dicts]
+
+
+def check(actor_count, data_dicts):
+    """Stage by stage against MotiveLink, which runs process"""
+    link = make_link(actor_count, **CONFIG_ARGS)
+    pipeline = PosePipeline(PosePipelineConfig(**CONFIG_ARGS), SkeletonLayout(make_descriptions(actor_count, BONE_COUNT))) #type: ignore  # noqa E501
+    assert sorted(pipeline.pose_arrays) == sorted(link.pose_pipeline.pose_arrays)
+    for sequence, (data_dict, skeleton_list) in enumerate(zip(data_dicts, skeleton_lists(data_dicts)), 1):
+        link.receive_frame_with_skeleton(data_dict)
+        pipeline.scatter_skeletons(skeleton_list)
+        pipeline.gate_bones()
+        pipeline.update_local_pose(sequence)
+        pipeline.compute_world_matrices()
+        pipeline.compute_skinning_palette()
+        pipeline.apply_retargeting()
+        pipeline.compute_subsets()
+        published = link.get_latest_pose().arrays
+        for name, array in pipeline.pose_arrays.items():
+            assert np.array_equal(array, published[name]), (actor_count, sequence, name)
+    return pipeline
+
+
+def timed(function, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    stages = ("scatter", "gate", "local", "world", "palette", "retarget", "subsets", "process")
+    print("%6s %6s" % ("actors", "bones") + "".join(" %9s" % stage for stage in stages) + "   (us)")
+    for actor_count in (1, 4, 10):
+        data_dicts = decode_frames(actor_count, True)
+        pipeline = check(actor_count, data_dicts)
+        skeleton_list = skeleton_lists(data_dicts)[-1]
+        times = [timed(lambda: pipeline.scatter_skeletons(skeleton_list)),
+                 timed(pipeline.gate_bones),
+                 timed(lambda: pipeline.update_local_pose(len(data_dicts))),
+                 timed(pipeline.compute_world_matrices),
+                 timed(pipeline.compute_skinning_palette),
+                 timed(pipeline.apply_retargeting),
+                 timed(pipeline.compute_subsets),
+                 timed(lambda: pipeline.process(skeleton_list, len(data_dicts)))]
+        print("%6d %6d" % (actor_count, pipeline.layout.bone_count) + "".join(" %9.1f" % (t * 1e6) for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""float64 against float32 MotiveLink pipelines: bytes published per pose,
+cost of copying the latest pose out and of writing it to a file, and the
+largest world matrix deviation of float32. float32 is for memory and
+bandwidth: the per-frame latency, measured too, is NumPy call overhead at
+these sizes and does not depend on the dtype. Checks that a float32 frame
+never goes through float64 arrays.
+
+    python tests/benchmarks/bench_pose_precision.py
+"""
+import io
+import time
+
+import numpy as np
+
+from bench_motive_link_frame import decode_frames, make_link, time_frames
+
+DTYPES = (np.float64, np.float32)
+REPEAT = 500
+RUNS = 5
+LINK_ARGS = {"representations": ("matrix", "affine", "pos_quat", "dual_quat"), "skinning_palette": "matrix"}
+
+
+def timed(function, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def record(snapshot, stream):
+    stream.seek(0)
+    for array in snapshot.arrays.values():
+        stream.write(array.data)
+
+
+def check_float32(link):
+    """Frame buffers, forward kinematics and published arrays of a float32 link are all float32"""
+    pipeline = link.pose_pipeline
+    forward_kinematics = pipeline.forward_kinematics
+    arrays = [pipeline.frame_positions, pipeline.frame_rotations, forward_kinematics.sorted_local_matrices,
+              forward_kinematics.sorted_world_matrices]
+    arrays += [level.parent_matrices for level in forward_kinematics.levels]
+    arrays += list(link.get_latest_pose().arrays.values())
+    for array in arrays:
+        assert array.dtype.kind != "f" or array.dtype == np.float32, array.dtype
+    # conversion matrices are only cast once, for the link dtype
+    transposed = link.pose_config.conversion._CoordinateConversion__transposed
+    assert all(dtype == np.float32 for _, dtype in transposed), transposed.keys()
+
+
+def main():
+    print("%6s %6s %8s %10s %10s %10s %10s %9s" % (
+        "actors", "bones", "dtype", "frame us", "pose kB", "copy us", "write us", "max err"))
+    for actor_count in (1, 4, 10):
+        data_dicts = decode_frames(actor_count, True)
+        links = {dtype: make_link(actor_count, dtype=dtype, **LINK_ARGS) for dtype in DTYPES}
+        # best of alternating passes, both links see the same machine load
+        frame_times = dict.fromkeys(DTYPES, float("inf"))
+        for _ in range(RUNS):
+            for dtype, link in links.items():
+                frame_times[dtype] = min(frame_times[dtype], time_frames(link, data_dicts, repeat=10))
+        check_float32(links[np.float32])
+        world_matrices = {}
+        for dtype, link in links.items():
+            frame_time = frame_times[dtype]
+            snapshot = link.get_latest_pose()
+            pose_bytes = sum(array.nbytes for array in snapshot.arrays.values())
+            copy_time = timed(lambda: link.get_latest_pose(snapshot))
+            stream = io.BytesIO()
+            write_time = timed(lambda: record(snapshot, stream))
+            world_matrices[dtype] = link.pose_pipeline.world_matrices.astype(np.float64)
+            error = np.abs(world_matrices[dtype] - world_matrices[DTYPES[0]]).max()
+            print("%6d %6d %8s %10.1f %10.1f %10.2f %10.2f %9.2g" % (
+                actor_count, link.skeleton_layout.bone_count, np.dtype(dtype).name,
+                frame_time * 1e6, pose_bytes / 1024, copy_time * 1e6, write_time * 1e6, error)) #type: ignore  # noqa E501
+
+
+if __name__ == "__main__":
+    main()
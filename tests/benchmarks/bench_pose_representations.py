@@ -0,0 +1,48 @@
+"""Per-frame cost and published size of each local pose representation,
+computed alone without world matrices, against the 4x4 matrices with
+forward kinematics that MotiveLink always built. Also checks every
+representation decomposes back to the decoded positions and rotations.
+
+    python tests/benchmarks/bench_pose_representations.py
+"""
+import numpy as np
+
+from MoMaMotiveLink.core import POSE_REPRESENTATIONS, Tools
+
+from bench_motive_link_frame import decode_frames, make_link, time_frames
+
+ACTOR_COUNT = 4
+
+
+def check(link):
+    """Every representation of the last frame against positions and rotations"""
+    pipeline = link.pose_pipeline
+    positions, rotations = pipeline.frame_positions, pipeline.frame_rotations
+    matrix_positions, matrix_rotations, scales = Tools.decompose_transforms(pipeline.local_matrices) #type: ignore  # noqa E501
+    assert np.allclose(matrix_positions, positions) and np.allclose(scales, 1.0)
+    assert np.allclose(np.abs((matrix_rotations * rotations).sum(axis=1)), 1.0)
+    assert np.array_equal(pipeline.local_affines, pipeline.local_matrices[:, :3])
+    pos_quat_positions, pos_quat_rotations = Tools.unpack_pos_quats(pipeline.local_pos_quats) #type: ignore  # noqa E501
+    assert np.array_equal(pos_quat_positions, positions) and np.array_equal(pos_quat_rotations, rotations) #type: ignore  # noqa E501
+    dual_quat_positions, dual_quat_rotations = Tools.decompose_dual_quaternions(pipeline.local_dual_quats) #type: ignore  # noqa E501
+    assert np.allclose(dual_quat_positions, positions) and np.array_equal(dual_quat_rotations, rotations) #type: ignore  # noqa E501
+
+
+def main():
+    data_dicts = decode_frames(ACTOR_COUNT, True)
+    link = make_link(ACTOR_COUNT, representations=tuple(POSE_REPRESENTATIONS))
+    time_frames(link, data_dicts, repeat=1)
+    check(link)
+
+    print("%-22s %10s %10s" % ("representations", "frame us", "pose kB"))
+    cases = [(("matrix",), True)] + [((name,), False) for name in POSE_REPRESENTATIONS]
+    for representations, world in cases:
+        link = make_link(ACTOR_COUNT, representations=representations, compute_world_matrices=world) #type: ignore  # noqa E501
+        frame_time = time_frames(link, data_dicts)
+        pose_bytes = sum(array.nbytes for array in link.get_latest_pose().arrays.values())
+        label = "+".join(representations) + (" + world" if world else "")
+        print("%-22s %10.1f %10.1f" % (label, frame_time * 1e6, pose_bytes / 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Retargeting every actor onto engine rigs: the per-bone Python code run
+downstream of get_skeleton_definition, with name lookups and one
+quaternion product per bone, against the Retargeter compiled with the
+descriptions (one take and one matmul per rig).
+
+    python tests/benchmarks/bench_retargeting.py
+"""
+import time
+
+import numpy as np
+
+from MoMaMotiveLink.core import RetargetTarget, Tools
+
+from bench_motive_link_frame import BONE_COUNT, decode_frames, make_link
+
+RIG_COUNT = 2
+REPEAT = 50
+
+
+def make_rig(name, seed):
+    """Rig with its own bone names, 80% of the Motive bones plus a few of its own"""
+    rng = np.random.default_rng(seed)
+    mapped = rng.choice(BONE_COUNT, BONE_COUNT * 4 // 5, replace=False) + 1
+    bone_map = {"%s_%d" % (name, bone): "Bone%d" % bone for bone in mapped}
+    bone_names = list(bone_map) + ["%s_extra%d" % (name, extra) for extra in range(5)]
+    rest_rotations = rng.normal(size=(len(bone_names), 4))
+    rest_rotations /= np.linalg.norm(rest_rotations, axis=1)[:, np.newaxis]
+    return RetargetTarget(name, bone_names, rest_rotations, bone_map)
+
+
+def per_bone(link, rigs):
+    """Rig rotations computed bone by bone from the skeleton definition"""
+    definition = link.get_skeleton_definition()
+    pipeline = link.pose_pipeline
+    # noms par emplacement des tenseurs de pose, remplissage compris
+    bone_names, max_bones = definition["slots"]["bone_names"], definition["max_bones"]
+    results = {}
+    for rig in rigs:
+        rotations = []
+        for actor in range(len(definition["actors"])):
+            names = {bone_names[index]: index for index in range(actor * max_bones, (actor + 1) * max_bones)} #type: ignore  # noqa E501
+            for target_bone, target_name in enumerate(rig.bone_names):
+                source_name = rig.bone_map.get(target_name)
+                target_rest = rig.rest_rotations[target_bone]
+                if source_name is None:
+                    rotations.append(target_rest)
+                    continue
+                index = names[source_name]
+                offset = Tools.multiply_quaternions(Tools.conjugate_quaternions(pipeline.rest_rotations[index]), target_rest) #type: ignore  # noqa E501
+                rotations.append(Tools.multiply_quaternions(pipeline.frame_rotations[index], offset))
+        results[rig.name] = np.array(rotations).reshape(-1, len(rig.bone_names), 4)
+    return results
+
+
+def timed(function, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    rigs = [make_rig("rig%d" % rig, rig) for rig in range(RIG_COUNT)]
+    print("%6s %6s %5s %14s %14s" % ("actors", "bones", "rigs", "per bone us", "compiled us"))
+    for actor_count in (1, 4, 10):
+        link = make_link(actor_count, retarget_targets=rigs)
+        pipeline = link.pose_pipeline
+
+        # Pose de repos Motive -> pose de repos de la rig
+        pipeline.frame_rotations[:] = pipeline.rest_rotations
+        for retargeter, rig in zip(pipeline.retargeters, rigs):
+            rotations = retargeter.apply(pipeline.frame_rotations)
+            assert np.allclose(np.abs((rotations * rig.rest_rotations).sum(axis=-1)), 1.0)
+
+        data_dicts = decode_frames(actor_count, True)
+        link.receive_frame_with_skeleton(data_dicts[0])
+        expected = per_bone(link, rigs)
+        for retargeter in pipeline.retargeters:
+            assert np.allclose(retargeter.rotations, expected[retargeter.name])
+            assert np.array_equal(link.get_latest_pose()["retarget_" + retargeter.name], retargeter.rotations) #type: ignore  # noqa E501
+
+        per_bone_time = timed(lambda: per_bone(link, rigs), 5)
+        compiled_time = timed(pipeline.apply_retargeting)
+        print("%6d %6d %5d %14.1f %14.1f" % (actor_count, link.skeleton_layout.bone_count, RIG_COUNT,
+                                             per_bone_time * 1e6, compiled_time * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Cost of serving SKELETON_DEF to a connecting client: rebuilding and
+serializing it per call, as get_skeleton_definition used to, against the
+JSON bytes cached when the description arrives. Checks that the cached
+definition keeps the original bone_names, parents and bind_pose fields.
+
+    python tests/benchmarks/bench_skeleton_definition.py
+"""
+import io
+import json
+import time
+from contextlib import redirect_stdout
+
+from MoMaMotiveLink.core import MotiveLink
+from MoMaMotiveLink.natnetsdk import DataDescriptions
+
+REPEAT = 200
+
+
+def make_descriptions(actor_count, bone_count):
+    data_descs = DataDescriptions.DataDescriptions()
+    for actor in range(actor_count):
+        skeleton = DataDescriptions.SkeletonDescription(b"Actor%d" % (actor + 1), actor + 1) #type: ignore  # noqa E501
+        for bone in range(bone_count):
+            skeleton.add_rigid_body_description(DataDescriptions.RigidBodyDescription( #type: ignore  # noqa E501
+                b"Bone%d" % (bone + 1), bone + 1, bone // 2, [0.0, 0.1, 0.0], [0.0, 0.0, 0.0, 1.0])) #type: ignore  # noqa E501
+        data_descs.add_skeleton(skeleton)
+    return data_descs
+
+
+def rebuild(link):
+    """SKELETON_DEF as built per call before the cache"""
+    parents_list = [-1]
+    for parent in link.bone_parents:
+        parent_name = link.bone_id_to_name.get(parent, None)
+        if parent_name is None:
+            continue
+        parents_list.append(list(link.bone_id_to_name.values()).index(parent_name)) #type: ignore  # noqa E501
+    skeleton_definition = {
+        "type": "SKELETON_DEF",
+        "bone_names": list(link.bone_id_to_name.values()),
+        "parents": parents_list,
+        "bind_pose": {
+            "positions": link.rest_positions.tolist(),
+            "rotations": link.rest_rotations.tolist(),
+            "scales": link.rest_scales.tolist(),
+        }
+    }
+    return json.dumps(skeleton_definition).encode("utf-8")
+
+
+def original_fields(data_descs):
+    """bone_names, parents and bind_pose as the original receive_model_descriptions and get_skeleton_definition
+    built them"""
+    bone_id_to_name, bone_parents, rest_positions, rest_rotations = {}, [], [], []
+    for skeleton in data_descs.skeleton_list:
+        for bone_desc in skeleton.rigid_body_description_list:
+            bone_id_to_name[bone_desc.id_num] = bone_desc.sz_name.decode()
+            bone_parents.append(bone_desc.parent_id)
+            rest_positions.append([value * 100.0 for value in bone_desc.pos])
+            rest_rotations.append(list(bone_desc.rot))
+    parents_list = [-1]
+    for parent in bone_parents:
+        parent_name = bone_id_to_name.get(parent, None)
+        if parent_name is None:
+            continue
+        parents_list.append(list(bone_id_to_name.values()).index(parent_name))
+    return {"bone_names": list(bone_id_to_name.values()), "parents": parents_list,
+            "bind_pose": {"positions": rest_positions, "rotations": rest_rotations,
+                          "scales": [[1.0, 1.0, 1.0]] * len(rest_positions)}}
+
+
+def check():
+    """Actors of different bone counts, so the pose tensors have padding slots"""
+    data_descs = make_descriptions(1, 51)
+    data_descs.add_skeleton(make_descriptions(2, 21).skeleton_list[1])
+    link = MotiveLink()
+    with redirect_stdout(io.StringIO()):
+        link.receive_model_descriptions(data_descs)
+    skeleton_definition = json.loads(link.get_skeleton_definition_json())
+    for name, value in original_fields(data_descs).items():
+        assert skeleton_definition[name] == value, name
+    slots = skeleton_definition["slots"]
+    assert len(slots["bone_names"]) == len(slots["parents"]) == 2 * 51
+    assert slots["bone_names"][51 + 21:] == [""] * 30
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    check()
+    print("%6s %6s %12s %12s" % ("actors", "bones", "rebuild us", "cached us"))
+    for actor_count, bone_count in ((1, 21), (1, 51), (4, 51), (10, 500)):
+        link = MotiveLink()
+        with redirect_stdout(io.StringIO()):
+            link.receive_model_descriptions(make_descriptions(actor_count, bone_count)) #type: ignore  # noqa E501
+        rebuild_time = timed(lambda: rebuild(link), REPEAT)
+        cached_time = timed(link.get_skeleton_definition_json, REPEAT)
+        print("%6d %6d %12.1f %12.2f" % (actor_count, bone_count,
+                                         rebuild_time * 1e6, cached_time * 1e6)) #type: ignore  # noqa E501
+
+
+if __name__ == "__main__":
+    main()
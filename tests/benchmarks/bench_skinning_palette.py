@@ -0,0 +1,68 @@
+"""Skinning palette per frame: a renderer rebuilding the inverse bind
+matrices from the rest pose and multiplying bone by bone, as each of our
+renderers did, against the float32 palette MotiveLink writes in place
+from the inverse bind matrices computed with the descriptions.
+
+    python tests/benchmarks/bench_skinning_palette.py
+"""
+import time
+
+import numpy as np
+
+from MoMaMotiveLink.core import Tools
+
+from bench_motive_link_frame import decode_frames, make_link
+
+REPEAT = 50
+
+
+def renderer_palette(link):
+    """Palette rebuilt from the rest pose and the world matrices"""
+    pipeline = link.pose_pipeline
+    parents = link.bone_parent_indices
+    bind_local = [Tools.compose_transform(position, rotation, scale) for position, rotation, scale
+                  in zip(pipeline.rest_positions, pipeline.rest_rotations, pipeline.rest_scales)]
+    bind_world = [None] * len(parents)
+    for bone in pipeline.forward_kinematics.order:
+        parent = parents[bone]
+        bind_world[bone] = bind_local[bone] if parent < 0 else bind_world[parent] @ bind_local[bone]
+    return np.array([world @ np.linalg.inv(bind) for world, bind in zip(pipeline.world_matrices, bind_world)], #type: ignore  # noqa E501
+                    dtype=np.float32)
+
+
+def timed(function, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print("%6s %6s %8s %12s %12s %12s" % ("actors", "bones", "dtype", "renderer us", "frame us", "palette us")) #type: ignore  # noqa E501
+    for actor_count in (1, 4, 10):
+        data_dicts = decode_frames(actor_count, True)
+        for dtype in (np.float64, np.float32):
+            plain = make_link(actor_count, dtype=dtype)
+            link = make_link(actor_count, dtype=dtype, skinning_palette="matrix")
+            affine = make_link(actor_count, dtype=dtype, skinning_palette="affine")
+            for data_dict in data_dicts:
+                link.receive_frame_with_skeleton(data_dict)
+                affine.receive_frame_with_skeleton(data_dict)
+            pipeline = link.pose_pipeline
+            identity = np.broadcast_to(np.eye(4), pipeline.bind_matrices.shape)
+            assert np.allclose(pipeline.bind_matrices @ pipeline.inverse_bind_matrices, identity, atol=1e-5)
+            expected = renderer_palette(link)
+            assert pipeline.skinning_palette.dtype == np.float32
+            assert np.allclose(pipeline.skinning_palette, expected, atol=1e-3)
+            assert np.array_equal(affine.pose_pipeline.skinning_palette, pipeline.skinning_palette[:, :3])
+
+            renderer_time = timed(lambda: renderer_palette(link), 5)
+            plain_time = timed(lambda: [plain.receive_frame_with_skeleton(d) for d in data_dicts]) #type: ignore  # noqa E501
+            palette_time = timed(lambda: [link.receive_frame_with_skeleton(d) for d in data_dicts]) #type: ignore  # noqa E501
+            print("%6d %6d %8s %12.1f %12.1f %12.1f" % (
+                actor_count, link.skeleton_layout.bone_count, np.dtype(dtype).name, renderer_time * 1e6,
+                plain_time / len(data_dicts) * 1e6, palette_time / len(data_dicts) * 1e6)) #type: ignore  # noqa E501
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Object and array decoding of the same NatNet 3.0, 4.0 and 4.1 packets:
+rigid bodies and skeletons decoded as RigidBody objects and as NumPy record
+views (set_array_decode) must carry the same ids, positions, rotations,
+marker errors and tracking flags, and the frame must end at the same offset.
+
+    python tests/benchmarks/check_array_decode.py
+"""
+import numpy as np
+
+from MoMaMotiveLink.natnetsdk.MoCapData import RigidBodyArrays, SkeletonArrays
+from MoMaMotiveLink.natnetsdk.NatNetClient import NatNetClient
+
+from natnet_packets import make_frame, set_version
+
+VERSIONS = ((3, 0), (4, 0), (4, 1))
+FRAME_COUNT = 8
+
+
+def decode(packets, major, minor, use_array_decode):
+    client = NatNetClient()
+    client.set_print_level(0)
+    client.set_array_decode(use_array_decode)
+    set_version(client, major, minor)
+    data_dicts = []
+    client.new_frame_with_data_listener = data_dicts.append
+    for packet in packets:
+        client.process_message(packet)
+    return data_dicts
+
+
+def check_rigid_bodies(rigid_bodies, arrays):
+    """rigid_bodies : RigidBody objects, arrays : RigidBodyArrays of the same section"""
+    assert len(rigid_bodies) == len(arrays.ids)
+    assert [rigid_body.id_num for rigid_body in rigid_bodies] == arrays.ids.tolist()
+    # records stay float32, objects hold the same float32 values as Python floats
+    positions = np.array([rigid_body.pos for rigid_body in rigid_bodies], dtype=np.float32).reshape(-1, 3) #type: ignore  # noqa E501
+    rotations = np.array([rigid_body.rot for rigid_body in rigid_bodies], dtype=np.float32).reshape(-1, 4) #type: ignore  # noqa E501
+    errors = np.array([rigid_body.error for rigid_body in rigid_bodies], dtype=np.float32)
+    assert np.array_equal(positions, arrays.positions)
+    assert np.array_equal(rotations, arrays.quaternions)
+    assert np.array_equal(errors, arrays.errors)
+    # params : objects keep the tracking valid bit only
+    tracking_valid = [rigid_body.tracking_valid for rigid_body in rigid_bodies]
+    assert tracking_valid == arrays.tracking_valid.tolist()
+    assert tracking_valid == ((arrays.records['params'] & 0x01) != 0).tolist()
+
+
+def main():
+    for major, minor in VERSIONS:
+        packets = [make_frame(i + 1, major, minor, actor_count=3, bone_count=21, rigid_body_count=5, seed=i)
+                   for i in range(FRAME_COUNT)]
+        objects = decode(packets, major, minor, False)
+        arrays = decode(packets, major, minor, True)
+        assert len(objects) == len(arrays) == FRAME_COUNT
+        tracked = 0
+        for object_dict, array_dict in zip(objects, arrays):
+            assert object_dict["offset"] == array_dict["offset"]
+            object_data, array_data = object_dict["mocap_data"], array_dict["mocap_data"]
+
+            rigid_body_arrays = array_data.rigid_body_data
+            assert isinstance(rigid_body_arrays, RigidBodyArrays)
+            check_rigid_bodies(object_data.rigid_body_data.rigid_body_list, rigid_body_arrays)
+
+            skeletons = object_data.skeleton_data.skeleton_list
+            skeleton_arrays = array_data.skeleton_data.skeleton_list
+            assert len(skeletons) == len(skeleton_arrays)
+            for skeleton, skeleton_array in zip(skeletons, skeleton_arrays):
+                assert isinstance(skeleton_array, SkeletonArrays)
+                assert skeleton.id_num == skeleton_array.id_num
+                check_rigid_bodies(skeleton.rigid_body_list, skeleton_array)
+                tracked += int(skeleton_array.tracking_valid.sum())
+        # both tracking states are covered
+        assert 0 < tracked < FRAME_COUNT * 3 * 21
+        print("NatNet %d.%d : %d frames, object and array decoding match" % (major, minor, FRAME_COUNT))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""AsyncNatNetClient against a fake NatNet server over localhost UDP:
+connect, model definitions, a command and a frame stream, all decoded on
+the event loop thread.
+
+    python tests/benchmarks/check_async_client.py
+"""
+import asyncio
+import struct
+import threading
+import time
+
+from MoMaMotiveLink.natnetsdk.AsyncNatNetClient import AsyncNatNetClient
+from MoMaMotiveLink.natnetsdk.NatNetClient import NatNetClient
+
+from natnet_packets import make_frame
+
+FRAME_COUNT = 2000
+
+
+def make_packet(message_id, payload):
+    return struct.pack('<hh', message_id, len(payload)) + payload
+
+
+class FakeServer(asyncio.DatagramProtocol):
+    """Answers connect, model definition and command requests"""
+
+    def __init__(self):
+        self.transport = None
+        self.client_address = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.client_address = addr
+        message_id = struct.unpack_from('<h', data)[0]
+        if message_id == NatNetClient.NAT_CONNECT:
+            payload = b'FakeMotive'.ljust(256, b'\0') + bytes((3, 1, 0, 0)) + bytes((4, 1, 0, 0)) #type: ignore  # noqa E501
+            self.transport.sendto(make_packet(NatNetClient.NAT_SERVERINFO, payload), addr) #type: ignore  # noqa E501
+        elif message_id == NatNetClient.NAT_REQUEST_MODELDEF:
+            payload = struct.pack('<i', 0)
+            self.transport.sendto(make_packet(NatNetClient.NAT_MODELDEF, payload), addr) #type: ignore  # noqa E501
+        elif message_id == NatNetClient.NAT_REQUEST:
+            payload = struct.pack('<i', 0)
+            self.transport.sendto(make_packet(NatNetClient.NAT_RESPONSE, payload), addr) #type: ignore  # noqa E501
+
+
+async def main():
+    loop = asyncio.get_running_loop()
+    server_transport, server = await loop.create_datagram_endpoint(
+        FakeServer, local_addr=("127.0.0.1", 0))
+
+    natnet_client = NatNetClient()
+    natnet_client.set_print_level(0)
+    natnet_client.set_use_multicast(False)
+    natnet_client.command_port = server_transport.get_extra_info("sockname")[1] #type: ignore  # noqa E501
+    natnet_client.set_array_decode(True)
+    natnet_client.set_decode_sections({"skeletons", "suffix"})
+    client = AsyncNatNetClient(natnet_client, frame_buffer_size=8)
+
+    threads_before = threading.active_count()
+    assert await client.connect()
+    print("connected to %s, NatNet %d.%d" % (
+        natnet_client.get_application_name(), natnet_client.get_major(),
+        natnet_client.get_minor()))
+    data_descs = await client.request_model_def()
+    print("model definitions: %d data sets" % len(data_descs.data_order_dict))
+    print("command response: %r" % await client.send_command("Bitstream"))
+
+    packets = [make_frame(i, 4, 1, actor_count=2, bone_count=51, seed=i)
+               for i in range(16)]
+
+    async def stream():
+        for i in range(FRAME_COUNT):
+            packet = bytearray(packets[i % len(packets)])
+            packet[4:8] = struct.pack('<i', i)
+            server_transport.sendto(bytes(packet), server.client_address)
+            # the client reads one datagram per loop iteration
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.2)
+        client.close()
+
+    sender = loop.create_task(stream())
+    received = 0
+    last_frame_number = -1
+    start = time.perf_counter()
+    async for mocap_data in client.frames():
+        frame_number = mocap_data.prefix_data.frame_number
+        assert frame_number > last_frame_number
+        last_frame_number = frame_number
+        received += 1
+    elapsed = time.perf_counter() - start
+    await sender
+    server_transport.close()
+
+    stats = client.get_stats()
+    print("frames received : %d, dropped: %d of %d sent" % (
+        received, stats["dropped"], FRAME_COUNT))
+    print("frame rate      : %.0f frames/s" % (received / elapsed))
+    print("threads started : %d" % (threading.active_count() - threads_before)) #type: ignore  # noqa E501
+    assert threading.active_count() == threads_before
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Two-stage receive and decode under listener failures: a listener raising
+on some frames must not stop the decode thread nor leak pool buffers, and
+shutdown must return while the receive thread is blocked on a full queue
+("block" policy).
+
+    python tests/benchmarks/check_decode_queue.py
+"""
+import io
+import socket
+import threading
+import time
+from contextlib import redirect_stdout
+
+from MoMaMotiveLink.natnetsdk.NatNetClient import NatNetClient
+
+from natnet_packets import make_frame, set_version
+
+FRAME_COUNT = 300
+FAILING_EVERY = 50
+QUEUE_CAPACITY = 4
+TIMEOUT = 10.0
+
+
+def wait_for(condition, timeout=TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def main():
+    client = NatNetClient()
+    client.set_print_level(0)
+    set_version(client, 4, 1)
+    client.set_array_decode(True)
+    client.set_decode_sections({"skeletons", "suffix"})
+    client.set_client_address("127.0.0.1")
+    client.set_server_address("127.0.0.1")
+    client.set_decode_queue(QUEUE_CAPACITY, "block")
+
+    received = []
+    stalled = threading.Event()
+    resume = threading.Event()
+
+    def on_frame(data_dict):
+        frame_number = data_dict["frame_number"]
+        if stalled.is_set():
+            resume.wait()
+        received.append(frame_number)
+        if frame_number % FAILING_EVERY == 0:
+            raise ValueError("listener failure on frame %d" % frame_number)
+    client.new_frame_with_data_listener = on_frame
+
+    output = io.StringIO()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    pool = client.buffer_pool
+    # daemon, a hanging shutdown must not keep the check from failing
+    shutdown_thread = threading.Thread(target=client.shutdown, daemon=True)
+    receive_stopped = False
+    with redirect_stdout(output):
+        assert client.run('d')
+        try:
+            address = client.data_socket.getsockname()
+            for frame_number in range(1, FRAME_COUNT + 1):
+                sender.sendto(make_frame(frame_number, 4, 1, actor_count=2, bone_count=51), address) #type: ignore  # noqa E501
+                # few datagrams in flight, localhost drops them otherwise
+                assert wait_for(lambda: len(received) >= frame_number - 2), "decode thread stopped" #type: ignore  # noqa E501
+            assert wait_for(lambda: len(received) == FRAME_COUNT), "decode thread stopped"
+            # the receive thread holds the buffer it waits on
+            assert wait_for(lambda: pool.get_free_count() == pool.get_allocated_count() - 1), "pool buffers leaked" #type: ignore  # noqa E501
+
+            # the listener stalls, the queue fills and the receive thread blocks
+            stalled.set()
+            for frame_number in range(FRAME_COUNT + 1, FRAME_COUNT + QUEUE_CAPACITY + 8):
+                sender.sendto(make_frame(frame_number, 4, 1, actor_count=2, bone_count=51), address) #type: ignore  # noqa E501
+                time.sleep(0.005)
+            assert client.get_decode_queue_stats()["depth"] == QUEUE_CAPACITY
+        finally:
+            shutdown_thread.start()
+            receive_stopped = wait_for(lambda: not client.data_thread.is_alive(), 2.0)
+            resume.set()
+            shutdown_thread.join(TIMEOUT)
+    sender.close()
+    assert not shutdown_thread.is_alive(), "shutdown hangs"
+    assert receive_stopped, "receive thread still blocked on the queue during shutdown"
+    assert pool.get_free_count() == pool.get_allocated_count(), "pool buffers leaked"
+    failures = output.getvalue().count("listener failure")
+    assert failures == FRAME_COUNT // FAILING_EVERY, failures
+
+    print("frames delivered      : %d of %d" % (FRAME_COUNT, FRAME_COUNT))
+    print("listener failures     : %d reported" % failures)
+    print("pool buffers free     : %d of %d" % (pool.get_free_count(), pool.get_allocated_count())) #type: ignore  # noqa E501
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
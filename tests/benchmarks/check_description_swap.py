@@ -0,0 +1,68 @@
+"""Model descriptions replaced while frames are processed: the command
+thread swaps the skeleton layout (different actor and bone counts) while
+the data thread keeps feeding frames. No frame may fail, and every
+published pose matches one layout.
+
+    python tests/benchmarks/check_description_swap.py
+"""
+import io
+import sys
+import threading
+from contextlib import redirect_stdout
+
+from bench_motive_link_frame import decode_frames, make_descriptions, make_link
+
+SWAP_COUNT = 2000
+LAYOUTS = ((1, 51), (4, 21), (10, 51))
+LINK_ARGS = {"representations": ("matrix", "pos_quat"), "skinning_palette": "matrix", "change_epsilon": 1e-5}
+
+
+def main():
+    link = make_link(4, 21, **LINK_ARGS)
+    descriptions = [make_descriptions(actor_count, bone_count) for actor_count, bone_count in LAYOUTS]
+    # frames of every layout, so each one both matches and misses the current layout
+    data_dicts = [data_dict for actor_count, bone_count in LAYOUTS
+                  for data_dict in decode_frames(actor_count, True, bone_count)]
+    data_dicts += [data_dict for actor_count, bone_count in LAYOUTS
+                   for data_dict in decode_frames(actor_count, False, bone_count)]
+    errors = []
+    done = threading.Event()
+
+    def feed_frames():
+        frame_count = 0
+        try:
+            while not done.is_set():
+                link.receive_frame_with_skeleton(data_dicts[frame_count % len(data_dicts)])
+                frame_count += 1
+        except Exception as error:
+            errors.append(error)
+            done.set()
+        print("%d frames processed" % frame_count)
+
+    # switch threads often, so swaps land in the middle of frames
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    frame_thread = threading.Thread(target=feed_frames)
+    frame_thread.start()
+    try:
+        with redirect_stdout(io.StringIO()):
+            for swap in range(SWAP_COUNT):
+                if done.is_set():
+                    break
+                link.receive_model_descriptions(descriptions[swap % len(descriptions)])
+    finally:
+        done.set()
+        frame_thread.join()
+        sys.setswitchinterval(switch_interval)
+    if errors:
+        raise errors[0]
+
+    pose = link.get_latest_pose()
+    bone_count = link.skeleton_layout.bone_count
+    for name in ("matrices", "pos_quats", "world_matrices", "skinning_palette", "bone_present"):
+        assert len(pose[name]) == bone_count, name
+    print("%d description swaps, no frame failed" % SWAP_COUNT)
+
+
+if __name__ == "__main__":
+    main()
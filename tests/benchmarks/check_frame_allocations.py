@@ -0,0 +1,74 @@
+"""Steady-state memory allocated by MotiveLink.receive_frame_with_skeleton:
+every per-bone buffer is allocated with the descriptions, so the peak
+traced while handling frames must not grow with the bone count. Also
+checks that bones sent out of order or missing land in their ID slot.
+
+    python tests/benchmarks/check_frame_allocations.py
+"""
+import copy
+import random
+import tracemalloc
+
+import numpy as np
+
+from MoMaMotiveLink.core import POSE_REPRESENTATIONS
+
+from bench_motive_link_frame import decode_frames, make_link
+from bench_retargeting import make_rig
+
+FRAME_REPEAT = 20
+
+
+def frame_peak(link, data_dicts):
+    """Peak bytes traced while handling frames, after a warm-up pass"""
+    for data_dict in data_dicts:
+        link.receive_frame_with_skeleton(data_dict)
+    tracemalloc.start()
+    for _ in range(FRAME_REPEAT):
+        for data_dict in data_dicts:
+            link.receive_frame_with_skeleton(data_dict)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def check_scatter():
+    link = make_link(2)
+    data_dict = copy.deepcopy(decode_frames(2, False)[0])
+    skeleton = data_dict["mocap_data"].skeleton_data.skeleton_list[1]
+    expected = {bone.id_num & 0xFFFF: (np.array(bone.pos) * 100, np.array(bone.rot)) #type: ignore  # noqa E501
+                for bone in skeleton.rigid_body_list}
+    random.Random(0).shuffle(skeleton.rigid_body_list)
+    missing = skeleton.rigid_body_list.pop().id_num & 0xFFFF
+    pipeline = link.pose_pipeline
+    pipeline.bone_present[:] = True
+    link.receive_frame_with_skeleton(data_dict)
+    for bone_id, (position, rotation) in expected.items():
+        index = link.bone_id_to_index[1, bone_id]
+        if bone_id == missing:
+            assert not pipeline.bone_present[index]
+        else:
+            assert pipeline.bone_present[index]
+            assert np.allclose(pipeline.frame_positions[index], position)
+            assert np.array_equal(pipeline.frame_rotations[index], rotation)
+
+
+def main():
+    check_scatter()
+    print("%6s %6s %12s %12s" % ("actors", "bones", "objects B", "arrays B"))
+    peaks = []
+    for actor_count in (1, 4, 10):
+        link = make_link(actor_count, representations=tuple(POSE_REPRESENTATIONS), skinning_palette="matrix",
+                         retarget_targets=[make_rig("rig", 0)])
+        objects_peak = frame_peak(link, decode_frames(actor_count, False))
+        arrays_peak = frame_peak(link, decode_frames(actor_count, True))
+        peaks.append((objects_peak, arrays_peak))
+        print("%6d %6d %12d %12d" % (actor_count, link.skeleton_layout.bone_count,
+                                     objects_peak, arrays_peak))
+    # 51 -> 510 bones: a single copy of the positions would already be 11 kB
+    for smallest, largest in zip(peaks[0], peaks[-1]):
+        assert largest - smallest < 1024, "frame allocations grow with the bone count"
+
+
+if __name__ == "__main__":
+    main()
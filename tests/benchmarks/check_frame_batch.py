@@ -0,0 +1,109 @@
+"""Frame batching (set_frame_batch): a full batch goes to the sinks and its
+rows are reused, frames decoded without their suffix get a NaN timestamp
+and 0 stamps instead of those of the frame previously in the row, and a
+partial batch is flushed by shutdown.
+
+    python tests/benchmarks/check_frame_batch.py
+"""
+import io
+import math
+import socket
+import threading
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from MoMaMotiveLink.natnetsdk.NatNetClient import FRAME_SECTIONS, NatNetClient
+
+from natnet_packets import make_frame, set_version
+
+BATCH_SIZE = 4
+ACTOR_COUNT = 2
+BONE_COUNT = 21
+TIMEOUT = 10.0
+
+
+def wait_for(condition, timeout=TIMEOUT):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def packet(frame_number):
+    return make_frame(frame_number, 4, 1, actor_count=ACTOR_COUNT, bone_count=BONE_COUNT, seed=frame_number)
+
+
+def check_batch(columns, frame_numbers, with_suffix):
+    assert columns["frame_numbers"].tolist() == frame_numbers, columns["frame_numbers"]
+    assert columns["skeleton_counts"].tolist() == [ACTOR_COUNT] * len(frame_numbers)
+    assert np.all(columns["bone_counts"][:, :ACTOR_COUNT] == BONE_COUNT)
+    if with_suffix:
+        assert columns["timestamps"].tolist() == [frame_number / 120 for frame_number in frame_numbers]
+        stamps = (111, 222, 333)
+    else:
+        assert all(math.isnan(timestamp) for timestamp in columns["timestamps"])
+        stamps = (0, 0, 0)
+    for name, stamp in zip(("stamp_camera_mid_exposure", "stamp_data_received", "stamp_transmit"), stamps):
+        assert columns[name].tolist() == [stamp] * len(frame_numbers), name
+
+
+def main():
+    client = NatNetClient()
+    client.set_print_level(0)
+    set_version(client, 4, 1)
+    client.set_array_decode(True)
+    client.set_client_address("127.0.0.1")
+    client.set_server_address("127.0.0.1")
+    frame_batch = client.set_frame_batch(frame_capacity=BATCH_SIZE, max_skeletons=ACTOR_COUNT, max_bones=BONE_COUNT) #type: ignore  # noqa E501
+    batches = []
+    # the columns are overwritten once the sink returns
+    client.add_batch_sink(lambda batch: batches.append({name: column.copy()
+                                                        for name, column in batch.get_columns().items()}))
+    received = []
+    client.new_frame_with_data_listener = lambda data_dict: received.append(data_dict["frame_number"])
+
+    # flush on size : frames 1 to 4 fill the batch, the rows are reused for 5 to 8
+    for frame_number in range(1, BATCH_SIZE + 1):
+        client.process_message(packet(frame_number))
+    assert len(batches) == 1 and frame_batch.get_frame_count() == 0
+    check_batch(batches[0], [1, 2, 3, 4], True)
+
+    # frames without suffix data
+    client.set_decode_sections(set(FRAME_SECTIONS) - {"suffix"})
+    for frame_number in range(BATCH_SIZE + 1, 2 * BATCH_SIZE + 1):
+        client.process_message(packet(frame_number))
+    assert len(batches) == 2
+    check_batch(batches[1], [5, 6, 7, 8], False)
+
+    # a partial batch left at shutdown
+    client.set_decode_sections(None)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    with redirect_stdout(io.StringIO()):
+        assert client.run('d')
+        try:
+            address = client.data_socket.getsockname()
+            for frame_number in (9, 10):
+                sender.sendto(packet(frame_number), address)
+                assert wait_for(lambda: frame_number in received), "frame %d not received" % frame_number
+            assert len(batches) == 2 and frame_batch.get_frame_count() == 2
+        finally:
+            # daemon, a hanging shutdown must not keep the check from failing
+            shutdown_thread = threading.Thread(target=client.shutdown, daemon=True)
+            shutdown_thread.start()
+            shutdown_thread.join(TIMEOUT)
+    sender.close()
+    assert not shutdown_thread.is_alive(), "shutdown hangs"
+    assert len(batches) == 3, "partial batch not flushed at shutdown"
+    check_batch(batches[2], [9, 10], True)
+    assert frame_batch.get_frame_count() == 0
+
+    print("batches flushed       : %s" % [batch["frame_numbers"].tolist() for batch in batches])
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
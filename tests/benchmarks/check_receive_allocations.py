@@ -0,0 +1,86 @@
+"""Steady-state allocation check of the data thread: frames sent over
+localhost UDP must not allocate a large block per packet.
+
+    python tests/benchmarks/check_receive_allocations.py
+"""
+import socket
+import threading
+import time
+import tracemalloc
+
+from MoMaMotiveLink.natnetsdk.NatNetClient import NatNetClient
+
+from natnet_packets import make_frame, set_version
+
+WARMUP_COUNT = 200
+PACKET_COUNT = 2000
+# A datagram sized allocation per packet would exceed this
+LARGE_ALLOCATION = 32 * 1024
+
+
+def main():
+    client = NatNetClient()
+    client.set_print_level(0)
+    set_version(client, 4, 1)
+    # decode as MotiveLink does, so the frame itself allocates little
+    client.set_array_decode(True)
+    client.set_decode_sections({"skeletons", "suffix"})
+    received = [0]
+
+    def count_frame(data_dict):
+        received[0] += 1
+    client.new_frame_listener = count_frame
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(0.5)
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    address = receiver.getsockname()
+
+    stop = False
+    data_thread = threading.Thread(
+        target=client._NatNetClient__data_thread_function,
+        args=(receiver, lambda: stop, lambda: 0))
+    data_thread.start()
+
+    packets = [make_frame(i, 4, 1, actor_count=2, bone_count=51, seed=i)
+               for i in range(16)]
+
+    def send(count):
+        start = received[0]
+        deadline = time.time() + 10.0
+        for i in range(count):
+            sender.sendto(packets[i % len(packets)], address)
+            # few datagrams in flight, localhost drops them otherwise
+            while start + i - received[0] > 8 and time.time() < deadline:
+                time.sleep(0.0001)
+        while received[0] < start + count and time.time() < deadline:
+            time.sleep(0.01)
+
+    send(WARMUP_COUNT)
+    received[0] = 0
+    # Started while the data thread waits for a datagram, so a buffer it
+    # may already hold is not part of the baseline
+    tracemalloc.start()
+    current, _ = tracemalloc.get_traced_memory()
+    send(PACKET_COUNT)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stop = True
+    data_thread.join()
+    receiver.close()
+    sender.close()
+
+    print("packets decoded      : %d of %d" % (received[0], PACKET_COUNT))
+    print("packet size          : %d bytes" % len(packets[0]))
+    print("pool buffers         : %d" % client.buffer_pool.get_allocated_count()) #type: ignore  # noqa E501
+    print("peak above baseline  : %d bytes" % (peak - current))
+    print("retained growth      : %d bytes" % (after - current))
+    ok = (peak - current) < LARGE_ALLOCATION
+    print("OK" if ok else "FAIL: large per-packet allocations")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
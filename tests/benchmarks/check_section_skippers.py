@@ -0,0 +1,88 @@
+"""Frame sections skipped with set_decode_sections, for each bitstream
+version branch: 4.1 and later skip a section by its size header, earlier
+versions scan its records (see get_section_skippers). A frame decoded with
+skipped sections must give the same skeletons, the same suffix and the
+same final offset as a full decode. The suffix ends the frame, skipping it
+stops the decode before it: those frames are compared with a full decode of
+every other section.
+
+    python tests/benchmarks/check_section_skippers.py
+"""
+import io
+from contextlib import redirect_stdout
+
+from MoMaMotiveLink.natnetsdk.NatNetClient import FRAME_SECTIONS, NatNetClient
+
+from natnet_packets import make_frame, set_version
+
+# one version per branch of the rigid body, labeled marker, force plate,
+# device and suffix formats
+VERSIONS = ((2, 5), (2, 7), (2, 9), (2, 11), (3, 0), (4, 0), (4, 1))
+FRAME_COUNT = 4
+
+
+def decode(packets, major, minor, use_array_decode, decode_sections):
+    client = NatNetClient()
+    client.set_print_level(0)
+    client.set_array_decode(use_array_decode)
+    set_version(client, major, minor)
+    client.set_decode_sections(decode_sections)
+    data_dicts = []
+    client.new_frame_with_data_listener = data_dicts.append
+    output = io.StringIO()
+    with redirect_stdout(output):
+        for packet in packets:
+            client.process_message(packet)
+    assert "ERROR" not in output.getvalue(), output.getvalue()
+    return data_dicts
+
+
+def skeleton_values(skeleton_data):
+    """Per skeleton : ID, then ID, position, rotation, error and tracking flag of each bone"""
+    values = []
+    for skeleton in skeleton_data.skeleton_list:
+        if hasattr(skeleton, "records"):
+            bones = list(zip(skeleton.ids.tolist(), skeleton.positions.tolist(), skeleton.quaternions.tolist(),
+                             skeleton.errors.tolist(), skeleton.tracking_valid.tolist()))
+        else:
+            bones = [(bone.id_num, list(bone.pos), list(bone.rot), bone.error, bone.tracking_valid)
+                     for bone in skeleton.rigid_body_list]
+        values.append((skeleton.id_num, bones))
+    return values
+
+
+def suffix_values(suffix_data):
+    return (suffix_data.timecode, suffix_data.timecode_sub, suffix_data.timestamp, suffix_data.param)
+
+
+def main():
+    for major, minor in VERSIONS:
+        packets = [make_frame(i + 1, major, minor, actor_count=2, bone_count=11, seed=i)
+                   for i in range(FRAME_COUNT)]
+        # every section but one, then only what MotiveLink needs
+        section_sets = [set(FRAME_SECTIONS) - {name} for name in FRAME_SECTIONS if name != "skeletons"]
+        section_sets += [{"skeletons", "suffix"}, {"skeletons"}]
+        for use_array_decode in ((False, True) if major >= 3 else (False,)):
+            full = decode(packets, major, minor, use_array_decode, None)
+            # the full decode reads the whole packet, past its 4-byte message header
+            assert [data_dict["offset"] for data_dict in full] == [len(packet) - 4 for packet in packets]
+            without_suffix = decode(packets, major, minor, use_array_decode, set(FRAME_SECTIONS) - {"suffix"})
+            for decode_sections in section_sets:
+                skipping = decode(packets, major, minor, use_array_decode, decode_sections)
+                reference = full if "suffix" in decode_sections else without_suffix
+                assert len(skipping) == len(full) == FRAME_COUNT
+                for full_dict, skipping_dict in zip(reference, skipping):
+                    context = (major, minor, use_array_decode, sorted(decode_sections))
+                    assert skipping_dict["offset"] == full_dict["offset"], context
+                    full_data, skipping_data = full_dict["mocap_data"], skipping_dict["mocap_data"]
+                    assert skeleton_values(skipping_data.skeleton_data) == skeleton_values(full_data.skeleton_data), context #type: ignore  # noqa E501
+                    if "suffix" in decode_sections:
+                        assert suffix_values(skipping_data.suffix_data) == suffix_values(full_data.suffix_data), context #type: ignore  # noqa E501
+        skeleton_count = len(full[0]["mocap_data"].skeleton_data.skeleton_list)
+        print("NatNet %d.%d : %d skeletons, %d section sets, same skeletons and offsets" % (
+            major, minor, skeleton_count, len(section_sets)))
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Tracking validity and marker error gating: bone_tracking_valid,
+bone_errors and bone_confident follow the decoded rigid bodies, and with
+hold_last_valid every bone that is not confident keeps its last confident
+pose. Object and array decoding must agree with a per-bone reference, frame
+allocations must stay flat, and the gating cost is printed.
+
+    python tests/benchmarks/check_tracking_validity.py
+"""
+import numpy as np
+
+from bench_motive_link_frame import decode_frames, make_link, time_frames
+from check_frame_allocations import frame_peak
+
+MAX_MARKER_ERROR = 0.005
+LINK_ARGS = {"hold_last_valid": True, "max_marker_error": MAX_MARKER_ERROR}
+
+
+def check(actor_count):
+    object_frames = decode_frames(actor_count, False)
+    array_frames = decode_frames(actor_count, True)
+    object_link = make_link(actor_count, **LINK_ARGS)
+    array_link = make_link(actor_count, **LINK_ARGS)
+    bone_count = object_link.skeleton_layout.bone_count
+    # last confident pose, as received
+    held_positions = np.zeros((bone_count, 3))
+    held_rotations = np.tile([0.0, 0.0, 0.0, 1.0], (bone_count, 1))
+    for object_frame, array_frame in zip(object_frames, array_frames):
+        object_link.receive_frame_with_skeleton(object_frame)
+        array_link.receive_frame_with_skeleton(array_frame)
+        tracking_valid = np.zeros(bone_count, dtype=bool)
+        errors = object_link.pose_pipeline.bone_errors.copy()
+        for skeleton in object_frame["mocap_data"].skeleton_data.skeleton_list:
+            actor = object_link.skeleton_layout.skeleton_id_to_actor[skeleton.id_num]
+            for bone in skeleton.rigid_body_list:
+                index = object_link.bone_id_to_index[actor, bone.id_num & 0xFFFF]
+                tracking_valid[index] = bone.tracking_valid
+                errors[index] = bone.error
+                if bone.tracking_valid and bone.error <= MAX_MARKER_ERROR:
+                    held_positions[index] = bone.pos
+                    held_rotations[index] = bone.rot
+        confident = tracking_valid & (errors <= np.float32(MAX_MARKER_ERROR))
+        for pipeline in (object_link.pose_pipeline, array_link.pose_pipeline):
+            assert np.array_equal(pipeline.bone_tracking_valid, tracking_valid)
+            assert np.allclose(pipeline.bone_errors, errors)
+            assert np.array_equal(pipeline.bone_confident, confident)
+            assert np.allclose(pipeline.frame_positions, held_positions * 100, atol=1e-4)
+            assert np.allclose(pipeline.frame_rotations, held_rotations, atol=1e-6)
+        pose = array_link.get_latest_pose()
+        assert np.array_equal(pose["bone_confident"], confident)
+    return confident.mean()
+
+
+def main():
+    print("%6s %6s %10s %12s %12s %10s" % ("actors", "bones", "confident", "plain us", "gated us", "peak B"))
+    peaks = []
+    for actor_count in (1, 4, 10):
+        confident_share = check(actor_count)
+        data_dicts = decode_frames(actor_count, True)
+        plain = make_link(actor_count)
+        gated = make_link(actor_count, **LINK_ARGS)
+        plain_time, gated_time = time_frames(plain, data_dicts), time_frames(gated, data_dicts)
+        peaks.append(frame_peak(gated, data_dicts))
+        print("%6d %6d %9.0f%% %12.1f %12.1f %10d" % (actor_count, gated.skeleton_layout.bone_count,
+                                                     confident_share * 100, plain_time * 1e6, gated_time * 1e6,
+                                                     peaks[-1]))
+    assert peaks[-1] - peaks[0] < 1024, "gating frame allocations grow with the bone count"
+
+
+if __name__ == "__main__":
+    main()
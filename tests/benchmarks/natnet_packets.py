@@ -0,0 +1,97 @@
+"""Synthetic NatNet frame packets for the benchmarks, no Motive needed."""
+import random
+import struct
+
+NAT_FRAMEOFDATA = 7
+
+
+def _section(count, body, major, minor):
+    out = struct.pack('<i', count)
+    if (major == 4 and minor > 0) or major > 4:
+        out += struct.pack('<i', len(body))
+    return out + body
+
+
+def _rigid_body(rb_id, rng, major=3, minor=0):
+    q = [rng.uniform(-1, 1) for _ in range(4)]
+    n = sum(x * x for x in q) ** .5
+    out = (struct.pack('<i', rb_id)
+           + struct.pack('<fff', *[rng.uniform(-2, 2) for _ in range(3)])
+           + struct.pack('<ffff', *[x / n for x in q]))
+    if major < 3:
+        # before 3.0, the rigid body markers follow: positions, IDs, sizes
+        out += struct.pack('<i', 2)
+        out += struct.pack('<ffffff', 0.1, 0.2, 0.3, 0.4, 0.5, 0.6)
+        out += struct.pack('<ii', rb_id << 8, rb_id << 8 | 1)
+        out += struct.pack('<ff', 0.014, 0.014)
+    out += struct.pack('<f', rng.random() * 0.01)
+    if major >= 3 or (major == 2 and minor >= 6):
+        out += struct.pack('<h', rng.choice([0, 1, 1, 1]))
+    return out
+
+
+def make_frame(frame_number=1, major=4, minor=1, actor_count=2, bone_count=21,
+               rigid_body_count=3, labeled_marker_count=50, seed=0):
+    """NAT_FRAMEOFDATA packet (message id and size included) for
+    NatNet 2.0 and later"""
+    rng = random.Random(seed)
+    with_size = (major == 4 and minor > 0) or major > 4
+    d = struct.pack('<i', frame_number)
+    # marker sets
+    body = b''
+    for s in range(2):
+        body += b'set%d\0' % s + struct.pack('<i', 4)
+        body += b''.join(struct.pack('<fff', s, j, 1.5) for j in range(4))
+    d += _section(2, body, major, minor)
+    # legacy other markers
+    d += _section(2, struct.pack('<fff', 1, 2, 3) * 2, major, minor)
+    # rigid bodies
+    body = b''.join(_rigid_body(100 + i, rng, major, minor)
+                    for i in range(rigid_body_count))
+    d += _section(rigid_body_count, body, major, minor)
+    # skeletons (2.1+), bone ids are (skeleton id << 16) | bone id
+    if major >= 3 or (major == 2 and minor > 0):
+        body = b''
+        for a in range(actor_count):
+            body += struct.pack('<ii', a + 1, bone_count)
+            body += b''.join(_rigid_body((a + 1) << 16 | (j + 1), rng, major, minor) #type: ignore  # noqa E501
+                             for j in range(bone_count))
+        d += _section(actor_count, body, major, minor)
+    # assets
+    if with_size:
+        d += _section(0, b'', major, minor)
+    # labeled markers (2.4+), size and params (2.6+), residual (3.0+)
+    if major >= 3 or (major == 2 and minor > 3):
+        body = b''
+        for m in range(labeled_marker_count):
+            body += struct.pack('<iffff', (1 << 16) | m, m, m * 2, m * 3, 0.014)
+            if major >= 3 or minor >= 6:
+                body += struct.pack('<h', m % 8)
+            if major >= 3:
+                body += struct.pack('<f', 0.0001 * m)
+        d += _section(labeled_marker_count, body, major, minor)
+    # force plates (2.9+) and devices (2.11+)
+    if major >= 3 or (major == 2 and minor >= 9):
+        d += _section(1, struct.pack('<iiifff', 1, 1, 3, 1.0, 2.0, 3.0), major, minor) #type: ignore  # noqa E501
+    if major >= 3 or (major == 2 and minor >= 11):
+        d += _section(1, struct.pack('<iiiff', 10, 1, 2, 4.0, 5.0), major, minor) #type: ignore  # noqa E501
+    # suffix
+    d += struct.pack('<ii', 0x01020304, 0)
+    if major >= 3 or (major == 2 and minor >= 7):
+        d += struct.pack('<d', frame_number / 120)
+    else:
+        d += struct.pack('<f', frame_number / 120)
+    if major >= 3:
+        d += struct.pack('<qqq', 111, 222, 333)
+    if with_size:
+        d += struct.pack('<ii', 42, 7)
+    d += struct.pack('<h', 0x02)
+    return struct.pack('<hh', NAT_FRAMEOFDATA, min(len(d), 32767)) + d
+
+
+def set_version(client, major, minor):
+    """Sets the bitstream version as if the server had reported it,
+    without sending the Bitstream command"""
+    version = client._NatNetClient__nat_net_requested_version
+    version[0], version[1] = major, minor
+    client._NatNetClient__build_decode_plan()